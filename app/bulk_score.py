@@ -0,0 +1,277 @@
+"""
+Offline bulk scoring of applicant dumps.
+
+Reads PredictRequest-shaped records from a JSONL or CSV file in fixed-size
+chunks, runs each chunk through the same rules -> features -> probability
+-> benefit path as /predict, and appends one JSON line per input record.
+
+Usage:
+    python -m app.bulk_score applicants.jsonl -o results.jsonl
+    python -m app.bulk_score applicants.csv -o results.jsonl --chunk-size 5000
+
+Key design choices:
+- Memory is bounded by the chunk size: the input is streamed, and results
+  are written and flushed before the next chunk is read.
+- After every chunk a small checkpoint (rows done, input byte offset,
+  output byte offset) is written atomically. Re-running the same command
+  after a crash truncates any partial output and resumes from there.
+- Failures never abort the run. A record that fails validation, or
+  that cannot be scored at all, produces an ``error`` line. A scheme
+  that fails for a record (e.g. a model that rejects its input) is
+  dropped from that record's result and reported under
+  ``scheme_errors``, while the other schemes are still scored.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from app.predictor import PredictRequest, PredictResponse, predict_many
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# ---------- INPUT READERS ----------
+def _detect_format(path: Path) -> str:
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+class _CountingLines:
+    """Iterate decoded lines of a binary file while tracking the byte offset."""
+
+    def __init__(self, f: IO[bytes]) -> None:
+        self._f = f
+        self.offset = f.tell()
+
+    def __iter__(self) -> Iterator[str]:
+        for raw in self._f:
+            self.offset += len(raw)
+            yield raw.decode("utf-8")
+
+
+def _read_jsonl(f: IO[bytes]) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str], int]]:
+    lines = _CountingLines(f)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line), None, lines.offset
+        except ValueError as e:
+            yield None, f"invalid JSON: {e}", lines.offset
+
+
+def _read_csv(f: IO[bytes], header: List[str]) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str], int]]:
+    lines = _CountingLines(f)
+    # csv.reader pulls exactly the lines one record needs, so the offset
+    # is accurate after every row even with quoted multi-line fields.
+    for row in csv.reader(iter(lines)):
+        if not row:
+            continue
+        # Empty cells mean "not provided" (e.g. land_holding_acres).
+        record = {k: (v if v != "" else None) for k, v in zip(header, row)}
+        yield record, None, lines.offset
+
+
+def _csv_header(path: Path) -> Tuple[List[str], int]:
+    with path.open("rb") as f:
+        first = f.readline()
+        return next(csv.reader(io.StringIO(first.decode("utf-8-sig")))), len(first)
+
+
+# ---------- CHECKPOINTING ----------
+def _load_checkpoint(path: Path, input_path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("input") != str(input_path.resolve()):
+        raise SystemExit(f"Checkpoint {path} belongs to a different input file.")
+    return state
+
+
+def _save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------- SCORING ----------
+# (row number, parsed record, parse error)
+Chunk = List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]
+
+
+def _score_records(records: List[PredictRequest]) -> List[Tuple[Optional[PredictResponse], Dict[str, str], str]]:
+    """
+    (response, scheme errors, record error) per record.
+
+    Records are scored together; if that fails outside the per-scheme
+    isolation, each record is retried on its own.
+    """
+    scheme_errors: List[Dict[str, str]] = []
+    try:
+        responses = predict_many(records, scheme_errors=scheme_errors)
+        return [(response, errors, "") for response, errors in zip(responses, scheme_errors)]
+    except Exception:
+        if len(records) == 1:
+            raise
+
+    out: List[Tuple[Optional[PredictResponse], Dict[str, str], str]] = []
+    for record in records:
+        try:
+            out.extend(_score_records([record]))
+        except Exception as e:
+            out.append((None, {}, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def _score_chunk(chunk: Chunk) -> List[Dict[str, Any]]:
+    """Validate a chunk, score the valid records together, keep input order."""
+    out: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+    valid: List[PredictRequest] = []
+    positions: List[int] = []
+
+    for i, (row, record, error) in enumerate(chunk):
+        if error is None:
+            try:
+                valid.append(PredictRequest(**record))
+                positions.append(i)
+                continue
+            except (ValidationError, TypeError) as e:
+                error = str(e)
+        out[i] = {"row": row, "error": error}
+
+    for i, (response, scheme_errors, error) in zip(positions, _score_records(valid)):
+        row = chunk[i][0]
+        if response is None:
+            out[i] = {"row": row, "error": error}
+            continue
+        out[i] = {"row": row, "result": jsonable_encoder(response)}
+        if scheme_errors:
+            out[i]["scheme_errors"] = scheme_errors
+    return out  # type: ignore[return-value]
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    *,
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_path: Optional[Path] = None,
+    log: IO[str] = sys.stderr,
+) -> int:
+    """
+    Score ``input_path`` into ``output_path`` and return the rows processed.
+
+    Resumes automatically if a checkpoint for the same input exists.
+    """
+    fmt = fmt or _detect_format(input_path)
+    checkpoint_path = checkpoint_path or output_path.with_name(output_path.name + ".ckpt")
+
+    header: List[str] = []
+    start_offset = 0
+    if fmt == "csv":
+        header, start_offset = _csv_header(input_path)
+
+    state = _load_checkpoint(checkpoint_path, input_path)
+    if state is None or not output_path.exists():
+        state = {
+            "input": str(input_path.resolve()),
+            "rows_done": 0,
+            "input_offset": start_offset,
+            "output_offset": 0,
+        }
+        output_path.write_bytes(b"")
+    else:
+        print(f"Resuming after {state['rows_done']} rows", file=log)
+
+    rows_done = resumed_from = state["rows_done"]
+    started = time.perf_counter()
+
+    with input_path.open("rb") as src, output_path.open("r+b") as dst:
+        # Drop anything written after the last checkpoint.
+        dst.truncate(state["output_offset"])
+        dst.seek(state["output_offset"])
+        src.seek(state["input_offset"])
+
+        records = _read_csv(src, header) if fmt == "csv" else _read_jsonl(src)
+
+        chunk: Chunk = []
+        offset = state["input_offset"]
+        for record, error, offset in records:
+            chunk.append((rows_done + len(chunk), record, error))
+            if len(chunk) < chunk_size:
+                continue
+            rows_done = _flush(chunk, dst, checkpoint_path, state, offset)
+            chunk = []
+            _report(rows_done, resumed_from, started, log)
+
+        if chunk:
+            rows_done = _flush(chunk, dst, checkpoint_path, state, offset)
+
+    _report(rows_done, resumed_from, started, log, final=True)
+    checkpoint_path.unlink(missing_ok=True)
+    return rows_done
+
+
+def _flush(chunk: Chunk, dst: IO[bytes], checkpoint_path: Path, state: Dict[str, Any], input_offset: int) -> int:
+    lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in _score_chunk(chunk))
+    dst.write(lines.encode("utf-8"))
+    dst.flush()
+    os.fsync(dst.fileno())
+
+    state["rows_done"] += len(chunk)
+    state["input_offset"] = input_offset
+    state["output_offset"] = dst.tell()
+    _save_checkpoint(checkpoint_path, state)
+    return state["rows_done"]
+
+
+def _report(rows_done: int, resumed_from: int, started: float, log: IO[str], final: bool = False) -> None:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    rate = (rows_done - resumed_from) / elapsed
+    prefix = "Done" if final else "Progress"
+    print(f"{prefix}: {rows_done} rows, {rate:,.0f} rows/s", file=log)
+
+
+# ---------- CLI ----------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bulk_score",
+        description="Score a JSONL or CSV file of PredictRequest records.",
+    )
+    parser.add_argument("input", type=Path, help="JSONL or CSV file of applicants")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="JSONL file for results")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="override format detection")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", type=Path, help="checkpoint path (default: <output>.ckpt)")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+
+    score_file(
+        args.input,
+        args.output,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
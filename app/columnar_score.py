@@ -0,0 +1,311 @@
+"""
+Columnar bulk scoring of Parquet / Arrow applicant snapshots.
+
+Reads PredictRequest-shaped columns record batch by record batch, maps
+them straight onto each scheme's feature columns and writes eligibility,
+probability and benefit columns back out as Parquet. No per-row dict or
+PredictRequest is ever built.
+
+Usage:
+    python -m app.columnar_score applicants.parquet -o scored.parquet
+    python -m app.columnar_score applicants.arrow -o scored.parquet --schemes pm_kisan,nsp
+    python -m app.columnar_score applicants.parquet -o scored.parquet --batch-size 250000 --results-only
+
+Output columns per scheme (prefixed with the scheme id, e.g. ``nsp_``):
+    eligible                  rule-check outcome (null for invalid rows)
+    probability               model approval probability in [0, 1]
+                              (/predict reports round(p * 100, 2));
+                              null unless eligible
+    expected_annual_benefit   null unless eligible
+    error                     why the scheme's model could not score an
+                              eligible row (probability is then null);
+                              null otherwise
+plus an ``error`` column for rows that could not be read, null for rows
+that scored.
+
+Key design choices:
+- Same semantics as /predict: requests are normalised like
+  normalize_request, canonical_matrix agrees row for row with
+  canonical_row, and every scheme's rules_batch with its rules.
+- Only the rule-eligible rows of each scheme are stacked into a feature
+  matrix, and the model is called once per scheme per batch.
+- Memory is bounded by --batch-size: batches are streamed from the input
+  and written to the output one at a time. Input columns are carried into
+  the output unchanged (zero-copy) unless --results-only is given.
+- Rows with a missing or malformed required field get an ``error``
+  message instead of aborting the run; a missing required *column* does
+  abort, since it means the whole file has the wrong shape.
+- A scheme whose model fails is reported in its ``<scheme>_error``
+  column for the batch's eligible rows; the other schemes still score.
+- The output is written to a temporary file and moved into place, so a
+  crashed run never leaves a truncated Parquet file behind.
+- pyarrow is optional for the rest of the app and only imported here.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.predictor import SCHEME_TABLE, SchemeDescriptor, score_columns, select_schemes
+
+
+DEFAULT_BATCH_SIZE = 65_536
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise ImportError("Columnar scoring needs pyarrow: pip install pyarrow") from e
+    return pa, pc, pq
+
+
+# ---------- INPUT ----------
+def iter_record_batches(path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Any]:
+    """Stream record batches of at most ``batch_size`` rows from Parquet or Arrow IPC."""
+    pa, _, pq = _pyarrow()
+    path = Path(path)
+    if path.suffix.lower() not in ARROW_SUFFIXES:
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+        return
+
+    with pa.memory_map(str(path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = iter(pa.ipc.open_stream(source))
+        for batch in batches:
+            # IPC batch sizes are fixed by the writer; re-slice (zero-copy).
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def input_schema(path: Path) -> Any:
+    """Arrow schema of a Parquet or Arrow IPC file."""
+    pa, _, pq = _pyarrow()
+    path = Path(path)
+    if path.suffix.lower() not in ARROW_SUFFIXES:
+        return pq.read_schema(path)
+    with pa.memory_map(str(path)) as source:
+        try:
+            return pa.ipc.open_file(source).schema
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source).schema
+
+
+# ---------- REQUEST COLUMNS ----------
+_REQUIRED_NUMBERS = ("age", "annual_income")
+_REQUIRED_TEXT = ("gender", "state", "occupation")
+_OPTIONAL_NUMBERS = ("land_holding_acres", "has_family_id")
+_INTEGER_FIELDS = ("age", "has_family_id")
+
+
+def _column(batch: Any, name: str) -> Any:
+    index = batch.schema.get_field_index(name)
+    return None if index < 0 else batch.column(index)
+
+
+def _numbers(batch: Any, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """float64 values (NaN where null) and the null mask of one column."""
+    pa, pc, _ = _pyarrow()
+    column = _column(batch, name)
+    if column is None:
+        return np.full(batch.num_rows, np.nan), np.ones(batch.num_rows, dtype=bool)
+    try:
+        column = pc.cast(column, pa.float64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"column {name!r} is not numeric: {e}") from e
+    values = column.to_numpy(zero_copy_only=False)
+    return values, np.isnan(values)
+
+
+def _text(batch: Any, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stripped, lowercased values of one text column and its null mask.
+
+    Normalisation runs on the dictionary of distinct values, so rows
+    share one Python string per distinct value.
+    """
+    pa, pc, _ = _pyarrow()
+    column = pc.dictionary_encode(pc.cast(_column(batch, name), pa.string()))
+    distinct = pc.utf8_lower(pc.utf8_trim_whitespace(column.dictionary))
+    values = np.asarray(distinct.to_pylist() or [""], dtype=object)
+    indices = column.indices
+    nulls = indices.is_null().to_numpy(zero_copy_only=False)
+    return values[pc.fill_null(indices, 0).to_numpy(zero_copy_only=False)], nulls
+
+
+def request_columns(batch: Any) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Normalised PredictRequest columns of a record batch.
+
+    Returns the columns (NumPy arrays; NaN marks a missing optional
+    number) and an object array holding an error message for every row
+    that would fail PredictRequest validation, None elsewhere.
+    """
+    missing = [name for name in _REQUIRED_NUMBERS + _REQUIRED_TEXT if _column(batch, name) is None]
+    if missing:
+        raise ValueError(f"input is missing required column(s): {', '.join(missing)}")
+
+    n = batch.num_rows
+    errors = np.full(n, None, dtype=object)
+
+    def reject(mask: np.ndarray, message: str) -> None:
+        errors[mask & (errors == None)] = message  # noqa: E711 - elementwise
+
+    cols: Dict[str, np.ndarray] = {}
+    for name in _REQUIRED_NUMBERS + _OPTIONAL_NUMBERS:
+        values, nulls = _numbers(batch, name)
+        if name in _REQUIRED_NUMBERS:
+            reject(nulls, f"{name}: field required")
+        finite = np.isfinite(values)
+        if name in _INTEGER_FIELDS:
+            reject(finite & (values != np.floor(values)), f"{name}: must be an integer")
+        elif name in _REQUIRED_NUMBERS:
+            reject(~nulls & ~finite, f"{name}: must be a finite number")
+        cols[name] = values
+
+    for name in _REQUIRED_TEXT:
+        values, nulls = _text(batch, name)
+        reject(nulls, f"{name}: field required")
+        cols[name] = values
+
+    valid = errors == None  # noqa: E711 - elementwise
+    cols["age"] = np.where(valid, cols["age"], 0).astype(np.int64)
+    cols["annual_income"] = np.where(valid, cols["annual_income"], 0.0)
+    return cols, errors
+
+
+# ---------- SCORING ----------
+def score_batch(
+    batch: Any, schemes: Sequence[SchemeDescriptor] = SCHEME_TABLE, keep_input: bool = True
+) -> Any:
+    """Score one record batch; returns a record batch of input and result columns."""
+    pa, _, _ = _pyarrow()
+    cols, errors = request_columns(batch)
+    valid = errors == None  # noqa: E711 - elementwise
+
+    names: List[str] = list(batch.schema.names) if keep_input else []
+    arrays: List[Any] = list(batch.columns) if keep_input else []
+    names.append("error")
+    arrays.append(pa.nulls(batch.num_rows, pa.string()) if valid.all() else pa.array(errors, type=pa.string()))
+
+    for scheme_id, scores in score_columns(cols, valid, schemes).items():
+        not_eligible = ~scores.eligible
+        if scores.error is None:
+            scheme_errors = pa.nulls(batch.num_rows, pa.string())
+        else:
+            message = f"{type(scores.error).__name__}: {scores.error}"
+            scheme_errors = pa.array(np.where(scores.eligible, message, None), type=pa.string())
+        names += [
+            f"{scheme_id}_eligible",
+            f"{scheme_id}_probability",
+            f"{scheme_id}_expected_annual_benefit",
+            f"{scheme_id}_error",
+        ]
+        arrays += [
+            pa.array(scores.eligible, mask=~valid),
+            pa.array(scores.probability, mask=not_eligible | np.isnan(scores.probability)),
+            pa.array(scores.benefit, mask=not_eligible),
+            scheme_errors,
+        ]
+
+    if len(set(names)) != len(names):
+        raise ValueError("input already has result column names; use --results-only or rename them")
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    *,
+    schemes: Sequence[SchemeDescriptor] = SCHEME_TABLE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    keep_input: bool = True,
+    compression: str = "zstd",
+    log: Any = sys.stderr,
+) -> int:
+    """Score a Parquet / Arrow file into a Parquet file; returns the rows processed."""
+    pa, _, pq = _pyarrow()
+    output_path = Path(output_path)
+    tmp = output_path.with_name(output_path.name + ".tmp")
+
+    rows = 0
+    started = time.perf_counter()
+    writer = None
+    try:
+        for batch in iter_record_batches(input_path, batch_size):
+            scored = score_batch(batch, schemes, keep_input)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, scored.schema, compression=compression)
+            writer.write_batch(scored)
+            rows += batch.num_rows
+            _report(rows, started, log)
+
+        if writer is None:
+            # Empty input: still write a file with the right columns.
+            empty = pa.RecordBatch.from_pylist([], schema=input_schema(input_path))
+            writer = pq.ParquetWriter(tmp, score_batch(empty, schemes, keep_input).schema, compression=compression)
+        writer.close()
+        writer = None
+        os.replace(tmp, output_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+
+    _report(rows, started, log, final=True)
+    return rows
+
+
+def _report(rows: int, started: float, log: Any, final: bool = False) -> None:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    prefix = "Done" if final else "Progress"
+    print(f"{prefix}: {rows} rows, {rows / elapsed:,.0f} rows/s", file=log)
+
+
+# ---------- CLI ----------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.columnar_score",
+        description="Score a Parquet or Arrow file of PredictRequest columns into Parquet.",
+    )
+    parser.add_argument("input", type=Path, help="Parquet or Arrow IPC (.arrow/.feather) file of applicants")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Parquet file for results")
+    parser.add_argument("--schemes", action="append", help="scheme ids to score (default: all)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--results-only", action="store_true", help="do not copy input columns to the output")
+    parser.add_argument("--compression", default="zstd", help="Parquet compression codec")
+    args = parser.parse_args(argv)
+
+    if args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+    try:
+        schemes = select_schemes(args.schemes)
+    except KeyError as e:
+        parser.error(f"unknown scheme(s): {e.args[0]}")
+
+    score_file(
+        args.input,
+        args.output,
+        schemes=schemes,
+        batch_size=args.batch_size,
+        keep_input=not args.results_only,
+        compression=args.compression,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from app.utils.model_registry import DEFAULT_ARTIFACT, registry
+
+
+class _MismatchedScorer:
+    """A scorer fitted on one feature more than its scheme sends."""
+
+    compiled = True
+
+    def __init__(self, n_features: int) -> None:
+        self.n_features_in_ = n_features + 1
+
+    def positive_proba(self, X):
+        X = np.asarray(X)
+        raise ValueError(
+            f"X has {X.shape[1]} features, but LinearScorer is expecting {self.n_features_in_} features as input."
+        )
+
+    decision_function = predict_proba = positive_proba
+
+
+@pytest.fixture
+def failing_pmay(monkeypatch):
+    """Every PMAY model the registry hands out fails, as a mis-trained artifact would."""
+    get_scorer = registry.get_scorer
+
+    def patched(scheme_id, artifact=DEFAULT_ARTIFACT):
+        scorer = get_scorer(scheme_id, artifact)
+        return _MismatchedScorer(scorer.n_features_in_) if scheme_id == "pmay" else scorer
+
+    monkeypatch.setattr(registry, "get_scorer", patched)
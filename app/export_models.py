@@ -0,0 +1,62 @@
+"""
+Export every scheme's fitted pipeline as a compact model artifact.
+
+Usage:
+    python -m app.export_models              # all schemes
+    python -m app.export_models pm_kisan nsp
+
+Reads app/schemes/<scheme>/pipeline.pkl and writes model.bin next to it
+(format described in app/utils/artifacts.py). The feature order is taken
+from the scheme's FEATURES list. A scheme whose model was fitted on a
+different feature set cannot be exported: it is reported as an error,
+the command exits non-zero, and the scheme stays on its pickle (and
+fails warm-up) until it is retrained on FEATURES.
+"""
+
+from typing import List, Optional
+import argparse
+import importlib
+import sys
+
+import joblib
+
+from app.utils.artifacts import COMPACT_ARTIFACT, ArtifactFormatError, export_artifact
+from app.utils.model_registry import SCHEMES_DIR
+
+
+SCHEMES = ["pm_kisan", "pmay", "nsp", "ayushman"]
+SOURCE_ARTIFACT = "pipeline.pkl"
+
+
+def export_scheme(scheme_id: str) -> None:
+    features = importlib.import_module(f"app.schemes.{scheme_id}.features").FEATURES
+    source = SCHEMES_DIR / scheme_id / SOURCE_ARTIFACT
+    target = SCHEMES_DIR / scheme_id / COMPACT_ARTIFACT
+    pipeline = joblib.load(source)
+    export_artifact(pipeline, target, scheme_id=scheme_id, feature_names=features, source=SOURCE_ARTIFACT)
+    print(f"{scheme_id}: wrote {target} ({target.stat().st_size} bytes)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.export_models", description=__doc__.split("\n\n")[0])
+    parser.add_argument("schemes", nargs="*", help=f"schemes to export (default: all of {', '.join(SCHEMES)})")
+    args = parser.parse_args(argv)
+    unknown = set(args.schemes) - set(SCHEMES)
+    if unknown:
+        parser.error(f"unknown scheme(s): {', '.join(sorted(unknown))}")
+
+    failed = []
+    for scheme_id in args.schemes or SCHEMES:
+        try:
+            export_scheme(scheme_id)
+        except (ArtifactFormatError, FileNotFoundError) as e:
+            failed.append(scheme_id)
+            print(f"ERROR: {e}", file=sys.stderr)
+    if failed:
+        print(f"export failed for {', '.join(failed)}; no model.bin written for them", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,29 @@
-from typing import List, Optional
-
-from fastapi import APIRouter
-from pydantic import BaseModel
-import joblib
-from pathlib import Path
-
-from app.schemes.pm_kisan.features import extract_model_features as pmkisan_features
-from app.schemes.pm_kisan.rules import evaluate_eligibility as pmkisan_rules
-from app.schemes.pmay.features import extract_model_features as pmay_features
-from app.schemes.pmay.rules import evaluate_eligibility as pmay_rules
-from app.schemes.nsp.features import extract_model_features as nsp_features
-from app.schemes.nsp.rules import evaluate_eligibility as nsp_rules
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Literal, Mapping, NamedTuple, Optional, Sequence, Tuple
+import os
+import threading
+import time
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field, model_serializer
+import numpy as np
+
+from app.schemes.pm_kisan import features as pmkisan_features, rules as pmkisan_rules
+from app.schemes.pmay import features as pmay_features, rules as pmay_rules
+from app.schemes.nsp import features as nsp_features, rules as nsp_rules
+from app.schemes.ayushman import features as ayushman_features, rules as ayushman_rules
 from app.utils.bias_checker import run_bias_audit
-from app.utils.explainability import build_explanation_payload, load_scheme_metadata
+from app.utils.counterfactuals import CounterfactualSpec, counterfactuals
+from app.utils.explainability import get_explanation_template, load_scheme_metadata
+from app.utils.fairness_monitor import fairness_auditor
+from app.utils.fast_json import FragmentCache, dumps, json_array, json_response
+from app.utils.metadata_cache import metadata_cache
+from app.utils.metrics import metrics
+from app.utils.micro_batcher import MicroBatcher
+from app.utils.model_registry import registry
+from app.utils.response_cache import ResponseCache
+from app.utils.scoring import DECISION_THRESHOLD, LinearScorer
 
 
 router = APIRouter()
@@ -25,6 +36,7 @@ class PredictRequest(BaseModel):
     state: str
     occupation: str
     land_holding_acres: Optional[float] = None
+    has_family_id: Optional[int] = None
 
 
 class SchemeResult(BaseModel):
@@ -46,164 +58,1026 @@ class PredictResponse(BaseModel):
     schemes: List[SchemeResult]
     fairness: FairnessReport
     ethical_disclaimer: str
+    # Scheme label -> why that scheme could not score this applicant. Such
+    # schemes are missing from ``schemes``; the key is omitted when every
+    # scheme scored.
+    scheme_errors: Optional[Dict[str, str]] = None
 
+    @model_serializer(mode="wrap")
+    def _omit_empty_scheme_errors(self, handler):
+        data = handler(self)
+        if not self.scheme_errors:
+            data.pop("scheme_errors", None)
+        return data
 
-def _load_model(scheme_id: str):
-    base = Path(__file__).resolve().parent / "schemes" / scheme_id
-    model_path = base / "model.pkl"
-    if not model_path.exists():
-        raise FileNotFoundError(f"Model file not found for scheme {scheme_id}")
-    return joblib.load(model_path)
 
+MAX_SWEEP_POINTS = 10_000
+SweepField = Literal["annual_income", "age", "land_holding_acres"]
 
-@router.post("/predict", response_model=PredictResponse)
-def unified_predict(payload: PredictRequest):
-    """Single entry point that fans out to all schemes."""
 
-    req = payload.dict()
+class SweepRequest(BaseModel):
+    applicant: PredictRequest
+    field: SweepField
+    start: float = Field(allow_inf_nan=False)
+    stop: float = Field(allow_inf_nan=False)
+    points: int = Field(101, ge=2, le=MAX_SWEEP_POINTS)
+
+
+class EligibilityFlip(BaseModel):
+    # Rule eligibility differs between these two adjacent grid values.
+    from_value: float
+    to_value: float
+    eligible: bool
+    reason: str
+
+
+class SweepCurve(BaseModel):
+    scheme: str
+    eligible: List[bool]
+    # Percent, like /predict; None where the rules rule the applicant out
+    # or the scheme's model failed (see ``error``).
+    approval_probability: List[Optional[float]]
+    expected_annual_benefit: float
+    flips: List[EligibilityFlip]
+    error: Optional[str] = None
+
 
-    results: List[SchemeResult] = []
+class SweepResponse(BaseModel):
+    field: str
+    values: List[float]
+    schemes: List[SweepCurve]
 
-    # PM-KISAN
-    pmk_model = _load_model("pm_kisan")
-    pmk_eligible, pmk_reason = pmkisan_rules(
-        {
-            "land_size_acres": req.get("land_holding_acres") or 1.0,
-            "annual_income": req["annual_income"],
-            "owns_land": 1 if req["occupation"] == "farmer" else 0,
-            "is_farmer": 1 if req["occupation"] == "farmer" else 0,
+
+class CounterfactualSuggestion(BaseModel):
+    feature: str
+    current: float
+    required: Optional[float]
+    change: Optional[float]
+    # Percent at the required value, like /predict.
+    approval_probability: Optional[float]
+    feasible: bool
+    note: str
+
+
+class SchemeCounterfactuals(BaseModel):
+    scheme: str
+    eligible: bool
+    # None when the rules rule the applicant out, as /predict omits them.
+    approval_probability: Optional[float]
+    target_probability: float
+    suggestions: List[CounterfactualSuggestion]
+    note: str = ""
+
+
+def normalize_request(req: PredictRequest) -> PredictRequest:
+    """
+    Canonical form of a request: free-text categories trimmed and
+    lowercased.
+
+    Every prediction path scores the normalised request, so two payloads
+    that normalise identically always get identical responses (which is
+    what makes them safe to share a response-cache entry). Numbers are
+    left exactly as sent: any rounding could move a value across a strict
+    rule limit (e.g. income 150000.4 vs PM-KISAN's ``> 150_000``).
+    """
+    return req.model_copy(
+        update={
+            "gender": req.gender.strip().lower(),
+            "state": req.state.strip(),
+            "occupation": req.occupation.strip().lower(),
         }
     )
-    if pmk_eligible:
-        features = pmkisan_features(
-            {
-                "land_size_acres": req.get("land_holding_acres") or 1.0,
-                "annual_income": req["annual_income"],
-                "owns_land": 1 if req["occupation"] == "farmer" else 0,
-                "is_farmer": 1 if req["occupation"] == "farmer" else 0,
-            }
-        )
-        prob = float(pmk_model.predict_proba([features])[0][1])
-        meta = load_scheme_metadata("pm_kisan")
-        benefit = float(meta.get("benefit_amount", {}).get("value", 6000))
-        explanation = build_explanation_payload(
-            scheme_id="pm_kisan",
-            scheme_display_name=meta.get("scheme_name", "PM-KISAN"),
-            rule_eligible=pmk_eligible,
-            rule_reason=pmk_reason,
-            approval_probability=prob,
-        )
+
+
+# Live fairness counters are keyed by these groups only: gender is free
+# text, and counting every spelling separately would grow the counters
+# without bound.
+GENDER_GROUPS: Tuple[str, ...] = ("female", "male", "other", "unknown")
+_GENDER_ALIASES: Dict[str, str] = {
+    "f": "female",
+    "woman": "female",
+    "m": "male",
+    "man": "male",
+    "": "unknown",
+    "na": "unknown",
+    "n/a": "unknown",
+    "not specified": "unknown",
+    "prefer not to say": "unknown",
+}
+
+
+def gender_group(gender: str) -> str:
+    """Fairness group for a normalised gender: one of GENDER_GROUPS."""
+    if gender in GENDER_GROUPS:
+        return gender
+    return _GENDER_ALIASES.get(gender, "other")
+
+
+# ---------- CANONICAL FEATURES ----------
+# The union of every scheme's FEATURES. A request is mapped onto these
+# once, shared by all schemes, and each scheme picks its own columns out
+# of the result through a precomputed index array.
+CANONICAL_FEATURES: Tuple[str, ...] = (
+    "age",
+    "annual_income",
+    "land_size_acres",
+    "owns_land",
+    "is_farmer",
+    "is_laborer",
+    "student_class",
+    "has_family_id",
+)
+
+
+def canonical_row(req: PredictRequest) -> Tuple[float, ...]:
+    """One normalised request as floats, in CANONICAL_FEATURES order."""
+    is_farmer = 1.0 if req.occupation == "farmer" else 0.0
+    return (
+        float(req.age),
+        req.annual_income,
+        float(req.land_holding_acres or 1.0),
+        is_farmer,  # owns_land: farmers are assumed to own their land
+        is_farmer,
+        is_farmer,  # is_laborer
+        12.0 if req.occupation == "student" else 10.0,
+        float(req.has_family_id or 0),
+    )
+
+
+def canonical_inputs(req: PredictRequest) -> Dict[str, float]:
+    """canonical_row as a mapping, the input every scheme's rules and features accept."""
+    return dict(zip(CANONICAL_FEATURES, canonical_row(req)))
+
+
+def canonical_matrix(cols: Mapping[str, np.ndarray]) -> np.ndarray:
+    """
+    Columnar canonical_row: an (n, len(CANONICAL_FEATURES)) float64 matrix.
+
+    Takes normalised request columns (NumPy arrays; land_holding_acres
+    and has_family_id use NaN for "not provided") and must agree row for
+    row with canonical_row.
+    """
+    is_farmer = cols["occupation"] == "farmer"
+    land = np.asarray(cols["land_holding_acres"], dtype=np.float64)
+    X = np.empty((len(is_farmer), len(CANONICAL_FEATURES)))
+    X[:, 0] = cols["age"]
+    X[:, 1] = cols["annual_income"]
+    X[:, 2] = np.where(np.isnan(land) | (land == 0), 1.0, land)
+    X[:, 3] = X[:, 4] = X[:, 5] = is_farmer
+    X[:, 6] = np.where(cols["occupation"] == "student", 12.0, 10.0)
+    X[:, 7] = np.nan_to_num(np.asarray(cols["has_family_id"], dtype=np.float64), nan=0.0)
+    return X
+
+
+# ---------- SCHEME DISPATCH TABLE ----------
+@dataclass(frozen=True)
+class SchemeDescriptor:
+    """
+    Everything /predict needs to score one scheme.
+
+    rules and features take the canonical inputs of one request;
+    rules_batch is their columnar equivalent, used for bulk scoring and
+    sweeps, and its reason codes index reasons. feature_index selects
+    the scheme's feature_names out of a canonical feature matrix.
+    counterfactual_spec says which features /predict/counterfactuals may
+    suggest changing, and within which rule limits.
+    """
+
+    scheme_id: str
+    label: str
+    default_benefit: float
+    rules: Callable[[Mapping[str, Any]], Tuple[bool, str]]
+    features: Callable[[Mapping[str, Any]], Sequence[float]]
+    rules_batch: Callable[[Mapping[str, Any]], Tuple[np.ndarray, np.ndarray]]
+    feature_names: Sequence[str]
+    reasons: Sequence[str]
+    counterfactual_spec: CounterfactualSpec
+    # None: the exported model.bin if present, else model.pkl.
+    artifact: Optional[str] = None
+    feature_index: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Fails at import if a scheme uses a feature canonical_row lacks.
+        index = np.array([CANONICAL_FEATURES.index(name) for name in self.feature_names], dtype=np.intp)
+        object.__setattr__(self, "feature_index", index)
+
+    def feature_columns(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """This scheme's columns of a canonical matrix, by feature name (views, no copies)."""
+        return {name: X[:, j] for name, j in zip(self.feature_names, self.feature_index)}
+
+    @property
+    def model_artifact(self) -> str:
+        return self.artifact or registry.preferred_artifact(self.scheme_id)
+
+    @property
+    def model(self):
+        """Compiled scorer from the shared, load-once registry."""
+        return registry.get_scorer(self.scheme_id, self.model_artifact)
+
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        """Cached, hot-reloadable metadata.json contents."""
+        return load_scheme_metadata(self.scheme_id)
+
+    @property
+    def annual_benefit(self) -> float:
+        """Benefit from metadata.json, or the built-in default."""
+        return float(self.metadata.get("benefit_amount", {}).get("value", self.default_benefit))
+
+
+# Response order follows this table.
+SCHEME_TABLE: Tuple[SchemeDescriptor, ...] = (
+    SchemeDescriptor(
+        "pm_kisan",
+        "PM-KISAN",
+        6000,
+        pmkisan_rules.evaluate_eligibility,
+        pmkisan_features.extract_model_features,
+        rules_batch=pmkisan_rules.evaluate_eligibility_batch,
+        feature_names=tuple(pmkisan_features.FEATURES),
+        reasons=pmkisan_rules.REASONS,
+        counterfactual_spec=CounterfactualSpec(
+            pmkisan_features.ACTIONABLE_FEATURES,
+            pmkisan_rules.ELIGIBLE_RANGES,
+            tuple(pmkisan_features.SENSITIVE_FEATURES),
+        ),
+    ),
+    SchemeDescriptor(
+        "pmay",
+        "PMAY",
+        250000,
+        pmay_rules.evaluate_eligibility,
+        pmay_features.extract_model_features,
+        rules_batch=pmay_rules.evaluate_eligibility_batch,
+        feature_names=tuple(pmay_features.FEATURES),
+        reasons=pmay_rules.REASONS,
+        counterfactual_spec=CounterfactualSpec(
+            pmay_features.ACTIONABLE_FEATURES,
+            pmay_rules.ELIGIBLE_RANGES,
+            tuple(pmay_features.SENSITIVE_FEATURES),
+        ),
+    ),
+    SchemeDescriptor(
+        "nsp",
+        "NSP",
+        50000,
+        nsp_rules.evaluate_eligibility,
+        nsp_features.extract_model_features,
+        rules_batch=nsp_rules.evaluate_eligibility_batch,
+        feature_names=tuple(nsp_features.FEATURES),
+        reasons=nsp_rules.REASONS,
+        counterfactual_spec=CounterfactualSpec(
+            nsp_features.ACTIONABLE_FEATURES,
+            nsp_rules.ELIGIBLE_RANGES,
+            tuple(nsp_features.SENSITIVE_FEATURES),
+        ),
+    ),
+    SchemeDescriptor(
+        "ayushman",
+        "Ayushman Bharat",
+        500000,
+        ayushman_rules.evaluate_eligibility,
+        ayushman_features.extract_model_features,
+        rules_batch=ayushman_rules.evaluate_eligibility_batch,
+        feature_names=tuple(ayushman_features.FEATURES),
+        reasons=ayushman_rules.REASONS,
+        counterfactual_spec=CounterfactualSpec(
+            ayushman_features.ACTIONABLE_FEATURES,
+            ayushman_rules.ELIGIBLE_RANGES,
+            tuple(ayushman_features.SENSITIVE_FEATURES),
+        ),
+    ),
+)
+
+_SCHEMES_BY_ID: Dict[str, SchemeDescriptor] = {d.scheme_id: d for d in SCHEME_TABLE}
+
+
+def select_schemes(scheme_ids: Optional[Sequence[str]]) -> Tuple[SchemeDescriptor, ...]:
+    """
+    Resolve a ``schemes=`` filter into table entries, keeping table order.
+
+    Accepts repeated values or comma-separated lists of scheme ids.
+    Raises KeyError naming any unknown id.
+    """
+    if not scheme_ids:
+        return SCHEME_TABLE
+    wanted = {part.strip() for value in scheme_ids for part in value.split(",") if part.strip()}
+    unknown = wanted - _SCHEMES_BY_ID.keys()
+    if unknown:
+        raise KeyError(", ".join(sorted(unknown)))
+    return tuple(d for d in SCHEME_TABLE if d.scheme_id in wanted)
+
+
+# ---------- SCHEME EXECUTOR ----------
+# Schemes are independent, so they are scored concurrently on a bounded
+# pool. SCHEME_EXECUTOR_WORKERS=0 runs them inline on the request thread.
+SCHEME_EXECUTOR_WORKERS = int(os.getenv("SCHEME_EXECUTOR_WORKERS", "4"))
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def configure_scheme_executor(executor: Optional[Executor] = None, max_workers: Optional[int] = None) -> None:
+    """
+    Replace the executor used for per-scheme fan-out.
+
+    Pass an existing ``executor`` to share a pool, or ``max_workers`` to
+    build a fresh thread pool (0 disables concurrency).
+    """
+    global _executor, SCHEME_EXECUTOR_WORKERS
+    with _executor_lock:
+        old = _executor
+        if executor is None and max_workers is not None:
+            SCHEME_EXECUTOR_WORKERS = max_workers
+            executor = _new_executor(max_workers)
+        _executor = executor
+    if old is not None and old is not executor:
+        old.shutdown(wait=False)
+
+
+def _new_executor(max_workers: int) -> Optional[Executor]:
+    if max_workers <= 0:
+        return None
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheme")
+
+
+def _get_executor() -> Optional[Executor]:
+    global _executor
+    if _executor is None and SCHEME_EXECUTOR_WORKERS > 0:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _new_executor(SCHEME_EXECUTOR_WORKERS)
+    return _executor
+
+
+def _stage(scheme_id: str, stage: str, since: float) -> float:
+    """Record the time since ``since`` as one stage and return now."""
+    now = time.perf_counter()
+    metrics.observe("predict_stage_duration_seconds", now - since, "predict", scheme_id, stage)
+    return now
+
+
+def _score_scheme(
+    scheme: SchemeDescriptor,
+    payloads: Sequence[PredictRequest],
+    inputs: Sequence[Mapping[str, float]],
+    X: np.ndarray,
+) -> Tuple[List[Tuple[int, SchemeResult]], float]:
+    """
+    Rules, features, inference and explanation for one scheme.
+
+    ``inputs`` and ``X`` are the canonical inputs and canonical feature
+    matrix of ``payloads``, shared by every scheme. Free of side effects
+    other than stage timings, so a failed call can be retried; outcomes
+    are recorded by record_outcomes once the whole request has scored.
+    """
+    started = lap = time.perf_counter()
+    verdicts = [scheme.rules(row) for row in inputs]
+    lap = _stage(scheme.scheme_id, "rules", lap)
+
+    positions = [i for i, (eligible, _) in enumerate(verdicts) if eligible]
+    if not positions:
+        return [], time.perf_counter() - started
+    features = X.take(positions, axis=0).take(scheme.feature_index, axis=1)
+    reasons = [verdicts[i][1] for i in positions]
+    lap = _stage(scheme.scheme_id, "features", lap)
+
+    probs = scheme.model.positive_proba(features)
+    lap = _stage(scheme.scheme_id, "predict_proba", lap)
+
+    meta = scheme.metadata
+    benefit = scheme.annual_benefit
+    display_name = meta.get("scheme_name", scheme.label)
+
+    template = get_explanation_template(scheme.scheme_id, display_name, meta)
+
+    # Explanations depend only on the reason and the rounded probability,
+    # so batches build one per distinct key and share it by reference.
+    explanations: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    results: List[Tuple[int, SchemeResult]] = []
+    for i, reason, prob in zip(positions, reasons, probs):
+        prob = float(prob)
+        key = template.key(True, reason, prob)
+        explanation = explanations.get(key)
+        if explanation is None:
+            explanation = explanations[key] = template.render(True, reason, prob)
         results.append(
-            SchemeResult(
-                scheme="PM-KISAN",
-                eligible=True,
-                approval_probability=round(prob * 100, 2),
-                expected_annual_benefit=benefit,
-                explanation=explanation,
+            (
+                i,
+                # Skip validation: it would copy the shared explanation dict.
+                SchemeResult.model_construct(
+                    scheme=scheme.label,
+                    eligible=True,
+                    approval_probability=round(prob * 100, 2),
+                    expected_annual_benefit=benefit,
+                    explanation=explanation,
+                ),
             )
         )
+    _stage(scheme.scheme_id, "explanation", lap)
+    return results, time.perf_counter() - started
 
-    # PMAY
-    pmay_model = _load_model("pmay")
-    pmay_eligible, pmay_reason = pmay_rules(
-        {
-            "age": req["age"],
-            "annual_income": req["annual_income"],
-            "is_laborer": 1 if req["occupation"] in {"farmer"} else 0,
-        }
+
+def _score_scheme_isolated(
+    scheme: SchemeDescriptor,
+    payloads: Sequence[PredictRequest],
+    inputs: Sequence[Mapping[str, float]],
+    X: np.ndarray,
+) -> Tuple[List[Tuple[int, SchemeResult]], float, Dict[int, str]]:
+    """
+    _score_scheme that never raises.
+
+    If the batched pass fails, each applicant is retried on their own, so
+    only the applicants this scheme cannot score are reported (by
+    position) in the returned failures.
+    """
+    try:
+        return (*_score_scheme(scheme, payloads, inputs, X), {})
+    except Exception:
+        pass
+    started = time.perf_counter()
+    results: List[Tuple[int, SchemeResult]] = []
+    failures: Dict[int, str] = {}
+    for i in range(len(payloads)):
+        try:
+            single, _ = _score_scheme(scheme, payloads[i : i + 1], inputs[i : i + 1], X[i : i + 1])
+        except Exception as e:
+            failures[i] = f"{type(e).__name__}: {e}"
+            continue
+        results.extend((i, result) for _, result in single)
+    return results, time.perf_counter() - started, failures
+
+
+def predict_many(
+    payloads: Sequence[PredictRequest],
+    timings: Optional[Dict[str, float]] = None,
+    schemes: Sequence[SchemeDescriptor] = SCHEME_TABLE,
+    scheme_errors: Optional[List[Dict[str, str]]] = None,
+    record: bool = True,
+) -> List[PredictResponse]:
+    """
+    Score a batch of applicants against every scheme in ``schemes``.
+
+    Rule checks run per applicant; the rule-eligible rows of each scheme
+    are then stacked into one matrix so the model is called once per
+    scheme regardless of batch size. Schemes run concurrently on the
+    scheme executor and are merged back in fixed scheme order. A single
+    request is simply a batch of one, so both endpoints share this exact
+    code path.
+
+    If ``timings`` is given it is filled with seconds spent per scheme.
+
+    By default any scheme failure fails the whole call. If
+    ``scheme_errors`` is given (an empty list), failures are isolated
+    instead: it is extended with one {scheme label: message} dict per
+    applicant, and a scheme that cannot score an applicant is left out of
+    that applicant's response.
+
+    Outcomes are fed to record_outcomes unless ``record`` is False, for
+    callers that may score the same request again and record it
+    themselves once it has its final response.
+    """
+    lap = time.perf_counter()
+    payloads = [normalize_request(p) for p in payloads]
+    # Canonical features, computed once and shared by every scheme.
+    rows = [canonical_row(p) for p in payloads]
+    inputs = [dict(zip(CANONICAL_FEATURES, row)) for row in rows]
+    X = np.array(rows, dtype=np.float64).reshape(len(rows), len(CANONICAL_FEATURES))
+    lap = _stage("all", "normalize", lap)
+
+    isolate = scheme_errors is not None
+    score = _score_scheme_isolated if isolate else _score_scheme
+    executor = _get_executor()
+    if executor is None or len(schemes) == 1:
+        outcomes = [score(scheme, payloads, inputs, X) for scheme in schemes]
+    else:
+        futures = [executor.submit(score, scheme, payloads, inputs, X) for scheme in schemes]
+        outcomes = [f.result() for f in futures]
+    lap = time.perf_counter()
+
+    per_record: List[List[SchemeResult]] = [[] for _ in payloads]
+    errors: List[Dict[str, str]] = [{} for _ in payloads]
+    for scheme, outcome in zip(schemes, outcomes):
+        results, elapsed = outcome[0], outcome[1]
+        for i, result in results:
+            per_record[i].append(result)
+        if isolate:
+            for i, message in outcome[2].items():
+                errors[i][scheme.label] = message
+        if timings is not None:
+            timings[scheme.scheme_id] = elapsed
+
+    # Fairness policy and disclaimer are shared across schemes and taken
+    # from PM-KISAN's metadata.
+    policy_meta = load_scheme_metadata("pm_kisan")
+    fairness_policy = policy_meta.get("fairness_policy", {})
+    allowed_diff = float(fairness_policy.get("allowed_bias_threshold", 0.1))
+    ethical_disclaimer = policy_meta.get(
+        "ethical_disclaimer",
+        "This tool is a demonstration and must not be used for official government decisions.",
     )
-    if pmay_eligible:
-        features = pmay_features(
-            {
-                "age": req["age"],
-                "annual_income": req["annual_income"],
-                "is_laborer": 1 if req["occupation"] in {"farmer"} else 0,
-            }
+
+    # Fairness audit: one prediction per scheme by gender group
+    biases = [
+        run_bias_audit([1] * len(results), [payload.gender] * len(results), allowed_diff=allowed_diff)
+        for payload, results in zip(payloads, per_record)
+    ]
+    lap = _stage("all", "bias_audit", lap)
+
+    responses: List[PredictResponse] = []
+    for results, bias in zip(per_record, biases):
+        responses.append(
+            PredictResponse(
+                schemes=results,
+                fairness=FairnessReport(
+                    status=bias.status,
+                    metric=bias.metric,
+                    details=bias.details,
+                    explanation=bias.explanation,
+                ),
+                ethical_disclaimer=ethical_disclaimer,
+            )
         )
-        prob = float(pmay_model.predict_proba([features])[0][1])
-        meta = load_scheme_metadata("pmay")
-        benefit = float(meta.get("benefit_amount", {}).get("value", 250000))
-        explanation = build_explanation_payload(
-            scheme_id="pmay",
-            scheme_display_name=meta.get("scheme_name", "PMAY"),
-            rule_eligible=pmay_eligible,
-            rule_reason=pmay_reason,
-            approval_probability=prob,
+    lap = _stage("all", "response_model", lap)
+
+    if record:
+        record_outcomes(payloads, responses, schemes, errors)
+        _stage("all", "fairness_monitor", lap)
+    if isolate:
+        scheme_errors.extend(errors)
+    return responses
+
+
+def with_scheme_errors(
+    responses: Sequence[PredictResponse], scheme_errors: Sequence[Dict[str, str]]
+) -> List[PredictResponse]:
+    """Attach the per-applicant failures predict_many isolated to their responses."""
+    return [
+        response.model_copy(update={"scheme_errors": errors}) if errors else response
+        for response, errors in zip(responses, scheme_errors)
+    ]
+
+
+def record_outcomes(
+    payloads: Sequence[PredictRequest],
+    responses: Sequence[PredictResponse],
+    schemes: Sequence[SchemeDescriptor],
+    errors: Optional[Sequence[Mapping[str, str]]] = None,
+) -> None:
+    """
+    Feed the record counters and the live /fairness approval rates.
+
+    Called once per request, from its final response, so requests that
+    fail never count and a retried scoring pass never counts twice.
+    ``payloads`` must be normalised (see normalize_request); their gender
+    is counted under its gender_group. Applicants a scheme failed on
+    (``errors``, as filled by predict_many) are skipped for that scheme.
+    """
+    labels = [{result.scheme for result in response.schemes} for response in responses]
+    failed = errors or [{}] * len(payloads)
+    groups = [gender_group(payload.gender) for payload in payloads]
+    for scheme in schemes:
+        decisions = [
+            (group, scheme.label in eligible)
+            for group, eligible, error in zip(groups, labels, failed)
+            if scheme.label not in error
+        ]
+        metrics.inc("predict_records_total", "predict", scheme.scheme_id, amount=len(decisions))
+        fairness_auditor.record_many(scheme.scheme_id, "gender", decisions)
+
+
+# ---------- COLUMNAR SCORING ----------
+class ColumnScores(NamedTuple):
+    """
+    Per-row outcome of one scheme; probability and benefit are NaN unless
+    eligible. ``error`` is set when the scheme's model failed, in which
+    case every probability is NaN.
+    """
+
+    eligible: np.ndarray
+    codes: np.ndarray
+    probability: np.ndarray
+    benefit: np.ndarray
+    error: Optional[Exception] = None
+
+
+def score_columns(
+    cols: Mapping[str, np.ndarray], valid: np.ndarray, schemes: Sequence[SchemeDescriptor] = SCHEME_TABLE
+) -> Dict[str, ColumnScores]:
+    """
+    Rules and model for every scheme over normalised request columns.
+
+    ``cols`` holds one NumPy array per PredictRequest field (see
+    canonical_matrix); rows where ``valid`` is False are never eligible.
+    The canonical matrix is built once; each scheme runs its vectorised
+    rules on its own column views and calls its model once on the
+    rule-eligible rows. A model failure is confined to its scheme: it is
+    returned in that scheme's ``error`` and the other schemes still score.
+    """
+    X = canonical_matrix(cols)
+    n = len(valid)
+    results = {}
+    for scheme in schemes:
+        eligible, codes = scheme.rules_batch(scheme.feature_columns(X))
+        eligible = eligible & valid
+        rows = np.flatnonzero(eligible)
+
+        probability = np.full(n, np.nan)
+        error = None
+        if rows.size:
+            try:
+                probability[rows] = scheme.model.positive_proba(X.take(rows, axis=0).take(scheme.feature_index, axis=1))
+            except Exception as e:
+                error = e
+        benefit = np.where(eligible, scheme.annual_benefit, np.nan)
+        results[scheme.scheme_id] = ColumnScores(eligible, codes, probability, benefit, error)
+    return results
+
+
+# ---------- RESPONSE ENCODING ----------
+# Scheme names, disclaimers and explanation blocks repeat across
+# responses; they are encoded once and reused as bytes.
+_fragments = FragmentCache()
+
+
+def _encode_result(result: SchemeResult) -> bytes:
+    explanation = result.explanation
+    return b"".join(
+        (
+            b'{"scheme":',
+            _fragments.encode(result.scheme),
+            b',"eligible":',
+            b"true" if result.eligible else b"false",
+            b',"approval_probability":',
+            dumps(result.approval_probability),
+            b',"expected_annual_benefit":',
+            dumps(result.expected_annual_benefit),
+            b',"explanation":',
+            _fragments.get(tuple(explanation.values()), explanation),
+            b"}",
         )
-        results.append(
-            SchemeResult(
-                scheme="PMAY",
-                eligible=True,
-                approval_probability=round(prob * 100, 2),
-                expected_annual_benefit=benefit,
-                explanation=explanation,
-            )
+    )
+
+
+def _encode_fairness(fairness: FairnessReport) -> bytes:
+    return b"".join(
+        (
+            b'{"status":',
+            _fragments.encode(fairness.status),
+            b',"metric":',
+            _fragments.encode(fairness.metric),
+            b',"details":',
+            dumps(fairness.details),
+            b',"explanation":',
+            _fragments.encode(fairness.explanation),
+            b"}",
         )
+    )
 
-    # NSP
-    nsp_model = _load_model("nsp")
-    nsp_eligible, nsp_reason = nsp_rules(
-        {
-            "age": req["age"],
-            "annual_income": req["annual_income"],
-            "student_class": 12 if req["occupation"] == "student" else 10,
-        }
+
+def encode_response(response: PredictResponse) -> bytes:
+    """
+    JSON bytes of a PredictResponse built by predict_many.
+
+    Byte-identical to FastAPI's response_model serialisation, but it skips
+    the second validation pass and reuses pre-encoded static fragments.
+    """
+    return b"".join(
+        (
+            b'{"schemes":',
+            json_array(_encode_result(result) for result in response.schemes),
+            b',"fairness":',
+            _encode_fairness(response.fairness),
+            b',"ethical_disclaimer":',
+            _fragments.encode(response.ethical_disclaimer),
+            b',"scheme_errors":' + dumps(response.scheme_errors) if response.scheme_errors else b"",
+            b"}",
+        )
     )
-    if nsp_eligible:
-        features = nsp_features(
-            {
-                "age": req["age"],
-                "annual_income": req["annual_income"],
-                "student_class": 12 if req["occupation"] == "student" else 10,
-            }
+
+
+# ---------- MICRO-BATCHING ----------
+def _predict_coalesced(
+    items: List[Tuple[PredictRequest, Tuple[SchemeDescriptor, ...]]],
+) -> List[Tuple[PredictResponse, Dict[str, float]]]:
+    """
+    One predict_many pass per distinct scheme selection among concurrent
+    requests.
+
+    A scheme that fails is isolated per applicant (reported in the
+    response's ``scheme_errors``), so only a genuine per-request error
+    fails the pass. Nothing is recorded here: if the pass does fail, the
+    batcher scores every item again on its own, so each caller records
+    its own outcome from the result it finally gets.
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for i, (_, selected) in enumerate(items):
+        groups.setdefault(tuple(s.scheme_id for s in selected), []).append(i)
+
+    out: List[Any] = [None] * len(items)
+    for positions in groups.values():
+        timings: Dict[str, float] = {}
+        scheme_errors: List[Dict[str, str]] = []
+        responses = predict_many(
+            [items[i][0] for i in positions],
+            timings=timings,
+            schemes=items[positions[0]][1],
+            scheme_errors=scheme_errors,
+            record=False,
         )
-        prob = float(nsp_model.predict_proba([features])[0][1])
-        meta = load_scheme_metadata("nsp")
-        benefit = float(meta.get("benefit_amount", {}).get("value", 50000))
-        explanation = build_explanation_payload(
-            scheme_id="nsp",
-            scheme_display_name=meta.get("scheme_name", "NSP"),
-            rule_eligible=nsp_eligible,
-            rule_reason=nsp_reason,
-            approval_probability=prob,
+        for i, result in zip(positions, with_scheme_errors(responses, scheme_errors)):
+            out[i] = (result, timings)
+    return out
+
+
+def _record_batch(size: int, delays: List[float]) -> None:
+    metrics.observe("predict_batch_size", size, "predict")
+    for delay in delays:
+        metrics.observe("predict_batch_queue_seconds", delay, "predict")
+
+
+# Opt-in: concurrent /predict cache misses wait up to the window to share
+# one batched pass. 0 (the default) scores every request on its own.
+coalescer = MicroBatcher(
+    _predict_coalesced,
+    max_batch_size=int(os.getenv("PREDICT_BATCH_MAX_SIZE", "32")),
+    max_wait_seconds=float(os.getenv("PREDICT_BATCH_WINDOW_MS", "0")) / 1000,
+    on_batch=_record_batch,
+)
+
+
+# ---------- RESPONSE CACHE ----------
+def _cache_version() -> Tuple[int, int]:
+    return registry.check_for_changes(), metadata_cache.check_for_changes()
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("PREDICT_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("PREDICT_CACHE_TTL_SECONDS", "300")),
+    version=_cache_version,
+)
+
+
+def _cache_key(payload: PredictRequest, schemes: Sequence[SchemeDescriptor]) -> Tuple[Any, ...]:
+    normalized = normalize_request(payload)
+    fields = tuple(getattr(normalized, name) for name in PredictRequest.model_fields)
+    return fields + (tuple(s.scheme_id for s in schemes),)
+
+
+def _server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{scheme};dur={seconds * 1000:.3f}" for scheme, seconds in timings.items())
+
+
+def _selected_schemes(scheme_ids: Optional[List[str]]) -> Tuple[SchemeDescriptor, ...]:
+    try:
+        return select_schemes(scheme_ids)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown scheme(s): {e.args[0]}. Valid ids: {', '.join(_SCHEMES_BY_ID)}",
         )
-        results.append(
-            SchemeResult(
-                scheme="NSP",
-                eligible=True,
-                approval_probability=round(prob * 100, 2),
-                expected_annual_benefit=benefit,
-                explanation=explanation,
+
+
+@router.post("/predict", response_model=PredictResponse)
+def unified_predict(
+    payload: PredictRequest,
+    schemes: Optional[List[str]] = Query(None),
+):
+    """
+    Single entry point that fans out to all schemes.
+
+    Pass ``?schemes=pm_kisan,nsp`` to score only a subset.
+    """
+    selected = _selected_schemes(schemes)
+    lap = time.perf_counter()
+    key = _cache_key(payload, selected)
+    cached = response_cache.get(key)
+    _stage("all", "cache_lookup", lap)
+    if cached is not None:
+        return json_response(cached, headers={"Server-Timing": "cache;desc=hit"})
+
+    result, timings = coalescer.submit((payload, selected))
+    lap = time.perf_counter()
+    record_outcomes([normalize_request(payload)], [result], selected, [result.scheme_errors or {}])
+    lap = _stage("all", "fairness_monitor", lap)
+    # The encoded body is cached, so hits skip serialisation too.
+    body = encode_response(result)
+    _stage("all", "serialize", lap)
+    if not result.scheme_errors:
+        # Scheme failures may be transient; don't serve them from cache.
+        response_cache.put(key, body)
+    # Per-scheme wall time, readable in browser dev tools.
+    return json_response(body, headers={"Server-Timing": _server_timing(timings)})
+
+
+@router.get("/predict/cache")
+def cache_stats():
+    """Hit/miss counters and size of the /predict response cache."""
+    return response_cache.stats()
+
+
+@router.get("/predict/batching")
+def batching_stats():
+    """Micro-batching settings, current adaptive window and batch counters."""
+    return coalescer.stats()
+
+
+@router.post("/predict/batch", response_model=List[PredictResponse])
+def batch_predict(
+    payloads: List[PredictRequest],
+    schemes: Optional[List[str]] = Query(None),
+):
+    """
+    Score many applicants in one call.
+
+    Responses are returned in input order and match what /predict would
+    return for each record individually. A scheme that fails for a record
+    is reported in that record's ``scheme_errors``; it never fails the
+    rest of the batch.
+    """
+    selected = _selected_schemes(schemes)
+    timings: Dict[str, float] = {}
+    scheme_errors: List[Dict[str, str]] = []
+    results = with_scheme_errors(
+        predict_many(payloads, timings=timings, schemes=selected, scheme_errors=scheme_errors), scheme_errors
+    )
+    lap = time.perf_counter()
+    body = json_array(encode_response(result) for result in results)
+    _stage("all", "serialize", lap)
+    return json_response(body, headers={"Server-Timing": _server_timing(timings)})
+
+
+# ---------- WHAT-IF SWEEPS ----------
+def sweep_grid(field: str, start: float, stop: float, points: int) -> np.ndarray:
+    """
+    Evenly spaced values of ``field`` from ``start`` to ``stop``.
+
+    Ages are rounded to whole years, as the request field is an integer;
+    consecutive duplicates this creates are dropped, so an age grid can
+    come back shorter than ``points``. Descending ranges are kept in
+    descending order.
+    """
+    values = np.linspace(start, stop, points)
+    if field == "age":
+        values = np.round(values)
+        values = values[np.r_[True, values[1:] != values[:-1]]]
+    return values
+
+
+def sweep_columns(payload: PredictRequest, field: str, values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Request columns for ``payload`` repeated once per grid value of ``field``."""
+    n = len(values)
+    payload = normalize_request(payload)
+    cols: Dict[str, np.ndarray] = {}
+    for name in PredictRequest.model_fields:
+        value = getattr(payload, name)
+        if isinstance(value, str):
+            cols[name] = np.full(n, value, dtype=object)
+        else:
+            cols[name] = np.full(n, np.nan if value is None else float(value))
+    cols[field] = values
+    cols["age"] = cols["age"].astype(np.int64)
+    return cols
+
+
+def _flips(values: np.ndarray, scores: ColumnScores, reasons: Sequence[str]) -> List[EligibilityFlip]:
+    changed = np.flatnonzero(scores.eligible[1:] != scores.eligible[:-1]) + 1
+    return [
+        EligibilityFlip(
+            from_value=float(values[i - 1]),
+            to_value=float(values[i]),
+            eligible=bool(scores.eligible[i]),
+            reason=reasons[scores.codes[i]],
+        )
+        for i in changed
+    ]
+
+
+@router.post("/predict/sweep", response_model=SweepResponse)
+def sweep_predict(request: SweepRequest, schemes: Optional[List[str]] = Query(None)):
+    """
+    How eligibility and approval probability change as one field varies.
+
+    Every other field is held at the applicant's value. The whole grid is
+    scored as one matrix per scheme, so a 1,000-point sweep costs about
+    as much as a single /predict. Sweeps are hypothetical and are not
+    recorded in the live fairness counters. A scheme whose model fails
+    keeps its rule-based eligibility, with no probabilities and the
+    failure in its curve's ``error``; the other schemes are unaffected.
+    """
+    selected = _selected_schemes(schemes)
+    started = time.perf_counter()
+    values = sweep_grid(request.field, request.start, request.stop, request.points)
+    cols = sweep_columns(request.applicant, request.field, values)
+    scores = score_columns(cols, np.ones(len(values), dtype=bool), selected)
+    metrics.observe("predict_stage_duration_seconds", time.perf_counter() - started, "sweep", "all", "score")
+
+    curves = []
+    for scheme in selected:
+        result = scores[scheme.scheme_id]
+        eligible = result.eligible.tolist()
+        error = None
+        if result.error is not None:
+            error = f"{type(result.error).__name__}: {result.error}"
+            probability = [None] * len(eligible)
+        else:
+            # Python's round() on each value, exactly as /predict rounds it.
+            percent = (result.probability * 100).tolist()
+            probability = [round(p, 2) if e else None for e, p in zip(eligible, percent)]
+        curves.append(
+            SweepCurve(
+                scheme=scheme.label,
+                eligible=eligible,
+                approval_probability=probability,
+                expected_annual_benefit=scheme.annual_benefit,
+                flips=_flips(values, result, scheme.reasons),
+                error=error,
             )
         )
+    return SweepResponse(field=request.field, values=values.tolist(), schemes=curves)
 
-    # Fairness audit: one prediction per scheme by gender group
-    preds = [1] * len(results)
-    groups = [payload.gender for _ in results]
 
-    fairness_policy = load_scheme_metadata("pm_kisan").get(
-        "fairness_policy", {}
+# ---------- COUNTERFACTUALS ----------
+def scheme_counterfactuals(
+    scheme: SchemeDescriptor, payload: PredictRequest, target_probability: float
+) -> SchemeCounterfactuals:
+    """Smallest single-feature changes that make ``payload`` reach the target for one scheme."""
+    inputs = canonical_inputs(normalize_request(payload))
+    eligible, _ = scheme.rules(inputs)
+    result = SchemeCounterfactuals(
+        scheme=scheme.label,
+        eligible=eligible,
+        approval_probability=None,
+        target_probability=round(target_probability * 100, 2),
+        suggestions=[],
     )
-    allowed_diff = float(fairness_policy.get("allowed_bias_threshold", 0.1))
 
-    bias = run_bias_audit(preds, groups, allowed_diff=allowed_diff)
+    model = scheme.model
+    names = list(model.feature_names or scheme.feature_names) if isinstance(model, LinearScorer) else None
+    if names is None or names != list(scheme.feature_names):
+        result.note = "Counterfactuals need a linear model fitted on this scheme's FEATURES."
+        return result
 
-    ethical_disclaimer = (
-        load_scheme_metadata("pm_kisan").get(
-            "ethical_disclaimer",
-            "This tool is a demonstration and must not be used for official government decisions.",
+    if eligible:
+        probability = float(model.positive_proba(np.asarray([scheme.features(inputs)], dtype=float))[0])
+        result.approval_probability = round(probability * 100, 2)
+    for cf in counterfactuals(
+        model.weights, model.bias, names, inputs, scheme.counterfactual_spec, scheme.rules, target_probability
+    ):
+        result.suggestions.append(
+            CounterfactualSuggestion(
+                feature=cf.feature,
+                current=cf.current,
+                required=cf.required,
+                change=cf.change,
+                approval_probability=None if cf.probability is None else round(cf.probability * 100, 2),
+                feasible=cf.feasible,
+                note=cf.note,
+            )
         )
-    )
+    return result
 
-    return PredictResponse(
-        schemes=results,
-        fairness=FairnessReport(
-            status=bias.status,
-            metric=bias.metric,
-            details=bias.details,
-            explanation=bias.explanation,
-        ),
-        ethical_disclaimer=ethical_disclaimer,
-    )
+
+@router.post("/predict/counterfactuals", response_model=List[SchemeCounterfactuals])
+def predict_counterfactuals(
+    payload: PredictRequest,
+    schemes: Optional[List[str]] = Query(None),
+    target: float = Query(DECISION_THRESHOLD, gt=0, lt=1),
+):
+    """
+    What single change would get the applicant to ``target`` probability.
+
+    For each scheme and each actionable feature, the smallest change that
+    both passes the scheme's rules and reaches the target, computed in
+    closed form from the linear model. Sensitive attributes are never
+    suggested.
+    """
+    return [scheme_counterfactuals(scheme, payload, target) for scheme in _selected_schemes(schemes)]
+
+
+@router.get("/fairness", response_model=Dict[str, FairnessReport])
+def live_fairness(
+    schemes: Optional[List[str]] = Query(None),
+    attribute: str = "gender",
+    window_seconds: Optional[float] = Query(None, gt=0),
+):
+    """
+    Approval-rate difference per scheme over live traffic.
+
+    Uses each scheme's own ``allowed_bias_threshold``. Omit
+    ``window_seconds`` for everything recorded since startup.
+    """
+    reports = {}
+    for scheme in _selected_schemes(schemes):
+        policy = scheme.metadata.get("fairness_policy", {})
+        allowed_diff = float(policy.get("allowed_bias_threshold", 0.1))
+        reports[scheme.scheme_id] = fairness_auditor.report(
+            scheme.scheme_id, attribute, allowed_diff=allowed_diff, window_seconds=window_seconds
+        )
+    return reports
 
 
+@router.get("/fairness/snapshot")
+def fairness_snapshot():
+    """Raw counters, for merging across worker processes."""
+    return fairness_auditor.snapshot()
@@ -1,24 +1,15 @@
-import joblib
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parent
+from app.utils.model_registry import registry
 
 
 def load_pipeline(scheme_name: str):
     """
     Load full ML pipeline for a scheme.
-    """
-    scheme_dir = BASE_DIR / scheme_name
-    pipeline_path = scheme_dir / "pipeline.pkl"
 
-    if not pipeline_path.exists():
+    Pipelines come from the shared model registry, so repeated calls are
+    cheap. Nothing is loaded at import time; the app warms every scheme
+    explicitly at startup (see app/utils/warmup.py).
+    """
+    try:
+        return registry.get(scheme_name)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Pipeline not found for scheme: {scheme_name}")
-
-    return joblib.load(pipeline_path)
-
-
-# Load pipelines once at startup
-PIPELINES = {
-    "pm_kisan": load_pipeline("pm_kisan"),
-    # future schemes will go here
-}
@@ -7,7 +7,7 @@ This module keeps the feature space explicit and auditable:
 - EXCLUDED_FEATURES are deliberately left out for ethical reasons.
 """
 
-from typing import Any, Mapping, Sequence, List
+from typing import Any, Dict, Mapping, Sequence, List
 
 
 FEATURES: List[str] = [
@@ -28,6 +28,13 @@ EXCLUDED_FEATURES: List[str] = [
 ]
 
 
+# Counterfactuals may suggest income and getting a family ID.
+ACTIONABLE_FEATURES: Dict[str, float] = {
+    "annual_income": 1.0,
+    "has_family_id": 1.0,
+}
+
+
 def extract_model_features(payload: Mapping[str, Any]) -> Sequence[float]:
     """
     Extract ML-safe features from an Ayushman request payload.
@@ -47,6 +54,7 @@ __all__ = [
     "FEATURES",
     "SENSITIVE_FEATURES",
     "EXCLUDED_FEATURES",
+    "ACTIONABLE_FEATURES",
     "extract_model_features",
 ]
 
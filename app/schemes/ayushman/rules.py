@@ -6,7 +6,36 @@ judges can quickly see why an applicant was marked eligible
 or ineligible before any ML probability is considered.
 """
 
-from typing import Any, Mapping, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.schemes.columns import batch_length, float_column, int_column
+
+
+INCOME_LIMIT = 120_000
+
+# Reason codes shared by the scalar and columnar rule engines.
+# REASONS[code] is the human-readable explanation for that outcome.
+ELIGIBLE = 0
+INVALID_AGE = 1
+INCOME_TOO_HIGH = 2
+NO_FAMILY_ID = 3
+
+REASONS: Tuple[str, ...] = (
+    "Eligible by rule check: income is within limit and a valid family ID is present.",
+    "Ineligible: age must be a positive number.",
+    "Ineligible: annual income exceeds the simplified Ayushman limit of ₹1.2 lakh.",
+    "Ineligible: applicant does not have a valid family ID in this demo.",
+)
+
+
+# Age, income and family-ID checks below as ranges, for counterfactuals.
+ELIGIBLE_RANGES: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "age": (1, None),  # strictly positive
+    "annual_income": (None, INCOME_LIMIT),
+    "has_family_id": (1, 1),
+}
 
 
 def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
@@ -22,24 +51,41 @@ def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
     has_family_id = int(payload.get("has_family_id", 0))
 
     if age <= 0:
-        return False, "Ineligible: age must be a positive number."
+        return False, REASONS[INVALID_AGE]
 
-    if annual_income > 120_000:
-        return (
-            False,
-            "Ineligible: annual income exceeds the simplified Ayushman limit of ₹1.2 lakh.",
-        )
+    if annual_income > INCOME_LIMIT:
+        return False, REASONS[INCOME_TOO_HIGH]
 
     if not has_family_id:
-        return (
-            False,
-            "Ineligible: applicant does not have a valid family ID in this demo.",
-        )
+        return False, REASONS[NO_FAMILY_ID]
 
-    return True, (
-        "Eligible by rule check: income is within limit and a valid family ID is present."
-    )
+    return True, REASONS[ELIGIBLE]
+
+
+def evaluate_eligibility_batch(columns: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Columnar version of evaluate_eligibility.
+
+    Args:
+        columns: DataFrame or mapping of column name -> array, using the
+            same field names and defaults as the scalar payload.
+
+    Returns:
+        eligible: boolean mask, one entry per row.
+        codes:    integer reason code per row; REASONS[code] is the
+                  same string evaluate_eligibility would return.
+    """
+    n = batch_length(columns)
+    age = int_column(columns, "age", 0, n)
+    annual_income = float_column(columns, "annual_income", 0.0, n)
+    has_family_id = int_column(columns, "has_family_id", 0, n)
 
+    codes = np.select(
+        [age <= 0, annual_income > INCOME_LIMIT, has_family_id == 0],
+        [INVALID_AGE, INCOME_TOO_HIGH, NO_FAMILY_ID],
+        default=ELIGIBLE,
+    ).astype(np.int8)
+    return codes == ELIGIBLE, codes
 
-__all__ = ["evaluate_eligibility"]
 
+__all__ = ["ELIGIBLE_RANGES", "REASONS", "evaluate_eligibility", "evaluate_eligibility_batch"]
@@ -6,30 +6,44 @@ from sklearn.linear_model import LogisticRegression
 import joblib
 from pathlib import Path
 
-np.random.seed(42)
-n = 500
+BASE_DIR = Path(__file__).resolve().parent
+MODEL_PATH = BASE_DIR / "pipeline.pkl"
 
-data = pd.DataFrame({
-    "age": np.random.randint(18, 65, n),
-    "annual_income": np.random.uniform(20000, 200000, n),
-    "has_family_id": np.random.choice([0, 1], n, p=[0.2, 0.8]),
-})
 
-# Eligibility: Income <= 120000 and has family ID
-data["eligible"] = ((data["annual_income"] <= 120000) & (data["has_family_id"] == 1)).astype(int)
+# ---------- DATA GENERATION ----------
+def generate_data(n: int = 500, seed: int = 42) -> pd.DataFrame:
+    """Synthetic applicants with ground-truth labels; reproducible per seed."""
+    rng = np.random.RandomState(seed)
+    data = pd.DataFrame({
+        "age": rng.randint(18, 65, n),
+        "annual_income": rng.uniform(20000, 200000, n),
+        "has_family_id": rng.choice([0, 1], n, p=[0.2, 0.8]),
+    })
 
-X = data.drop("eligible", axis=1)
-y = data["eligible"]
+    # Eligibility: Income <= 120000 and has family ID
+    data["eligible"] = ((data["annual_income"] <= 120000) & (data["has_family_id"] == 1)).astype(int)
+    return data
 
-pipeline = Pipeline([
-    ("scaler", StandardScaler()),
-    ("model", LogisticRegression())
-])
 
-pipeline.fit(X, y)
+# ---------- PIPELINE ----------
+def build_pipeline() -> Pipeline:
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("model", LogisticRegression())
+    ])
 
-BASE_DIR = Path(__file__).resolve().parent
-MODEL_PATH = BASE_DIR / "pipeline.pkl"
-joblib.dump(pipeline, MODEL_PATH)
-print("✅ Ayushman Bharat pipeline saved at:", MODEL_PATH)
-print("📦 File size (bytes):", MODEL_PATH.stat().st_size)
+
+def train(n: int = 500, seed: int = 42) -> Pipeline:
+    data = generate_data(n, seed)
+    X = data.drop("eligible", axis=1)
+    y = data["eligible"]
+    return build_pipeline().fit(X, y)
+
+
+# ---------- SAVE MODEL ----------
+if __name__ == "__main__":
+    pipeline = train()
+    joblib.dump(pipeline, MODEL_PATH)
+
+    print("✅ Ayushman Bharat pipeline saved at:", MODEL_PATH)
+    print("📦 File size (bytes):", MODEL_PATH.stat().st_size)
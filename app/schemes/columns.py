@@ -0,0 +1,43 @@
+"""
+Column access helpers for the vectorised rule engines.
+
+Each scheme's ``evaluate_eligibility_batch`` accepts either a pandas
+DataFrame or a plain mapping of column name -> array. These helpers give
+both the same semantics as the scalar ``payload.get(name, default)``
+followed by ``int(...)`` / ``float(...)`` used in ``evaluate_eligibility``.
+"""
+
+from typing import Any, Mapping
+
+import numpy as np
+
+
+def batch_length(columns: Mapping[str, Any]) -> int:
+    """Number of rows in a DataFrame or mapping of equal-length columns."""
+    if hasattr(columns, "shape") and hasattr(columns, "columns"):
+        return int(columns.shape[0])
+    lengths = {len(np.atleast_1d(np.asarray(v))) for v in columns.values()}
+    if not lengths:
+        raise ValueError("At least one input column is required.")
+    if len(lengths) != 1:
+        raise ValueError(f"Input columns have different lengths: {sorted(lengths)}")
+    return lengths.pop()
+
+
+def float_column(columns: Mapping[str, Any], name: str, default: float, n: int) -> np.ndarray:
+    """Column as float64, or ``default`` repeated when the column is absent."""
+    if name not in columns:
+        return np.full(n, float(default), dtype=np.float64)
+    return np.atleast_1d(np.asarray(columns[name], dtype=np.float64))
+
+
+def int_column(columns: Mapping[str, Any], name: str, default: int, n: int) -> np.ndarray:
+    """
+    Column as int64, truncating toward zero exactly like ``int(float(x))``.
+    """
+    if name not in columns:
+        return np.full(n, int(default), dtype=np.int64)
+    return np.atleast_1d(np.asarray(columns[name])).astype(np.int64)
+
+
+__all__ = ["batch_length", "float_column", "int_column"]
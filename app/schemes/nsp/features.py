@@ -7,7 +7,7 @@ This module clearly separates:
 - EXCLUDED_FEATURES which the system avoids entirely.
 """
 
-from typing import Any, Mapping, Sequence, List
+from typing import Any, Dict, Mapping, Sequence, List
 
 
 FEATURES: List[str] = [
@@ -28,6 +28,12 @@ EXCLUDED_FEATURES: List[str] = [
 ]
 
 
+# Counterfactuals may only suggest a change of family income.
+ACTIONABLE_FEATURES: Dict[str, float] = {
+    "annual_income": 1.0,
+}
+
+
 def extract_model_features(payload: Mapping[str, Any]) -> Sequence[float]:
     """
     Extract non-sensitive features from an NSP request payload.
@@ -46,6 +52,7 @@ __all__ = [
     "FEATURES",
     "SENSITIVE_FEATURES",
     "EXCLUDED_FEATURES",
+    "ACTIONABLE_FEATURES",
     "extract_model_features",
 ]
 
@@ -6,7 +6,38 @@ understand why a particular student is marked as eligible or not,
 without needing to inspect any ML internals.
 """
 
-from typing import Any, Mapping, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.schemes.columns import batch_length, float_column, int_column
+
+
+MIN_AGE = 10
+INCOME_LIMIT = 120_000
+ELIGIBLE_CLASSES = (10, 12)
+
+# Reason codes shared by the scalar and columnar rule engines.
+# REASONS[code] is the human-readable explanation for that outcome.
+ELIGIBLE = 0
+UNDERAGE = 1
+INCOME_TOO_HIGH = 2
+CLASS_NOT_ELIGIBLE = 3
+
+REASONS: Tuple[str, ...] = (
+    "Eligible by rule check: class and income are within the simplified NSP criteria.",
+    "Ineligible: applicant must be at least 10 years old for this demo.",
+    "Ineligible: annual income exceeds the simplified NSP limit of ₹1.2 lakh.",
+    "Ineligible: only class 10 and 12 students are considered in this simplified NSP demo.",
+)
+
+
+# Age and income limits of the checks below, for counterfactuals.
+ELIGIBLE_RANGES: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "age": (MIN_AGE, None),
+    "annual_income": (None, INCOME_LIMIT),
+    # student_class must be one of ELIGIBLE_CLASSES, which is not a range.
+}
 
 
 def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
@@ -21,25 +52,46 @@ def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
     annual_income = float(payload.get("annual_income", 0.0))
     student_class = int(payload.get("student_class", 0))
 
-    if age < 10:
-        return False, "Ineligible: applicant must be at least 10 years old for this demo."
+    if age < MIN_AGE:
+        return False, REASONS[UNDERAGE]
 
-    if annual_income > 120_000:
-        return (
-            False,
-            "Ineligible: annual income exceeds the simplified NSP limit of ₹1.2 lakh.",
-        )
+    if annual_income > INCOME_LIMIT:
+        return False, REASONS[INCOME_TOO_HIGH]
 
-    if student_class not in (10, 12):
-        return (
-            False,
-            "Ineligible: only class 10 and 12 students are considered in this simplified NSP demo.",
-        )
+    if student_class not in ELIGIBLE_CLASSES:
+        return False, REASONS[CLASS_NOT_ELIGIBLE]
 
-    return True, (
-        "Eligible by rule check: class and income are within the simplified NSP criteria."
-    )
+    return True, REASONS[ELIGIBLE]
+
+
+def evaluate_eligibility_batch(columns: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Columnar version of evaluate_eligibility.
+
+    Args:
+        columns: DataFrame or mapping of column name -> array, using the
+            same field names and defaults as the scalar payload.
+
+    Returns:
+        eligible: boolean mask, one entry per row.
+        codes:    integer reason code per row; REASONS[code] is the
+                  same string evaluate_eligibility would return.
+    """
+    n = batch_length(columns)
+    age = int_column(columns, "age", 0, n)
+    annual_income = float_column(columns, "annual_income", 0.0, n)
+    student_class = int_column(columns, "student_class", 0, n)
 
+    codes = np.select(
+        [
+            age < MIN_AGE,
+            annual_income > INCOME_LIMIT,
+            ~np.isin(student_class, ELIGIBLE_CLASSES),
+        ],
+        [UNDERAGE, INCOME_TOO_HIGH, CLASS_NOT_ELIGIBLE],
+        default=ELIGIBLE,
+    ).astype(np.int8)
+    return codes == ELIGIBLE, codes
 
-__all__ = ["evaluate_eligibility"]
 
+__all__ = ["ELIGIBLE_RANGES", "REASONS", "evaluate_eligibility", "evaluate_eligibility_batch"]
@@ -8,7 +8,7 @@ It only documents which inputs are:
 - deliberately excluded for ethical reasons.
 """
 
-from typing import Any, Mapping, Sequence, List
+from typing import Any, Dict, Mapping, Sequence, List
 
 # Non-sensitive features that the ML model is allowed to use
 # for estimating approval probability.
@@ -37,6 +37,13 @@ EXCLUDED_FEATURES: List[str] = [
 ]
 
 
+# Counterfactuals may suggest income (in rupees) and land (in 0.01 acre).
+ACTIONABLE_FEATURES: Dict[str, float] = {
+    "annual_income": 1.0,
+    "land_size_acres": 0.01,
+}
+
+
 def extract_model_features(payload: Mapping[str, Any]) -> Sequence[float]:
     """
     Extract numeric model features from an incoming request payload.
@@ -60,6 +67,7 @@ __all__ = [
     "FEATURES",
     "SENSITIVE_FEATURES",
     "EXCLUDED_FEATURES",
+    "ACTIONABLE_FEATURES",
     "extract_model_features",
 ]
 
@@ -7,7 +7,40 @@ only to estimate approval probability for applications
 that pass these rules.
 """
 
-from typing import Any, Mapping, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.schemes.columns import batch_length, float_column, int_column
+
+
+INCOME_LIMIT = 150_000
+
+# Reason codes shared by the scalar and columnar rule engines.
+# REASONS[code] is the human-readable explanation for that outcome.
+ELIGIBLE = 0
+NOT_FARMER = 1
+NO_LAND = 2
+NO_LAND_SIZE = 3
+INCOME_TOO_HIGH = 4
+
+REASONS: Tuple[str, ...] = (
+    "Eligible by rule check: applicant is a farmer with cultivable land and "
+    "income within the simplified PM-KISAN limit.",
+    "Ineligible: applicant is not registered as a farmer.",
+    "Ineligible: applicant does not own cultivable agricultural land.",
+    "Ineligible: land size must be greater than zero acres.",
+    "Ineligible: annual income exceeds the simplified PM-KISAN limit of ₹1.5 lakh.",
+)
+
+
+# Occupation, land and income checks below as ranges, for counterfactuals.
+ELIGIBLE_RANGES: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "is_farmer": (1, 1),
+    "owns_land": (1, 1),
+    "land_size_acres": (0.0, None),  # strictly positive, see below
+    "annual_income": (None, INCOME_LIMIT),
+}
 
 
 def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
@@ -26,25 +59,47 @@ def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
 
     # Basic rule checks aligned with a simplified view of PM-KISAN policy.
     if not is_farmer:
-        return False, "Ineligible: applicant is not registered as a farmer."
+        return False, REASONS[NOT_FARMER]
 
     if not owns_land:
-        return False, "Ineligible: applicant does not own cultivable agricultural land."
+        return False, REASONS[NO_LAND]
 
     if land_size <= 0:
-        return False, "Ineligible: land size must be greater than zero acres."
+        return False, REASONS[NO_LAND_SIZE]
 
-    if annual_income > 150_000:
-        return (
-            False,
-            "Ineligible: annual income exceeds the simplified PM-KISAN limit of ₹1.5 lakh.",
-        )
+    if annual_income > INCOME_LIMIT:
+        return False, REASONS[INCOME_TOO_HIGH]
 
-    return True, (
-        "Eligible by rule check: applicant is a farmer with cultivable land and "
-        "income within the simplified PM-KISAN limit."
-    )
+    return True, REASONS[ELIGIBLE]
+
+
+def evaluate_eligibility_batch(columns: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Columnar version of evaluate_eligibility.
+
+    Args:
+        columns: DataFrame or mapping of column name -> array, using the
+            same field names and defaults as the scalar payload.
+
+    Returns:
+        eligible: boolean mask, one entry per row.
+        codes:    integer reason code per row; REASONS[code] is the
+                  same string evaluate_eligibility would return.
+    """
+    n = batch_length(columns)
+    land_size = float_column(columns, "land_size_acres", 0.0, n)
+    annual_income = float_column(columns, "annual_income", 0.0, n)
+    owns_land = int_column(columns, "owns_land", 0, n)
+    is_farmer = int_column(columns, "is_farmer", 0, n)
 
+    # np.select picks the first matching condition, mirroring the
+    # early returns above.
+    codes = np.select(
+        [is_farmer == 0, owns_land == 0, land_size <= 0, annual_income > INCOME_LIMIT],
+        [NOT_FARMER, NO_LAND, NO_LAND_SIZE, INCOME_TOO_HIGH],
+        default=ELIGIBLE,
+    ).astype(np.int8)
+    return codes == ELIGIBLE, codes
 
-__all__ = ["evaluate_eligibility"]
 
+__all__ = ["ELIGIBLE_RANGES", "REASONS", "evaluate_eligibility", "evaluate_eligibility_batch"]
@@ -9,7 +9,7 @@ This module documents which request fields:
 No training or prediction logic lives here.
 """
 
-from typing import Any, Mapping, Sequence, List
+from typing import Any, Dict, Mapping, Sequence, List
 
 
 FEATURES: List[str] = [
@@ -29,6 +29,12 @@ EXCLUDED_FEATURES: List[str] = [
 ]
 
 
+# Counterfactuals may only suggest a change of income.
+ACTIONABLE_FEATURES: Dict[str, float] = {
+    "annual_income": 1.0,
+}
+
+
 def extract_model_features(payload: Mapping[str, Any]) -> Sequence[float]:
     """
     Extract numeric features for the PMAY probability model.
@@ -51,6 +57,7 @@ __all__ = [
     "FEATURES",
     "SENSITIVE_FEATURES",
     "EXCLUDED_FEATURES",
+    "ACTIONABLE_FEATURES",
     "extract_model_features",
 ]
 
@@ -7,7 +7,37 @@ The goal is to keep this logic:
 - easy to adjust if policy assumptions change.
 """
 
-from typing import Any, Mapping, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.schemes.columns import batch_length, float_column, int_column
+
+
+MIN_AGE = 18
+INCOME_LIMIT = 120_000
+
+# Reason codes shared by the scalar and columnar rule engines.
+# REASONS[code] is the human-readable explanation for that outcome.
+ELIGIBLE = 0
+ELIGIBLE_LABOURER = 1
+UNDERAGE = 2
+INCOME_TOO_HIGH = 3
+
+REASONS: Tuple[str, ...] = (
+    "Eligible by rule check: income is within limit and applicant is not restricted by occupation.",
+    "Eligible by rule check: income is within limit and applicant is a labourer, "
+    "which is prioritised in this simplified demo.",
+    "Ineligible: applicant must be at least 18 years old.",
+    "Ineligible: annual income exceeds the simplified PMAY limit of ₹1.2 lakh.",
+)
+
+
+# Age and income limits of the checks below, for counterfactuals.
+ELIGIBLE_RANGES: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "age": (MIN_AGE, None),
+    "annual_income": (None, INCOME_LIMIT),
+}
 
 
 def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
@@ -22,26 +52,42 @@ def evaluate_eligibility(payload: Mapping[str, Any]) -> Tuple[bool, str]:
     annual_income = float(payload.get("annual_income", 0.0))
     is_laborer = int(payload.get("is_laborer", 0))
 
-    if age < 18:
-        return False, "Ineligible: applicant must be at least 18 years old."
+    if age < MIN_AGE:
+        return False, REASONS[UNDERAGE]
 
-    if annual_income > 120_000:
-        return (
-            False,
-            "Ineligible: annual income exceeds the simplified PMAY limit of ₹1.2 lakh.",
-        )
+    if annual_income > INCOME_LIMIT:
+        return False, REASONS[INCOME_TOO_HIGH]
 
     if not is_laborer:
-        return (
-            True,
-            "Eligible by rule check: income is within limit and applicant is not restricted by occupation.",
-        )
+        return True, REASONS[ELIGIBLE]
 
-    return True, (
-        "Eligible by rule check: income is within limit and applicant is a labourer, "
-        "which is prioritised in this simplified demo."
-    )
+    return True, REASONS[ELIGIBLE_LABOURER]
+
+
+def evaluate_eligibility_batch(columns: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Columnar version of evaluate_eligibility.
+
+    Args:
+        columns: DataFrame or mapping of column name -> array, using the
+            same field names and defaults as the scalar payload.
+
+    Returns:
+        eligible: boolean mask, one entry per row.
+        codes:    integer reason code per row; REASONS[code] is the
+                  same string evaluate_eligibility would return.
+    """
+    n = batch_length(columns)
+    age = int_column(columns, "age", 0, n)
+    annual_income = float_column(columns, "annual_income", 0.0, n)
+    is_laborer = int_column(columns, "is_laborer", 0, n)
 
+    codes = np.select(
+        [age < MIN_AGE, annual_income > INCOME_LIMIT, is_laborer == 0],
+        [UNDERAGE, INCOME_TOO_HIGH, ELIGIBLE],
+        default=ELIGIBLE_LABOURER,
+    ).astype(np.int8)
+    return codes <= ELIGIBLE_LABOURER, codes
 
-__all__ = ["evaluate_eligibility"]
 
+__all__ = ["ELIGIBLE_RANGES", "REASONS", "evaluate_eligibility", "evaluate_eligibility_batch"]
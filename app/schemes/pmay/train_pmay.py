@@ -6,37 +6,45 @@ from sklearn.linear_model import LogisticRegression
 import joblib
 from pathlib import Path
 
-np.random.seed(42)
-n = 500
-
-# ---------- SYNTHETIC DATA ----------
-data = pd.DataFrame({
-    "age": np.random.randint(18, 60, n),
-    "annual_income": np.random.uniform(20000, 200000, n),
-    "is_female": np.random.choice([0, 1], n),
-    "is_laborer": np.random.choice([0, 1], n),
-})
-
-# Ground truth eligibility logic
-data["eligible"] = (
-    (data["annual_income"] <= 120000) &
-    (data["is_female"] == 1)
-).astype(int)
-
-X = data.drop("eligible", axis=1)
-y = data["eligible"]
+BASE_DIR = Path(__file__).resolve().parent
+MODEL_PATH = BASE_DIR / "pipeline.pkl"
+
+
+# ---------- DATA GENERATION ----------
+def generate_data(n: int = 500, seed: int = 42) -> pd.DataFrame:
+    """Synthetic applicants with ground-truth labels; reproducible per seed."""
+    rng = np.random.RandomState(seed)
+    data = pd.DataFrame({
+        "age": rng.randint(18, 60, n),
+        "annual_income": rng.uniform(20000, 200000, n),
+        "is_laborer": rng.choice([0, 1], n),
+    })
+
+    # Ground truth eligibility logic. Only FEATURES are generated: gender
+    # is a sensitive attribute and must never drive the model.
+    data["eligible"] = (data["annual_income"] <= 120000).astype(int)
+    return data
+
 
 # ---------- PIPELINE ----------
-pipeline = Pipeline([
-    ("scaler", StandardScaler()),
-    ("model", LogisticRegression())
-])
+def build_pipeline() -> Pipeline:
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("model", LogisticRegression())
+    ])
 
-pipeline.fit(X, y)
 
-BASE_DIR = Path(__file__).resolve().parent
-MODEL_PATH = BASE_DIR / "pipeline.pkl"
+def train(n: int = 500, seed: int = 42) -> Pipeline:
+    data = generate_data(n, seed)
+    X = data.drop("eligible", axis=1)
+    y = data["eligible"]
+    return build_pipeline().fit(X, y)
+
+
+# ---------- SAVE MODEL ----------
+if __name__ == "__main__":
+    pipeline = train()
+    joblib.dump(pipeline, MODEL_PATH)
 
-joblib.dump(pipeline, MODEL_PATH)
-print("✅ PMAY pipeline saved at:", MODEL_PATH)
-print("📦 File size (bytes):", MODEL_PATH.stat().st_size)
+    print("✅ PMAY pipeline saved at:", MODEL_PATH)
+    print("📦 File size (bytes):", MODEL_PATH.stat().st_size)
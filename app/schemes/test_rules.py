@@ -0,0 +1,54 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.predictor import SCHEME_TABLE
+
+# Values on and around every rule limit, per scheme rule input.
+GRIDS = {
+    "pm_kisan": {
+        "land_size_acres": [-1.0, 0.0, 1e-9, 2.5],
+        "annual_income": [0.0, 150_000, 150_000.01, 200_000],
+        "owns_land": [0, 1, 0.5],
+        "is_farmer": [0, 1, 2],
+    },
+    "pmay": {
+        "age": [0, 17, 17.9, 18, 60],
+        "annual_income": [0.0, 120_000, 120_000.01],
+        "is_laborer": [0, 1],
+    },
+    "nsp": {
+        "age": [9, 9.99, 10, 25],
+        "annual_income": [0.0, 120_000, 120_000.01],
+        "student_class": [1, 10, 11, 12, 12.5],
+    },
+    "ayushman": {
+        "age": [-3, 0, 0.5, 1, 40],
+        "annual_income": [0.0, 120_000, 120_000.01],
+        "has_family_id": [0, 1],
+    },
+}
+
+
+def test_every_scheme_has_a_grid():
+    assert set(GRIDS) == {scheme.scheme_id for scheme in SCHEME_TABLE}
+
+
+@pytest.mark.parametrize("scheme", SCHEME_TABLE, ids=lambda scheme: scheme.scheme_id)
+def test_batch_rules_match_scalar(scheme):
+    grid = GRIDS[scheme.scheme_id]
+    rows = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    df = pd.DataFrame(rows)
+
+    for columns in (df, {name: df[name].to_numpy() for name in df.columns}):
+        eligible, codes = scheme.rules_batch(columns)
+        for row, mask, code in zip(rows, eligible, codes):
+            assert (bool(mask), scheme.reasons[code]) == scheme.rules(row), row
+
+    # Missing columns fall back to the same defaults as the scalar rules.
+    first = next(iter(grid))
+    eligible, codes = scheme.rules_batch({first: np.asarray(df[first])})
+    for row, mask, code in zip(rows, eligible, codes):
+        assert (bool(mask), scheme.reasons[code]) == scheme.rules({first: row[first]})
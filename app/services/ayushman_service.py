@@ -1,7 +1,11 @@
+from typing import List, Union
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import joblib
-from pathlib import Path
+
+from app.utils.metrics import metrics
+from app.utils.model_registry import DEFAULT_ARTIFACT, registry
+from app.utils.scoring import predict_with_proba
 
 router = APIRouter(prefix="/api", tags=["Ayushman"])
 
@@ -10,18 +14,11 @@ class AyushmanRequest(BaseModel):
     annual_income: float
     has_family_id: int
 
-BASE_DIR = Path(__file__).resolve().parent.parent / "models" / "ayushman"
-MODEL_PATH = BASE_DIR / "pipeline.pkl"
-
-_pipeline = None
-
 def get_pipeline():
-    global _pipeline
-    if _pipeline is None:
-        if not MODEL_PATH.exists():
-            raise HTTPException(status_code=500, detail="Ayushman Bharat model not found. Train the model first.")
-        _pipeline = joblib.load(MODEL_PATH)
-    return _pipeline
+    try:
+        return registry.get_scorer("ayushman", registry.preferred_artifact("ayushman", DEFAULT_ARTIFACT))
+    except FileNotFoundError:
+        raise HTTPException(status_code=500, detail="Ayushman Bharat model not found. Train the model first.")
 
 def explain_ayushman(data: AyushmanRequest):
     reasons = []
@@ -30,16 +27,27 @@ def explain_ayushman(data: AyushmanRequest):
     return reasons
 
 @router.post("/ayushman/predict")
-def predict_ayushman(data: AyushmanRequest):
-    pipeline = get_pipeline()
-    features = [[data.age, data.annual_income, data.has_family_id]]
-    prediction = pipeline.predict(features)[0]
-    probability = pipeline.predict_proba(features)[0][1]
-    explanation = explain_ayushman(data)
-    return {
-        "scheme": "Ayushman Bharat",
-        "eligible": bool(prediction),
-        "approval_probability": round(float(probability), 2),
-        "expected_annual_health_cover": 500000 if prediction else 0,
-        "explanation": explanation
-    }
+def predict_ayushman(data: Union[AyushmanRequest, List[AyushmanRequest]]):
+    """Score one applicant, or a list of applicants in a single pass."""
+    rows = data if isinstance(data, list) else [data]
+    if not rows:
+        return []
+    metrics.inc("predict_records_total", "api", "ayushman", amount=len(rows))
+    with metrics.stage("api", "ayushman", "load_model"):
+        pipeline = get_pipeline()
+    features = [[r.age, r.annual_income, r.has_family_id] for r in rows]
+    with metrics.stage("api", "ayushman", "predict_proba"):
+        predictions, probabilities = predict_with_proba(pipeline, features)
+    with metrics.stage("api", "ayushman", "explanation"):
+        explanations = [explain_ayushman(r) for r in rows]
+    results = [
+        {
+            "scheme": "Ayushman Bharat",
+            "eligible": bool(prediction),
+            "approval_probability": round(float(probability), 2),
+            "expected_annual_health_cover": 500000 if prediction else 0,
+            "explanation": explanation
+        }
+        for prediction, probability, explanation in zip(predictions, probabilities, explanations)
+    ]
+    return results if isinstance(data, list) else results[0]
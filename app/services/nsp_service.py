@@ -1,7 +1,11 @@
+from typing import List, Union
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import joblib
-from pathlib import Path
+
+from app.utils.metrics import metrics
+from app.utils.model_registry import DEFAULT_ARTIFACT, registry
+from app.utils.scoring import predict_with_proba
 
 router = APIRouter(prefix="/api", tags=["NSP"])
 
@@ -10,18 +14,11 @@ class NSPRequest(BaseModel):
     annual_income: float
     student_class: int
 
-BASE_DIR = Path(__file__).resolve().parent.parent / "models" / "nsp"
-MODEL_PATH = BASE_DIR / "pipeline.pkl"
-
-_pipeline = None
-
 def get_pipeline():
-    global _pipeline
-    if _pipeline is None:
-        if not MODEL_PATH.exists():
-            raise HTTPException(status_code=500, detail="NSP model not found. Train the model first.")
-        _pipeline = joblib.load(MODEL_PATH)
-    return _pipeline
+    try:
+        return registry.get_scorer("nsp", registry.preferred_artifact("nsp", DEFAULT_ARTIFACT))
+    except FileNotFoundError:
+        raise HTTPException(status_code=500, detail="NSP model not found. Train the model first.")
 
 def explain_nsp(data: NSPRequest):
     reasons = []
@@ -30,16 +27,27 @@ def explain_nsp(data: NSPRequest):
     return reasons
 
 @router.post("/nsp/predict")
-def predict_nsp(data: NSPRequest):
-    pipeline = get_pipeline()
-    features = [[data.age, data.annual_income, data.student_class]]
-    prediction = pipeline.predict(features)[0]
-    probability = pipeline.predict_proba(features)[0][1]
-    explanation = explain_nsp(data)
-    return {
-        "scheme": "NSP",
-        "eligible": bool(prediction),
-        "approval_probability": round(float(probability), 2),
-        "expected_scholarship": 50000 if prediction else 0,
-        "explanation": explanation
-    }
+def predict_nsp(data: Union[NSPRequest, List[NSPRequest]]):
+    """Score one applicant, or a list of applicants in a single pass."""
+    rows = data if isinstance(data, list) else [data]
+    if not rows:
+        return []
+    metrics.inc("predict_records_total", "api", "nsp", amount=len(rows))
+    with metrics.stage("api", "nsp", "load_model"):
+        pipeline = get_pipeline()
+    features = [[r.age, r.annual_income, r.student_class] for r in rows]
+    with metrics.stage("api", "nsp", "predict_proba"):
+        predictions, probabilities = predict_with_proba(pipeline, features)
+    with metrics.stage("api", "nsp", "explanation"):
+        explanations = [explain_nsp(r) for r in rows]
+    results = [
+        {
+            "scheme": "NSP",
+            "eligible": bool(prediction),
+            "approval_probability": round(float(probability), 2),
+            "expected_scholarship": 50000 if prediction else 0,
+            "explanation": explanation
+        }
+        for prediction, probability, explanation in zip(predictions, probabilities, explanations)
+    ]
+    return results if isinstance(data, list) else results[0]
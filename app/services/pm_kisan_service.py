@@ -1,7 +1,11 @@
+from typing import List, Union
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import joblib
-from pathlib import Path
+
+from app.utils.metrics import metrics
+from app.utils.model_registry import DEFAULT_ARTIFACT, registry
+from app.utils.scoring import predict_with_proba
 
 router = APIRouter(prefix="/api", tags=["PM-KISAN"])
 
@@ -14,27 +18,19 @@ class PMKisanRequest(BaseModel):
 
 
 # ---------- MODEL LOADING ----------
-BASE_DIR = Path(__file__).resolve().parent.parent / "models" / "pm_kisan"
-MODEL_PATH = BASE_DIR / "pipeline.pkl"
-
-_pipeline = None
-
 def get_pipeline():
-    global _pipeline
-    if _pipeline is None:
-        if not MODEL_PATH.exists():
-            raise HTTPException(
-                status_code=500,
-                detail="PM-KISAN model not found. Train the model first."
-            )
-        try:
-            _pipeline = joblib.load(MODEL_PATH)
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to load PM-KISAN model: {str(e)}"
-            )
-    return _pipeline
+    try:
+        return registry.get_scorer("pm_kisan", registry.preferred_artifact("pm_kisan", DEFAULT_ARTIFACT))
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail="PM-KISAN model not found. Train the model first."
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load PM-KISAN model: {str(e)}"
+        )
 
 
 # ---------- EXPLANATION LOGIC ----------
@@ -61,25 +57,27 @@ def explain_pm_kisan(data: PMKisanRequest):
 
 # ---------- API ENDPOINT ----------
 @router.post("/pm-kisan/predict")
-def predict_pm_kisan(data: PMKisanRequest):
-    pipeline = get_pipeline()
-
-    features = [[
-        data.land_size_acres,
-        data.annual_income,
-        data.owns_land,
-        data.is_farmer
-    ]]
-
-    prediction = pipeline.predict(features)[0]
-    probability = pipeline.predict_proba(features)[0][1]
-
-    explanation = explain_pm_kisan(data)
-
-    return {
-        "scheme": "PM-KISAN",
-        "eligible": bool(prediction),
-        "approval_probability": round(float(probability), 2),
-        "expected_annual_benefit": 6000 if prediction else 0,
-        "explanation": explanation
-    }
+def predict_pm_kisan(data: Union[PMKisanRequest, List[PMKisanRequest]]):
+    """Score one applicant, or a list of applicants in a single pass."""
+    rows = data if isinstance(data, list) else [data]
+    if not rows:
+        return []
+    metrics.inc("predict_records_total", "api", "pm_kisan", amount=len(rows))
+    with metrics.stage("api", "pm_kisan", "load_model"):
+        pipeline = get_pipeline()
+    features = [[r.land_size_acres, r.annual_income, r.owns_land, r.is_farmer] for r in rows]
+    with metrics.stage("api", "pm_kisan", "predict_proba"):
+        predictions, probabilities = predict_with_proba(pipeline, features)
+    with metrics.stage("api", "pm_kisan", "explanation"):
+        explanations = [explain_pm_kisan(r) for r in rows]
+    results = [
+        {
+            "scheme": "PM-KISAN",
+            "eligible": bool(prediction),
+            "approval_probability": round(float(probability), 2),
+            "expected_annual_benefit": 6000 if prediction else 0,
+            "explanation": explanation
+        }
+        for prediction, probability, explanation in zip(predictions, probabilities, explanations)
+    ]
+    return results if isinstance(data, list) else results[0]
@@ -1,46 +1,55 @@
+from typing import List, Optional, Union
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import joblib
-from pathlib import Path
+
+from app.utils.metrics import metrics
+from app.utils.model_registry import DEFAULT_ARTIFACT, registry
+from app.utils.scoring import predict_with_proba
 
 router = APIRouter(prefix="/api", tags=["PMAY"])
 
 class PMAYRequest(BaseModel):
     age: int
     annual_income: float
-    is_female: int
+    # Accepted for compatibility; gender is never used for scoring.
+    is_female: Optional[int] = None
     is_laborer: int
 
-BASE_DIR = Path(__file__).resolve().parent.parent / "models" / "pmay"
-MODEL_PATH = BASE_DIR / "pipeline.pkl"
-
-_pipeline = None
-
 def get_pipeline():
-    global _pipeline
-    if _pipeline is None:
-        if not MODEL_PATH.exists():
-            raise HTTPException(status_code=500, detail="PMAY model not found. Train the model first.")
-        _pipeline = joblib.load(MODEL_PATH)
-    return _pipeline
+    try:
+        return registry.get_scorer("pmay", registry.preferred_artifact("pmay", DEFAULT_ARTIFACT))
+    except FileNotFoundError:
+        raise HTTPException(status_code=500, detail="PMAY model not found. Train the model first.")
 
 def explain_pmay(data: PMAYRequest):
     reasons = []
-    reasons.append("Applicant is female" if data.is_female else "Applicant is not female")
+    reasons.append("Applicant is a labourer" if data.is_laborer else "Applicant is not a labourer")
     reasons.append("Annual income is within PMAY limit" if data.annual_income <= 120000 else "Annual income exceeds PMAY limit")
     return reasons
 
 @router.post("/pmay/predict")
-def predict_pmay(data: PMAYRequest):
-    pipeline = get_pipeline()
-    features = [[data.age, data.annual_income, data.is_female, data.is_laborer]]
-    prediction = pipeline.predict(features)[0]
-    probability = pipeline.predict_proba(features)[0][1]
-    explanation = explain_pmay(data)
-    return {
-        "scheme": "PMAY",
-        "eligible": bool(prediction),
-        "approval_probability": round(float(probability), 2),
-        "expected_annual_benefit": 250000 if prediction else 0,
-        "explanation": explanation
-    }
+def predict_pmay(data: Union[PMAYRequest, List[PMAYRequest]]):
+    """Score one applicant, or a list of applicants in a single pass."""
+    rows = data if isinstance(data, list) else [data]
+    if not rows:
+        return []
+    metrics.inc("predict_records_total", "api", "pmay", amount=len(rows))
+    with metrics.stage("api", "pmay", "load_model"):
+        pipeline = get_pipeline()
+    features = [[r.age, r.annual_income, r.is_laborer] for r in rows]
+    with metrics.stage("api", "pmay", "predict_proba"):
+        predictions, probabilities = predict_with_proba(pipeline, features)
+    with metrics.stage("api", "pmay", "explanation"):
+        explanations = [explain_pmay(r) for r in rows]
+    results = [
+        {
+            "scheme": "PMAY",
+            "eligible": bool(prediction),
+            "approval_probability": round(float(probability), 2),
+            "expected_annual_benefit": 250000 if prediction else 0,
+            "explanation": explanation
+        }
+        for prediction, probability, explanation in zip(predictions, probabilities, explanations)
+    ]
+    return results if isinstance(data, list) else results[0]
@@ -0,0 +1,110 @@
+import io
+import json
+
+import pytest
+
+from app import bulk_score
+from app.bulk_score import main, score_file
+from app.predictor import PredictRequest, predict_many, select_schemes
+from benchmarks.payloads import generate
+
+
+def _write_jsonl(path, records):
+    with path.open("w", encoding="utf-8") as f:
+        for record in records:
+            f.write(record if isinstance(record, str) else json.dumps(record))
+            f.write("\n")
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_bad_records_and_failing_schemes_do_not_stop_the_run(tmp_path, failing_pmay):
+    payloads = generate("predict", 300)
+    source = tmp_path / "applicants.jsonl"
+    _write_jsonl(source, payloads[:100] + ["{not json"] + [{"age": "old"}] + payloads[100:])
+    output = tmp_path / "results.jsonl"
+
+    assert score_file(source, output, chunk_size=64, log=io.StringIO()) == 302
+    lines = _read_jsonl(output)
+    assert [line["row"] for line in lines] == list(range(302))
+    assert lines[100]["error"].startswith("invalid JSON")
+    assert "age" in lines[101]["error"]
+
+    scored = [line for line in lines if "result" in line]
+    assert len(scored) == 300
+    # Only the failing PMAY model is lost.
+    failed = [line for line in scored if "scheme_errors" in line]
+    assert failed and all(set(line["scheme_errors"]) == {"PMAY"} for line in failed)
+
+    others = select_schemes(["pm_kisan", "nsp", "ayushman"])
+    expected = predict_many([PredictRequest(**p) for p in payloads], schemes=others)
+    for line, response in zip(scored, expected):
+        schemes = [s for s in line["result"]["schemes"] if s["scheme"] != "PMAY"]
+        assert schemes == [s.model_dump() for s in response.schemes]
+
+
+class _Crash(Exception):
+    pass
+
+
+def _crash_on_call(monkeypatch, name, call):
+    original = getattr(bulk_score, name)
+    calls = []
+
+    def crashing(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == call:
+            raise _Crash
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(bulk_score, name, crashing)
+
+
+@pytest.mark.parametrize(
+    "crash_in",
+    [
+        "_score_chunk",  # before the chunk is written
+        "_save_checkpoint",  # after the chunk is written, before its checkpoint
+    ],
+)
+def test_interrupted_run_resumes_without_losing_or_repeating_rows(tmp_path, monkeypatch, crash_in):
+    source = tmp_path / "applicants.jsonl"
+    _write_jsonl(source, generate("predict", 250, seed=7))
+    reference = tmp_path / "reference.jsonl"
+    score_file(source, reference, chunk_size=40, log=io.StringIO())
+
+    output = tmp_path / "results.jsonl"
+    with monkeypatch.context() as m:
+        _crash_on_call(m, crash_in, 3)
+        with pytest.raises(_Crash):
+            score_file(source, output, chunk_size=40, log=io.StringIO())
+    checkpoint = json.loads((tmp_path / "results.jsonl.ckpt").read_text())
+    assert checkpoint["rows_done"] == 80
+
+    assert main([str(source), "-o", str(output), "--chunk-size", "40"]) == 0
+    assert output.read_bytes() == reference.read_bytes()
+    assert not (tmp_path / "results.jsonl.ckpt").exists()
+
+
+def test_csv_input_resumes_from_checkpoint(tmp_path, monkeypatch):
+    payloads = generate("predict", 120, seed=3)
+    fields = list(payloads[0])
+    source = tmp_path / "applicants.csv"
+    with source.open("w", encoding="utf-8") as f:
+        f.write(",".join(fields) + "\n")
+        for p in payloads:
+            f.write(",".join("" if p[k] is None else str(p[k]) for k in fields) + "\n")
+
+    reference = tmp_path / "reference.jsonl"
+    score_file(source, reference, chunk_size=50, log=io.StringIO())
+    output = tmp_path / "results.jsonl"
+    with monkeypatch.context() as m:
+        _crash_on_call(m, "_save_checkpoint", 2)
+        with pytest.raises(_Crash):
+            score_file(source, output, chunk_size=50, log=io.StringIO())
+
+    score_file(source, output, chunk_size=50, log=io.StringIO())
+    assert output.read_bytes() == reference.read_bytes()
+    assert [line["row"] for line in _read_jsonl(output)] == list(range(120))
@@ -0,0 +1,107 @@
+import io
+import math
+
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.columnar_score import score_batch, score_file
+from app.predictor import PredictRequest, predict_many, select_schemes
+
+
+def _records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n):
+        age = int(rng.integers(5, 70))
+        income = float(rng.uniform(20_000, 200_000))
+        records.append(
+            {
+                "age": age,
+                "annual_income": income,
+                "gender": str(rng.choice(["male", " Female", "other"])),
+                "state": "UP",
+                "occupation": str(rng.choice(["farmer", "Student ", "other"])),
+                "land_holding_acres": [None, 0.0, 2.5][int(rng.integers(3))],
+                "has_family_id": [None, 0, 1][int(rng.integers(3))],
+            }
+        )
+    return records
+
+
+def test_columnar_scores_match_predict():
+    records = _records(400)
+    schemes = select_schemes(None)
+    scored = score_batch(pa.RecordBatch.from_pylist(records), schemes).to_pydict()
+    scheme_errors = []
+    responses = predict_many([PredictRequest(**r) for r in records], schemes=schemes, scheme_errors=scheme_errors)
+
+    assert scored["error"] == [None] * len(records)
+    for i, response in enumerate(responses):
+        by_label = {result.scheme: result for result in response.schemes}
+        for scheme in schemes:
+            result = by_label.get(scheme.label)
+            eligible = scored[f"{scheme.scheme_id}_eligible"][i]
+            probability = scored[f"{scheme.scheme_id}_probability"][i]
+            benefit = scored[f"{scheme.scheme_id}_expected_annual_benefit"][i]
+            error = scored[f"{scheme.scheme_id}_error"][i]
+            if scheme.label in scheme_errors[i]:
+                # The model failed: eligible by the rules, but no probability.
+                assert eligible and probability is None and error is not None
+            elif result is None:
+                assert not eligible and probability is None and benefit is None and error is None
+            else:
+                assert eligible and error is None
+                assert round(probability * 100, 2) == result.approval_probability
+                assert benefit == result.expected_annual_benefit
+
+
+def test_failing_scheme_does_not_stop_the_others(failing_pmay):
+    records = _records(200, seed=2)
+    scored = score_batch(pa.RecordBatch.from_pylist(records), select_schemes(None), keep_input=False).to_pydict()
+
+    pmay_eligible = [i for i, e in enumerate(scored["pmay_eligible"]) if e]
+    assert pmay_eligible
+    assert all(scored["pmay_error"][i].startswith("ValueError: ") for i in pmay_eligible)
+    assert all(scored["pmay_probability"][i] is None for i in pmay_eligible)
+    assert {i for i, e in enumerate(scored["pmay_error"]) if e} == set(pmay_eligible)
+
+    others = select_schemes(["pm_kisan", "nsp", "ayushman"])
+    alone = score_batch(pa.RecordBatch.from_pylist(records), others, keep_input=False).to_pydict()
+    for name, values in alone.items():
+        assert scored[name] == values
+
+
+def test_invalid_rows_are_reported_not_scored():
+    batch = pa.RecordBatch.from_pylist(
+        [
+            {"age": 30, "annual_income": 50_000.0, "gender": "f", "state": "UP", "occupation": "farmer"},
+            {"age": None, "annual_income": 50_000.0, "gender": "f", "state": "UP", "occupation": "farmer"},
+            {"age": 30.5, "annual_income": 50_000.0, "gender": "f", "state": "UP", "occupation": "farmer"},
+            {"age": 30, "annual_income": 50_000.0, "gender": None, "state": "UP", "occupation": "farmer"},
+        ]
+    )
+    scored = score_batch(batch, select_schemes(["pm_kisan"]), keep_input=False).to_pydict()
+    assert scored["error"] == [None, "age: field required", "age: must be an integer", "gender: field required"]
+    assert scored["pm_kisan_eligible"] == [True, None, None, None]
+    assert not math.isnan(scored["pm_kisan_probability"][0])
+
+    with pytest.raises(ValueError, match="occupation"):
+        score_batch(batch.drop_columns(["occupation"]))
+
+
+def test_score_file_streams_batches(tmp_path):
+    records = _records(250, seed=1)
+    source = tmp_path / "applicants.parquet"
+    pq.write_table(pa.Table.from_pylist(records), source)
+
+    output = tmp_path / "scored.parquet"
+    rows = score_file(source, output, batch_size=64, log=io.StringIO())
+    assert rows == 250
+
+    table = pq.read_table(output)
+    expected = pa.Table.from_batches([score_batch(pa.RecordBatch.from_pylist(records))])
+    assert table.equals(expected)
+    assert not (tmp_path / "scored.parquet.tmp").exists()
@@ -0,0 +1,308 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import predictor
+from app.predictor import (
+    GENDER_GROUPS,
+    PredictRequest,
+    _predict_coalesced,
+    PredictResponse,
+    encode_response,
+    gender_group,
+    predict_many,
+    response_cache,
+    select_schemes,
+    sweep_grid,
+    with_scheme_errors,
+)
+from app.utils.fairness_monitor import fairness_auditor
+from app.utils.metrics import metrics
+from app.utils.micro_batcher import MicroBatcher
+from main import app
+
+client = TestClient(app)
+
+FARMER = {
+    "age": 30,
+    "annual_income": 160000,
+    "gender": "female",
+    "state": "UP",
+    "occupation": "farmer",
+    "land_holding_acres": 2.0,
+}
+
+
+def test_predict_includes_ayushman():
+    response_cache.clear()
+    with_id = client.post("/predict", json=dict(FARMER, annual_income=90000, has_family_id=1)).json()
+    by_label = {result["scheme"]: result for result in with_id["schemes"]}
+    ayushman = by_label["Ayushman Bharat"]
+    assert ayushman["eligible"] is True
+    assert ayushman["expected_annual_benefit"] == 500000.0
+    # Same model as the per-scheme endpoint, which reports a 0-1 probability.
+    api = client.post("/api/ayushman/predict", json={"age": FARMER["age"], "annual_income": 90000, "has_family_id": 1})
+    assert abs(ayushman["approval_probability"] / 100 - api.json()["approval_probability"]) <= 0.005
+
+    without_id = client.post("/predict", json=dict(FARMER, annual_income=90000, has_family_id=0)).json()
+    assert "Ayushman Bharat" not in {result["scheme"] for result in without_id["schemes"]}
+
+
+@pytest.mark.parametrize(
+    "query", ["?schemes=nsp,pm_kisan", "?schemes=nsp&schemes=pm_kisan", "?schemes=nsp, pm_kisan,nsp"]
+)
+def test_predict_schemes_filter(query):
+    body = dict(FARMER, annual_income=90000, has_family_id=1)
+    response = client.post("/predict" + query, json=body)
+    assert response.status_code == 200
+    # Table order, whatever order the filter lists them in.
+    assert [result["scheme"] for result in response.json()["schemes"]] == ["PM-KISAN", "NSP"]
+
+
+def test_predict_rejects_unknown_scheme_ids():
+    response = client.post("/predict?schemes=ayushman,nope&schemes=bogus", json=FARMER)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown scheme(s): bogus, nope. Valid ids: pm_kisan, pmay, nsp, ayushman"
+
+
+def test_sweep_matches_individual_predictions():
+    body = {"applicant": FARMER, "field": "annual_income", "start": 200000, "stop": 100000, "points": 21}
+    response = client.post("/predict/sweep?schemes=pm_kisan,nsp", json=body)
+    assert response.status_code == 200
+    sweep = response.json()
+
+    for i, value in enumerate(sweep["values"]):
+        single = client.post("/predict?schemes=pm_kisan,nsp", json=dict(FARMER, annual_income=value)).json()
+        by_label = {result["scheme"]: result for result in single["schemes"]}
+        for curve in sweep["schemes"]:
+            result = by_label.get(curve["scheme"])
+            assert curve["eligible"][i] is (result is not None)
+            assert curve["approval_probability"][i] == (result and result["approval_probability"])
+
+    flips = {curve["scheme"]: curve["flips"] for curve in sweep["schemes"]}
+    # PM-KISAN's limit is 150k, NSP's 120k; the grid steps by 5k.
+    assert [(f["from_value"], f["to_value"], f["eligible"]) for f in flips["PM-KISAN"]] == [(155000.0, 150000.0, True)]
+    assert [(f["from_value"], f["to_value"], f["eligible"]) for f in flips["NSP"]] == [(125000.0, 120000.0, True)]
+
+
+def test_sweep_reports_a_failing_scheme_in_its_curve(failing_pmay):
+    body = {"applicant": dict(FARMER, occupation="other"), "field": "annual_income", "start": 50000, "stop": 300000}
+    response = client.post("/predict/sweep", json=body)
+    assert response.status_code == 200
+    curves = {curve["scheme"]: curve for curve in response.json()["schemes"]}
+
+    pmay = curves["PMAY"]
+    assert pmay["error"].startswith("ValueError: X has 3 features")
+    assert any(pmay["eligible"])
+    assert pmay["approval_probability"] == [None] * len(pmay["eligible"])
+    others = [curve for label, curve in curves.items() if label != "PMAY"]
+    assert all(curve["error"] is None for curve in others)
+    assert any(p is not None for curve in others for p in curve["approval_probability"])
+
+
+def test_sweep_validation():
+    assert client.post("/predict/sweep", json={"applicant": FARMER, "field": "gender", "start": 0, "stop": 1}).status_code == 422
+    too_many = {"applicant": FARMER, "field": "age", "start": 0, "stop": 1, "points": 10**6}
+    assert client.post("/predict/sweep", json=too_many).status_code == 422
+    body = {"applicant": FARMER, "field": "age", "start": 20, "stop": 30}
+    assert client.post("/predict/sweep?schemes=nope", json=body).status_code == 400
+
+
+@pytest.mark.parametrize(
+    "field, start, stop, points, expected",
+    [
+        ("age", 10, 12, 50, [10, 11, 12]),
+        ("age", 12, 10, 5, [12, 11, 10]),
+        ("age", 10.4, 9.6, 3, [10]),
+        ("annual_income", 100.4, 99.6, 3, [100.4, 100, 99.6]),
+        ("land_holding_acres", 0, 1, 3, [0, 0.5, 1]),
+    ],
+)
+def test_sweep_grid(field, start, stop, points, expected):
+    np.testing.assert_array_equal(sweep_grid(field, start, stop, points), expected)
+
+
+def test_encoded_responses_match_response_model_bytes():
+    payloads = [PredictRequest(**dict(FARMER, gender=gender)) for gender in ("female", " महिला ", 'x"\\')]
+    payloads.append(PredictRequest(**dict(FARMER, annual_income=10**7)))
+    responses = predict_many(payloads, schemes=select_schemes(["pm_kisan", "nsp", "ayushman"]))
+    adapter = TypeAdapter(List[PredictResponse])
+    assert b"[" + b",".join(encode_response(r) for r in responses) + b"]" == adapter.dump_json(responses)
+
+    response_cache.clear()
+    body = dict(FARMER, gender=" महिला ")
+    miss = client.post("/predict?schemes=pm_kisan", json=body)
+    hit = client.post("/predict?schemes=pm_kisan", json=body)
+    assert hit.headers["server-timing"] == "cache;desc=hit"
+    assert miss.headers["content-type"] == hit.headers["content-type"] == "application/json"
+    assert hit.content == miss.content == TypeAdapter(PredictResponse).dump_json(responses[1])
+
+
+def test_coalesced_requests_get_their_own_responses():
+    selections = [select_schemes(["pm_kisan", "nsp"]), select_schemes(["ayushman"]), select_schemes(["nsp"])]
+    items = [
+        (PredictRequest(**dict(FARMER, age=20 + i, annual_income=100000 + 10000 * i)), selections[i % 3])
+        for i in range(6)
+    ]
+    batcher = MicroBatcher(_predict_coalesced, max_batch_size=len(items), max_wait_seconds=5.0, adaptive=False)
+    with ThreadPoolExecutor(len(items)) as pool:
+        coalesced = list(pool.map(batcher.submit, items))
+
+    assert batcher.batches == 1
+    for (payload, selected), (response, timings) in zip(items, coalesced):
+        assert response == predict_many([payload], schemes=selected)[0]
+        assert set(timings) == {s.scheme_id for s in selected}
+
+
+def test_batch_matches_single_predictions():
+    payloads = [
+        dict(FARMER, occupation="other", annual_income=100000),  # PMAY and NSP
+        dict(FARMER, annual_income=90000, has_family_id=1),  # all four
+        dict(FARMER, occupation="student", age=19, annual_income=110000, has_family_id=1),  # all but PM-KISAN
+        dict(FARMER, occupation="other", annual_income=500000),  # nothing
+        dict(FARMER, age=0, annual_income=50000, has_family_id=1),  # PM-KISAN only; rule failures differ
+    ]
+    batch = client.post("/predict/batch", json=payloads)
+    assert batch.status_code == 200
+    singles = [client.post("/predict", json=payload).json() for payload in payloads]
+    assert batch.json() == singles
+    assert sorted({len(single["schemes"]) for single in singles}) == [0, 1, 2, 3, 4]
+
+    empty = client.post("/predict/batch", json=[])
+    assert empty.status_code == 200 and empty.json() == []
+
+
+def test_batch_reports_scheme_failures_per_record(failing_pmay):
+    ok = dict(FARMER, annual_income=140000)  # PM-KISAN only, so PMAY's model is not needed
+    pmay_row = dict(FARMER, annual_income=90000, has_family_id=1)
+    batch = client.post("/predict/batch", json=[ok] * 5 + [pmay_row])
+    assert batch.status_code == 200
+    results = batch.json()
+    assert all("scheme_errors" not in result for result in results[:5])
+    assert list(results[5]["scheme_errors"]) == ["PMAY"]
+    assert "expecting 4 features" in results[5]["scheme_errors"]["PMAY"]
+    # The record keeps every scheme that did score.
+    others = client.post("/predict/batch?schemes=pm_kisan,nsp,ayushman", json=[pmay_row]).json()[0]
+    assert results[5]["schemes"] == others["schemes"]
+
+    errors = []
+    response = with_scheme_errors(predict_many([PredictRequest(**pmay_row)], scheme_errors=errors), errors)[0]
+    assert encode_response(response) == TypeAdapter(PredictResponse).dump_json(response)
+
+
+def _group_counts(scheme_id, group):
+    return fairness_auditor.counts(scheme_id, "gender").get(group, (0, 0))
+
+
+def _group_deltas(before, scheme_ids, group):
+    return {s: tuple(a - b for a, b in zip(_group_counts(s, group), before[s])) for s in scheme_ids}
+
+
+def test_failed_schemes_are_reported_and_not_recorded(failing_pmay):
+    response_cache.clear()
+    all_four = ("pm_kisan", "nsp", "ayushman", "pmay")
+    before = {s: _group_counts(s, "female") for s in all_four}
+    failing = dict(FARMER, annual_income=90000, has_family_id=1, gender=" Female")  # eligible for all four
+    response = client.post("/predict", json=failing)
+    assert response.status_code == 200
+    assert list(response.json()["scheme_errors"]) == ["PMAY"]
+    assert [s["scheme"] for s in response.json()["schemes"]] == ["PM-KISAN", "NSP", "Ayushman Bharat"]
+    assert _group_deltas(before, all_four, "female") == {
+        "pm_kisan": (1, 1),
+        "nsp": (1, 1),
+        "ayushman": (1, 1),
+        "pmay": (0, 0),
+    }
+    # Not cached: the next identical request is scored again.
+    assert client.post("/predict", json=failing).headers["server-timing"] != "cache;desc=hit"
+
+    before = {s: _group_counts(s, "male") for s in ("pm_kisan", "nsp")}
+    ok = dict(FARMER, annual_income=140000, gender="M")
+    assert client.post("/predict?schemes=pm_kisan&schemes=nsp", json=ok).status_code == 200
+    assert _group_deltas(before, ("pm_kisan", "nsp"), "male") == {"pm_kisan": (1, 1), "nsp": (1, 0)}
+
+
+@pytest.mark.parametrize(
+    "gender, group",
+    [
+        ("female", "female"),
+        ("woman", "female"),
+        ("m", "male"),
+        ("", "unknown"),
+        ("prefer not to say", "unknown"),
+        ("non-binary", "other"),
+        ("x" * 40, "other"),
+    ],
+)
+def test_gender_group(gender, group):
+    assert gender_group(gender) == group
+
+
+def test_free_text_gender_does_not_grow_fairness_groups():
+    response_cache.clear()
+    for i in range(20):
+        assert client.post("/predict?schemes=pm_kisan", json=dict(FARMER, gender=f"free text {i}")).status_code == 200
+    assert set(fairness_auditor.counts("pm_kisan", "gender")) <= set(GENDER_GROUPS)
+
+
+def _records_total(scheme_id):
+    return metrics._counters.get("predict_records_total", {}).get(("predict", scheme_id), 0.0)
+
+
+def _concurrent_predictions(monkeypatch, requests):
+    batcher = MicroBatcher(_predict_coalesced, max_batch_size=len(requests), max_wait_seconds=5.0, adaptive=False)
+    monkeypatch.setattr(predictor, "coalescer", batcher)
+    response_cache.clear()
+    lenient = TestClient(app, raise_server_exceptions=False)
+    with ThreadPoolExecutor(len(requests)) as pool:
+        responses = list(pool.map(lambda r: lenient.post("/predict" + r[0], json=r[1]), requests))
+    return batcher, responses
+
+
+def test_scheme_failures_do_not_fail_the_batched_pass(monkeypatch, failing_pmay):
+    requests = [("", dict(FARMER, age=30 + i, annual_income=90000, gender="female")) for i in range(4)]
+    batcher, responses = _concurrent_predictions(monkeypatch, requests)
+    assert [r.status_code for r in responses] == [200] * 4
+    assert all(list(r.json()["scheme_errors"]) == ["PMAY"] for r in responses)
+    assert (batcher.batches, batcher.fallbacks) == (1, 0)
+
+
+def test_batch_fallback_records_each_request_once(monkeypatch):
+    # A request-level failure (not a scheme failure) fails the whole pass.
+    audit = predictor.run_bias_audit
+
+    def failing_audit(predictions, groups, **kwargs):
+        if "group-boom" in groups:
+            raise RuntimeError("boom")
+        return audit(predictions, groups, **kwargs)
+
+    monkeypatch.setattr(predictor, "run_bias_audit", failing_audit)
+    before = {scheme_id: _records_total(scheme_id) for scheme_id in ("pm_kisan", "nsp")}
+    female, other = ({s: _group_counts(s, group) for s in ("pm_kisan", "nsp")} for group in ("female", "other"))
+    ok = [
+        ("?schemes=pm_kisan&schemes=nsp", dict(FARMER, age=30 + i, annual_income=140000, gender="female"))
+        for i in range(3)
+    ]
+    failing = ("?schemes=pm_kisan&schemes=nsp", dict(FARMER, annual_income=140000, gender="group-boom"))
+    batcher, responses = _concurrent_predictions(monkeypatch, ok + [failing])
+
+    assert [r.status_code for r in responses] == [200, 200, 200, 500]
+    assert (batcher.batches, batcher.fallbacks) == (1, 1)
+    assert _group_deltas(female, ("pm_kisan", "nsp"), "female") == {"pm_kisan": (3, 3), "nsp": (3, 0)}
+    # "group-boom" would count as "other"; it failed, so it is not counted.
+    assert _group_deltas(other, ("pm_kisan", "nsp"), "other") == {"pm_kisan": (0, 0), "nsp": (0, 0)}
+    assert _records_total("pm_kisan") - before["pm_kisan"] == 3
+    assert _records_total("nsp") - before["nsp"] == 3
+
+
+def test_income_is_not_rounded_across_rule_limits():
+    response_cache.clear()
+    # PM-KISAN excludes incomes above 150,000.
+    at_limit = client.post("/predict?schemes=pm_kisan", json=dict(FARMER, annual_income=150000)).json()
+    above = client.post("/predict?schemes=pm_kisan", json=dict(FARMER, annual_income=150000.4)).json()
+    assert [s["scheme"] for s in at_limit["schemes"]] == ["PM-KISAN"]
+    assert above["schemes"] == []
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app import serve
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork serving needs os.fork()")
+
+REPO_ROOT = Path(serve.__file__).resolve().parent.parent
+
+
+def test_restart_delay_backs_off_and_is_capped():
+    assert serve.restart_delay(0) == 0.0
+    assert [serve.restart_delay(n) for n in (1, 2, 3)] == [0.5, 1.0, 2.0]
+    assert serve.restart_delay(50) == serve.RESTART_BACKOFF_MAX
+
+
+def test_crashing_worker_logs_its_traceback():
+    code = (
+        "import socket, uvicorn; from app import serve; "
+        "uvicorn.Server.run = lambda self, sockets=None: 1 / 0; "
+        "serve._run_worker(None, socket.socket(), 'error')"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+    assert out.returncode == 1
+    assert "crashed" in out.stderr
+    assert "ZeroDivisionError" in out.stderr
+
+
+def test_workers_crashing_on_start_are_restarted_with_backoff():
+    spawned = []
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            os._exit(1)
+        spawned.append(time.monotonic())
+        return pid
+
+    stop = threading.Event()
+    threading.Timer(2.0, stop.set).start()
+    serve.supervise(spawn, 1, stop)
+
+    # Without backoff a worker would be restarted every poll (about 10
+    # times in 2 s); with it: start, +0.5 s, +1 s.
+    assert 2 <= len(spawned) <= 4
+    gaps = [b - a for a, b in zip(spawned, spawned[1:])]
+    assert all(later > earlier for earlier, later in zip(gaps, gaps[1:]))
+
+
+def test_supervise_stops_healthy_workers():
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            time.sleep(60)
+            os._exit(0)
+        return pid
+
+    stop = threading.Event()
+    threading.Timer(0.3, stop.set).start()
+    started = time.monotonic()
+    serve.supervise(spawn, 2, stop)
+    assert time.monotonic() - started < 5
@@ -0,0 +1,24 @@
+from app.train import train_scheme
+from app.utils import artifacts
+
+
+def test_failed_export_removes_a_stale_compact_artifact(tmp_path, monkeypatch):
+    stale = tmp_path / "pmay" / "model.bin"
+    stale.parent.mkdir()
+    stale.write_bytes(b"from an earlier run")
+
+    def refuse(*args, **kwargs):
+        raise artifacts.ArtifactFormatError("pmay: not exportable")
+
+    monkeypatch.setattr(artifacts, "export_artifact", refuse)
+    result = train_scheme("pmay", 200, 1, 200, str(tmp_path))
+
+    assert not stale.exists()
+    assert set(result["artifacts"]) == {"pipeline.pkl", "model.pkl"}
+    assert "not exportable" in result["notes"][0]
+
+
+def test_pmay_is_trained_on_its_features_only(tmp_path):
+    result = train_scheme("pmay", 200, 1, 200, str(tmp_path))
+    assert result["feature_names"] == ["age", "annual_income", "is_laborer"]
+    assert (tmp_path / "pmay" / "model.bin").exists()
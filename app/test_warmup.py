@@ -0,0 +1,80 @@
+from dataclasses import replace
+from pathlib import Path
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.predictor import SCHEME_TABLE, select_schemes
+from app.utils.warmup import readiness, run_warmup
+import main
+from main import app
+
+
+def test_warmup_scores_each_scheme_through_its_descriptor():
+    report = run_warmup(select_schemes(["pm_kisan", "nsp", "ayushman"]), artifacts=())
+    assert report.ready, report.error
+    assert list(report.schemes) == ["pm_kisan", "nsp", "ayushman"]
+    assert readiness() is report
+
+
+def test_exported_schemes_warm_without_pickles():
+    report = run_warmup(select_schemes(["pm_kisan", "nsp", "ayushman"]))
+    assert report.ready, report.error
+    for timings in report.schemes.values():
+        assert timings["artifacts"] == ["model.bin"]
+        assert timings["pickle_fallback"] is False
+
+
+def test_warmup_does_not_import_sklearn_for_exported_schemes():
+    code = (
+        "import sys; import main; from app.predictor import select_schemes; "
+        "from app.utils.warmup import run_warmup; "
+        "assert run_warmup(select_schemes(['pm_kisan', 'nsp', 'ayushman'])).ready; "
+        "print('sklearn' in sys.modules)"
+    )
+    repo_root = Path(main.__file__).parent
+    out = subprocess.run([sys.executable, "-c", code], cwd=repo_root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_feature_shape_mismatch_degrades_readiness(failing_pmay):
+    report = run_warmup(SCHEME_TABLE, artifacts=())
+    assert report.status == "degraded" and report.ready
+    assert report.error.startswith("pmay: model expects 4 features")
+    assert set(report.schemes["pmay"]) == {"error"}
+    # The other schemes still warm.
+    assert all("error" not in report.schemes[s] for s in ("pm_kisan", "nsp", "ayushman"))
+
+
+def test_feature_shape_check_follows_the_scheme_features():
+    pm_kisan = select_schemes(["pm_kisan"])[0]
+    widened = replace(pm_kisan, feature_names=tuple(pm_kisan.feature_names) + ("age",))
+    report = run_warmup([widened], artifacts=())
+    assert report.status == "failed" and not report.ready
+    assert "model expects" in report.error
+
+
+def test_ready_probe_passes_when_every_scheme_scores():
+    with TestClient(app) as client:
+        response = client.get("/healthz/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_ready_probe_stays_up_when_one_scheme_fails(failing_pmay):
+    with TestClient(app) as client:
+        response = client.get("/healthz/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert set(response.json()["schemes"]["pmay"]) == {"error"}
+
+
+def test_ready_probe_fails_when_no_scheme_scores(monkeypatch):
+    pm_kisan = select_schemes(["pm_kisan"])[0]
+    widened = replace(pm_kisan, feature_names=tuple(pm_kisan.feature_names) + ("age",))
+    monkeypatch.setattr(main, "SCHEME_TABLE", (widened,))
+    with TestClient(app) as client:
+        response = client.get("/healthz/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed"
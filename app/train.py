@@ -0,0 +1,246 @@
+"""
+Train every scheme model in parallel, reproducibly.
+
+Each app/schemes/<scheme>/train_<scheme>.py exposes
+``generate_data(n, seed)`` and ``build_pipeline()``. This orchestrator
+runs the selected schemes in separate worker processes, scores each
+model on a held-out sample, writes the artifacts and records everything
+in a manifest.
+
+Usage:
+    python -m app.train                                   # all schemes, 500 rows, seed 42
+    python -m app.train pm_kisan nsp --samples 1000000 --workers 2
+    python -m app.train --samples 500 --samples-for pmay=20000000 --seed-for nsp=7
+    python -m app.train --output-dir /tmp/models          # leave the live tree alone
+
+Key design choices:
+- Defaults (500 rows, seed 42) reproduce the shipped models (same
+  coefficients up to float rounding), and a given samples/seed pair
+  always produces byte-identical artifacts.
+- Validation data comes from a different seed than the training data,
+  so it never overlaps, and its size is fixed by --validation-samples.
+- Workers are fresh spawned processes (one task each), so the peak RSS
+  reported for a scheme is that scheme's alone.
+- pipeline.pkl, model.pkl and, where the feature order matches FEATURES,
+  the compact model.bin are each written to a temporary file and moved
+  into place with os.replace, so a running server never sees half a file.
+  When model.bin cannot be written, any older one is deleted, since the
+  registry would otherwise keep preferring it over the new pickles.
+- The manifest (JSON) records samples, seed, timings, peak memory,
+  validation metrics and artifact checksums per scheme.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import argparse
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+
+SCHEMES = ["pm_kisan", "pmay", "nsp", "ayushman"]
+SCHEMES_DIR = Path(__file__).resolve().parent / "schemes"
+DEFAULT_SAMPLES = 500
+DEFAULT_SEED = 42
+DEFAULT_VALIDATION_SAMPLES = 100_000
+# Offset between training and validation seeds.
+VALIDATION_SEED_OFFSET = 1_000_003
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_dump(obj: Any, path: Path) -> None:
+    import joblib
+
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def train_scheme(scheme_id: str, samples: int, seed: int, validation_samples: int, output_dir: str) -> Dict[str, Any]:
+    """Worker entry point: generate, fit, validate and save one scheme."""
+    from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+
+    from app.utils.artifacts import COMPACT_ARTIFACT, ArtifactFormatError, export_artifact
+
+    module = importlib.import_module(f"app.schemes.{scheme_id}.train_{scheme_id}")
+    features = importlib.import_module(f"app.schemes.{scheme_id}.features").FEATURES
+
+    started = time.perf_counter()
+    data = module.generate_data(samples, seed)
+    X, y = data.drop("eligible", axis=1), data["eligible"]
+    del data
+    generate_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pipeline = module.build_pipeline().fit(X, y)
+    train_seconds = time.perf_counter() - started
+    del X, y
+
+    started = time.perf_counter()
+    holdout = module.generate_data(validation_samples, seed + VALIDATION_SEED_OFFSET)
+    X_val, y_val = holdout.drop("eligible", axis=1), holdout["eligible"]
+    proba = pipeline.predict_proba(X_val)[:, 1]
+    labels = pipeline.classes_[(proba > 0.5).astype(int)]
+    metrics = {
+        "accuracy": float(accuracy_score(y_val, labels)),
+        "roc_auc": float(roc_auc_score(y_val, proba)) if y_val.nunique() > 1 else None,
+        "log_loss": float(log_loss(y_val, proba, labels=[0, 1])),
+        "positive_rate": float(y_val.mean()),
+    }
+    validate_seconds = time.perf_counter() - started
+
+    target = Path(output_dir) / scheme_id
+    target.mkdir(parents=True, exist_ok=True)
+    artifacts: Dict[str, str] = {}
+    for name in ("pipeline.pkl", "model.pkl"):
+        _atomic_dump(pipeline, target / name)
+        artifacts[name] = _sha256(target / name)
+
+    notes: List[str] = []
+    try:
+        export_artifact(pipeline, target / COMPACT_ARTIFACT, scheme_id=scheme_id, feature_names=features, source="pipeline.pkl")
+        artifacts[COMPACT_ARTIFACT] = _sha256(target / COMPACT_ARTIFACT)
+    except ArtifactFormatError as e:
+        # A model.bin from an earlier run would be preferred over the new
+        # pickles, so it must not outlive them.
+        (target / COMPACT_ARTIFACT).unlink(missing_ok=True)
+        notes.append(f"{COMPACT_ARTIFACT} not written (stale copy removed): {e}")
+
+    return {
+        "samples": samples,
+        "seed": seed,
+        "validation_samples": validation_samples,
+        "validation_seed": seed + VALIDATION_SEED_OFFSET,
+        "feature_names": list(pipeline.feature_names_in_),
+        "generate_seconds": generate_seconds,
+        "train_seconds": train_seconds,
+        "validate_seconds": validate_seconds,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "metrics": metrics,
+        "artifacts": artifacts,
+        "notes": notes,
+    }
+
+
+def train_all(
+    schemes: Sequence[str],
+    samples: Dict[str, int],
+    seeds: Dict[str, int],
+    validation_samples: int,
+    output_dir: Path,
+    workers: int,
+) -> Dict[str, Any]:
+    """Train ``schemes`` on up to ``workers`` processes and return the manifest."""
+    import sklearn
+
+    started = time.perf_counter()
+    results: Dict[str, Any] = {}
+    # A fresh process per scheme keeps peak-memory figures separate.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+        futures = {
+            pool.submit(
+                train_scheme, scheme_id, samples[scheme_id], seeds[scheme_id], validation_samples, str(output_dir)
+            ): scheme_id
+            for scheme_id in schemes
+        }
+        for future in as_completed(futures):
+            scheme_id = futures[future]
+            try:
+                results[scheme_id] = future.result()
+                m = results[scheme_id]["metrics"]
+                print(
+                    f"{scheme_id}: {samples[scheme_id]:,} rows in {results[scheme_id]['train_seconds']:.2f}s, "
+                    f"accuracy {m['accuracy']:.4f}",
+                    file=sys.stderr,
+                )
+            except Exception as e:
+                results[scheme_id] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"{scheme_id}: FAILED: {e}", file=sys.stderr)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "sklearn": sklearn.__version__,
+        "output_dir": str(output_dir),
+        "total_seconds": time.perf_counter() - started,
+        "schemes": {scheme_id: results[scheme_id] for scheme_id in schemes},
+    }
+
+
+def _write_manifest(manifest: Dict[str, Any], path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+# ---------- CLI ----------
+def _overrides(values: List[str], parser: argparse.ArgumentParser, option: str) -> Dict[str, int]:
+    parsed = {}
+    for value in values:
+        scheme_id, sep, number = value.partition("=")
+        if not sep or scheme_id not in SCHEMES:
+            parser.error(f"{option} expects SCHEME=N with SCHEME one of {', '.join(SCHEMES)}")
+        parsed[scheme_id] = int(number)
+    return parsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.train", description=__doc__.split("\n\n")[0])
+    parser.add_argument("schemes", nargs="*", help=f"schemes to train (default: all of {', '.join(SCHEMES)})")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="training rows per scheme")
+    parser.add_argument("--samples-for", action="append", default=[], metavar="SCHEME=N")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed for every scheme")
+    parser.add_argument("--seed-for", action="append", default=[], metavar="SCHEME=N")
+    parser.add_argument("--validation-samples", type=int, default=DEFAULT_VALIDATION_SAMPLES)
+    parser.add_argument("--workers", type=int, default=min(len(SCHEMES), os.cpu_count() or 1))
+    parser.add_argument("--output-dir", type=Path, default=SCHEMES_DIR, help="default: app/schemes (live models)")
+    parser.add_argument("--manifest", type=Path, help="default: <output-dir>/training_manifest.json")
+    args = parser.parse_args(argv)
+
+    schemes = args.schemes or SCHEMES
+    unknown = set(schemes) - set(SCHEMES)
+    if unknown:
+        parser.error(f"unknown scheme(s): {', '.join(sorted(unknown))}")
+    if args.samples <= 0 or args.validation_samples <= 0 or args.workers <= 0:
+        parser.error("--samples, --validation-samples and --workers must be positive")
+
+    samples = {s: args.samples for s in SCHEMES}
+    samples.update(_overrides(args.samples_for, parser, "--samples-for"))
+    seeds = {s: args.seed for s in SCHEMES}
+    seeds.update(_overrides(args.seed_for, parser, "--seed-for"))
+
+    manifest = train_all(schemes, samples, seeds, args.validation_samples, args.output_dir, args.workers)
+    manifest_path = args.manifest or args.output_dir / "training_manifest.json"
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_manifest(manifest, manifest_path)
+    print(f"Manifest written to {manifest_path}", file=sys.stderr)
+    return 1 if any("error" in r for r in manifest["schemes"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
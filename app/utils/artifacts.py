@@ -0,0 +1,175 @@
+"""
+Compact, memory-mappable model artifacts.
+
+The joblib pickles need sklearn to load, and every worker process keeps
+its own private copy. A scheme model is only a StandardScaler plus a
+binary LogisticRegression, so it can be stored as a few float64 arrays:
+
+    offset 0   magic b"SCHMODEL"
+           8   uint32 little-endian format version
+          12   uint32 little-endian header length (bytes)
+          16   UTF-8 JSON header, space-padded to a multiple of 8 bytes
+           …   float64 little-endian arrays, in the order listed in the header
+
+Key design choices:
+- The header records feature order (taken from the scheme's FEATURES),
+  classes, the arrays' offsets and a SHA-256 of the array section, so a
+  truncated or edited file is rejected instead of silently mis-scoring.
+- Besides the raw scaler statistics and coefficients, the folded
+  weights and bias (see app/utils/scoring.py) are stored too, so the
+  loader can serve predictions straight from the mapped pages.
+- Files are mapped read-only with np.memmap; every worker on a host
+  shares the same page-cache pages, and loading never imports sklearn.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+from app.utils.scoring import LinearScorer, compile_pipeline
+
+
+MAGIC = b"SCHMODEL"
+FORMAT_VERSION = 1
+COMPACT_ARTIFACT = "model.bin"
+
+_PREFIX = struct.Struct("<8sII")
+_ARRAYS = ("mean", "scale", "coef", "weights")
+
+
+class ArtifactFormatError(ValueError):
+    """Raised when a compact artifact is malformed, corrupt or incompatible."""
+
+
+def export_artifact(
+    estimator: Any,
+    path: Path,
+    *,
+    scheme_id: str,
+    feature_names: Sequence[str],
+    source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Write a fitted StandardScaler + LogisticRegression pipeline to ``path``.
+
+    Raises ArtifactFormatError if the estimator is not of that shape or
+    was fitted on different features (names, order or count) than
+    ``feature_names``.
+    Returns the header that was written.
+    """
+    scorer = compile_pipeline(estimator)
+    if not isinstance(scorer, LinearScorer):
+        raise ArtifactFormatError(
+            f"{scheme_id}: only StandardScaler + binary LogisticRegression pipelines can be exported."
+        )
+    fitted_names = scorer.feature_names
+    if fitted_names is not None and list(fitted_names) != list(feature_names):
+        raise ArtifactFormatError(
+            f"{scheme_id}: model was fitted on {list(fitted_names)} but FEATURES is {list(feature_names)}."
+        )
+    # Pipelines fitted on bare arrays carry no names, only a count.
+    if scorer.n_features_in_ != len(feature_names):
+        raise ArtifactFormatError(
+            f"{scheme_id}: model was fitted on {scorer.n_features_in_} features "
+            f"but FEATURES has {len(feature_names)}."
+        )
+
+    steps = [step for _, step in getattr(estimator, "steps", [(None, estimator)])]
+    scaler = steps[0] if len(steps) == 2 else None
+    model = steps[-1]
+    n = scorer.n_features_in_
+    # Only the terms the scaler applies, exactly as compile_pipeline folds them.
+    arrays = {
+        "mean": getattr(scaler, "mean_", None) if getattr(scaler, "with_mean", False) else None,
+        "scale": getattr(scaler, "scale_", None) if getattr(scaler, "with_std", False) else None,
+        "coef": np.asarray(model.coef_)[0],
+        "weights": scorer.weights,
+    }
+    # An identity scaler (or skipped term) keeps the layout fixed.
+    arrays["mean"] = np.zeros(n) if arrays["mean"] is None else arrays["mean"]
+    arrays["scale"] = np.ones(n) if arrays["scale"] is None else arrays["scale"]
+    data = b"".join(np.ascontiguousarray(arrays[name], dtype="<f8").tobytes() for name in _ARRAYS)
+
+    header = {
+        "format": "scheme-linear-model",
+        "version": FORMAT_VERSION,
+        "scheme_id": scheme_id,
+        "feature_names": list(feature_names),
+        "n_features": n,
+        "classes": np.asarray(model.classes_).tolist(),
+        "intercept": float(np.asarray(model.intercept_)[0]),
+        "bias": scorer.bias,
+        "dtype": "<f8",
+        "arrays": list(_ARRAYS),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "source": source,
+    }
+    encoded = json.dumps(header, sort_keys=True).encode("utf-8")
+    encoded += b" " * (-(_PREFIX.size + len(encoded)) % 8)
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return header
+
+
+def read_header(path: Path) -> Tuple[Dict[str, Any], int]:
+    """Parse the header of a compact artifact; returns (header, data offset)."""
+    with Path(path).open("rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ArtifactFormatError(f"{path}: file too short")
+        magic, version, header_len = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ArtifactFormatError(f"{path}: not a compact model artifact")
+        if version != FORMAT_VERSION:
+            raise ArtifactFormatError(f"{path}: unsupported format version {version}")
+        try:
+            header = json.loads(f.read(header_len).decode("utf-8"))
+        except ValueError as e:
+            raise ArtifactFormatError(f"{path}: invalid header: {e}") from e
+    return header, _PREFIX.size + header_len
+
+
+def load_artifact(path: Path, verify: bool = True) -> LinearScorer:
+    """
+    Memory-map a compact artifact read-only and return a LinearScorer.
+
+    The scorer's weights are a view onto the mapped file, so processes
+    that load the same artifact share its pages.
+    """
+    header, offset = read_header(path)
+    n = int(header["n_features"])
+    if n != len(header["feature_names"]):
+        raise ArtifactFormatError(f"{path}: {n} features but {len(header['feature_names'])} feature names")
+    if header["dtype"] != "<f8":
+        raise ArtifactFormatError(f"{path}: unsupported dtype {header['dtype']!r}")
+    mapped = np.memmap(path, dtype="<f8", mode="r", offset=offset)
+    if mapped.shape[0] != n * len(header["arrays"]):
+        raise ArtifactFormatError(f"{path}: expected {n * len(header['arrays'])} values, found {mapped.shape[0]}")
+    if verify and hashlib.sha256(mapped.tobytes()).hexdigest() != header["sha256"]:
+        raise ArtifactFormatError(f"{path}: checksum mismatch")
+
+    index = header["arrays"].index("weights")
+    weights = mapped[index * n : (index + 1) * n]
+    return LinearScorer(weights, header["bias"], header["classes"], header["feature_names"])
+
+
+__all__ = [
+    "COMPACT_ARTIFACT",
+    "ArtifactFormatError",
+    "export_artifact",
+    "load_artifact",
+    "read_header",
+]
@@ -7,11 +7,16 @@ Key design choices:
   only here, after predictions, to compare group-level behaviour.
 - Outputs are intentionally simple: PASS / WARN / FAIL, with
   clear, human-readable explanations for hackathon judges.
+- Group labels are factorised once and counted with np.bincount, and the
+  worst gap is max - min, so audits over millions of records (or many
+  intersectional groups) stay linear.
 """
 
 from dataclasses import dataclass
 from typing import Any, Dict, Hashable, List, Mapping, Sequence, Tuple
 
+import numpy as np
+
 
 @dataclass
 class BiasReport:
@@ -36,26 +41,44 @@ class BiasReport:
     explanation: str
 
 
+def _factorize(values: Sequence[Hashable]) -> Tuple[np.ndarray, List[Hashable]]:
+    """
+    Integer codes per value plus the distinct labels, in first-seen order.
+
+    Uses np.unique when the labels are sortable and falls back to a dict
+    for mixed, unorderable types.
+    """
+    arr = np.asarray(values)
+    if arr.ndim == 1 and arr.dtype != object:
+        uniques, first, inverse = np.unique(arr, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        return remap[inverse.ravel()], [uniques[i].item() for i in order]
+
+    index: Dict[Hashable, int] = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.intp, count=len(values))
+    return codes, list(index)
+
+
+def _group_counts(
+    predictions: Sequence[int], codes: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Records and approvals per group code, via np.bincount."""
+    approved = np.asarray(predictions).astype(np.int64) == 1
+    totals = np.bincount(codes, minlength=n_groups)
+    positives = np.bincount(codes, weights=approved, minlength=n_groups)
+    return totals, positives
+
+
 def _approval_rates_by_group(
     predictions: Sequence[int],
     sensitive_values: Sequence[Hashable],
 ) -> Dict[Hashable, float]:
     """Compute approval rates for each sensitive group."""
-    group_counts: Dict[Hashable, int] = {}
-    group_positives: Dict[Hashable, int] = {}
-
-    for y, g in zip(predictions, sensitive_values):
-        group_counts[g] = group_counts.get(g, 0) + 1
-        if int(y) == 1:
-            group_positives[g] = group_positives.get(g, 0) + 1
-
-    rates: Dict[Hashable, float] = {}
-    for g, n in group_counts.items():
-        if n == 0:
-            rates[g] = 0.0
-        else:
-            rates[g] = group_positives.get(g, 0) / n
-    return rates
+    codes, labels = _factorize(sensitive_values)
+    totals, positives = _group_counts(predictions, codes, len(labels))
+    return dict(zip(labels, (positives / totals).tolist()))
 
 
 def run_bias_audit(
@@ -76,7 +99,7 @@ def run_bias_audit(
     Returns:
         BiasReport with PASS / WARN / FAIL and a compact explanation.
     """
-    if not predictions or not sensitive_values or len(predictions) != len(
+    if not len(predictions) or not len(sensitive_values) or len(predictions) != len(
         sensitive_values
     ):
         return BiasReport(
@@ -91,6 +114,20 @@ def run_bias_audit(
         )
 
     rates = _approval_rates_by_group(predictions, sensitive_values)
+    return bias_report_from_rates(rates, allowed_diff)
+
+
+def bias_report_from_rates(
+    rates: Mapping[Hashable, float],
+    allowed_diff: float = 0.10,
+) -> BiasReport:
+    """
+    Build a BiasReport from precomputed per-group approval rates.
+
+    Shared by run_bias_audit and the streaming auditor so both apply
+    exactly the same PASS / WARN / FAIL thresholds and wording.
+    """
+    rates = dict(rates)
     if len(rates) <= 1:
         return BiasReport(
             status="PASS",
@@ -102,18 +139,16 @@ def run_bias_audit(
             ),
         )
 
-    # Compute the largest absolute difference between any two groups.
+    # The largest pairwise gap is always max - min; report that pair in
+    # first-seen order, matching the original pairwise scan.
     groups: List[Hashable] = list(rates.keys())
-    max_gap: float = 0.0
-    worst_pair: Tuple[Hashable, Hashable] = (groups[0], groups[0])
-
-    for i in range(len(groups)):
-        for j in range(i + 1, len(groups)):
-            g1, g2 = groups[i], groups[j]
-            gap = abs(rates[g1] - rates[g2])
-            if gap > max_gap:
-                max_gap = gap
-                worst_pair = (g1, g2)
+    values = np.fromiter(rates.values(), dtype=float, count=len(groups))
+    lo, hi = int(np.argmin(values)), int(np.argmax(values))
+    max_gap = float(values[hi] - values[lo])
+    if max_gap > 0:
+        worst_pair = (groups[min(lo, hi)], groups[max(lo, hi)])
+    else:
+        worst_pair = (groups[0], groups[0])
 
     # Interpret the gap in terms of thresholds.
     if max_gap <= allowed_diff:
@@ -144,5 +179,53 @@ def run_bias_audit(
     )
 
 
-__all__ = ["BiasReport", "run_bias_audit"]
+def run_intersectional_bias_audit(
+    predictions: Sequence[int],
+    sensitive_columns: Mapping[str, Sequence[Hashable]],
+    allowed_diff: float = 0.10,
+) -> BiasReport:
+    """
+    Audit approval rates across intersections of several attributes.
+
+    Args:
+        predictions: Binary outcomes, as for run_bias_audit.
+        sensitive_columns: Attribute name -> values aligned with
+            predictions, e.g. {"gender": [...], "state": [...]}.
+        allowed_diff: Same threshold as run_bias_audit.
+
+    Returns:
+        A BiasReport of the usual shape. Groups are labelled by joining
+        attribute values with " | " in column order; details also list
+        the attributes and per-intersection record / approval counts.
+    """
+    names = list(sensitive_columns)
+    columns = [sensitive_columns[name] for name in names]
+    if not names or not len(predictions) or any(len(c) != len(predictions) for c in columns):
+        return run_bias_audit([], [], allowed_diff)
+
+    # Factorise each column, then combine the codes into one id per
+    # intersection and factorise again so only observed combinations
+    # get a slot.
+    factorized = [_factorize(c) for c in columns]
+    combined = np.ravel_multi_index(
+        [codes for codes, _ in factorized], [len(labels) for _, labels in factorized]
+    )
+    codes, keys = _factorize(combined)
+    shape = [len(labels) for _, labels in factorized]
+    names_per_group = [
+        " | ".join(str(labels[i]) for (_, labels), i in zip(factorized, np.unravel_index(key, shape)))
+        for key in keys
+    ]
+
+    totals, positives = _group_counts(predictions, codes, len(keys))
+    rates = dict(zip(names_per_group, (positives / totals).tolist()))
+    report = bias_report_from_rates(rates, allowed_diff)
+    report.details["attributes"] = names
+    report.details["group_counts"] = {
+        g: {"records": int(n), "approved": int(p)} for g, n, p in zip(names_per_group, totals, positives)
+    }
+    return report
+
+
+__all__ = ["BiasReport", "bias_report_from_rates", "run_bias_audit", "run_intersectional_bias_audit"]
 
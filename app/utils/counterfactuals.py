@@ -0,0 +1,181 @@
+"""
+Closed-form counterfactual explanations for the linear scheme models.
+
+Every scheme model folds into ``p = sigmoid(x @ w + b)`` in raw feature
+space (see app/utils/scoring.py), so the set of inputs reaching a target
+probability ``p*`` is a half-space bounded by the hyperplane
+``x @ w + b = logit(p*)``. Holding every other input fixed, the value of
+feature ``j`` that lands exactly on it is
+
+    x_j + (logit(p*) - (x @ w + b)) / w_j
+
+which is O(1) per feature instead of a search over candidate inputs.
+
+Key design choices:
+- Only a scheme's ACTIONABLE_FEATURES (features.py) are ever suggested,
+  and SENSITIVE_FEATURES are skipped even if listed there by mistake.
+- The target half-line is intersected with the rule ranges declared in
+  rules.py (ELIGIBLE_RANGES) and with [0, inf), then the point of that
+  interval closest to the current value is the minimal change.
+- Suggestions are rounded to the feature's step, away from the boundary,
+  so the rounded value still reaches the target.
+- The scheme's own rule function checks every candidate before it is
+  reported; the declared ranges only steer the search, and a rule the
+  feature cannot fix on its own (e.g. "not a farmer") makes it infeasible.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+import math
+
+import numpy as np
+
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+@dataclass(frozen=True)
+class CounterfactualSpec:
+    """
+    What may be changed for one scheme, and within which limits.
+
+    Built from each scheme's ACTIONABLE_FEATURES (features.py) and
+    ELIGIBLE_RANGES (rules.py).
+
+    actionable:
+        feature -> smallest meaningful step (suggestions are rounded to it).
+        Only model features an applicant can realistically change belong
+        here; SENSITIVE_FEATURES must never be listed.
+    ranges:
+        feature -> closed (low, high) range a thresholded input must fall
+        in to pass the scheme's rule checks; None is unbounded. Strict
+        limits are approximated by the closed range, which is safe
+        because the ranges only steer the search: the scheme's rule
+        function stays the source of truth and checks every candidate.
+    sensitive:
+        features that must never be suggested.
+    """
+
+    actionable: Mapping[str, float]
+    ranges: Mapping[str, Range]
+    sensitive: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class Counterfactual:
+    """
+    Smallest single-feature change reaching the target.
+
+    required / change / probability are None when ``feasible`` is False;
+    ``note`` says why.
+    """
+
+    feature: str
+    current: float
+    required: Optional[float]
+    change: Optional[float]
+    probability: Optional[float]
+    feasible: bool
+    note: str
+
+
+def logit(probability: float) -> float:
+    """Inverse sigmoid; the target probability must be strictly inside (0, 1)."""
+    if not 0.0 < probability < 1.0:
+        raise ValueError("target probability must be strictly between 0 and 1")
+    return math.log(probability / (1.0 - probability))
+
+
+def _sigmoid(z: float) -> float:
+    return float(np.exp(-np.logaddexp(0.0, -z)))
+
+
+def _round_to_step(value: float, step: float, up: bool) -> float:
+    steps = math.ceil(value / step - 1e-9) if up else math.floor(value / step + 1e-9)
+    # round() strips float noise such as 2.3000000000000003.
+    return round(steps * step, 10)
+
+
+def _search_interval(
+    current: float, weight: float, slack: float, step: float, bounds: Range
+) -> Tuple[Optional[Tuple[float, float]], str]:
+    """Values of one feature that reach the target and pass its rule range."""
+    low = max(0.0, -math.inf if bounds[0] is None else bounds[0])
+    high = math.inf if bounds[1] is None else bounds[1]
+    if weight == 0.0:
+        if slack > 0:
+            return None, "the model does not use this feature"
+        return (low, high), ""
+
+    boundary = current + slack / weight
+    if weight > 0:
+        low = max(low, _round_to_step(boundary, step, up=True))
+    else:
+        high = min(high, _round_to_step(boundary, step, up=False))
+    if low > high:
+        return None, "this feature alone cannot reach the target within the rule limits"
+    return (low, high), ""
+
+
+def counterfactuals(
+    weights: np.ndarray,
+    bias: float,
+    feature_names: Sequence[str],
+    inputs: Mapping[str, Any],
+    spec: CounterfactualSpec,
+    rules: Callable[[Mapping[str, Any]], Tuple[bool, str]],
+    target_probability: float,
+) -> List[Counterfactual]:
+    """
+    Per actionable feature, the smallest change reaching ``target_probability``.
+
+    Args:
+        weights, bias: the folded linear model, in ``feature_names`` order.
+        inputs: the applicant's inputs, keyed by feature name.
+        rules: the scheme's evaluate_eligibility; a suggestion must pass it.
+    """
+    x = np.array([float(inputs.get(name, 0.0)) for name in feature_names])
+    slack = logit(target_probability) - float(x @ weights + bias)
+    index = {name: i for i, name in enumerate(feature_names)}
+
+    results = []
+    for feature, step in spec.actionable.items():
+        if feature in spec.sensitive or feature not in index:
+            continue
+        j = index[feature]
+        current = float(x[j])
+        weight = float(weights[j])
+        interval, note = _search_interval(current, weight, slack, step, spec.ranges.get(feature, (None, None)))
+        if interval is None:
+            results.append(Counterfactual(feature, current, None, None, None, False, note))
+            continue
+
+        low, high = interval
+        required = min(max(current, low), high)
+        # Exclusive rule limits (e.g. land > 0): step once into the interval.
+        candidates = [required] + [v for v in (required + step, required - step) if low <= v <= high]
+        for candidate in candidates:
+            if rules({**inputs, feature: candidate})[0]:
+                break
+        else:
+            results.append(
+                Counterfactual(
+                    feature, current, None, None, None, False, "other eligibility rules would still fail"
+                )
+            )
+            continue
+
+        probability = _sigmoid(float(x @ weights + bias) + weight * (candidate - current))
+        note = "no change needed" if candidate == current else ""
+        results.append(
+            Counterfactual(feature, current, candidate, round(candidate - current, 10), probability, True, note)
+        )
+    return results
+
+
+__all__ = [
+    "Counterfactual",
+    "CounterfactualSpec",
+    "counterfactuals",
+    "logit",
+]
@@ -7,38 +7,63 @@ The explainability layer combines:
 while always attaching an ethical disclaimer for transparency.
 """
 
-from pathlib import Path
-from typing import Any, Dict, Mapping
-import json
-
-
-def _metadata_path_for_scheme(scheme_id: str) -> Path:
-    """Resolve the metadata.json path for a given scheme."""
-    return (
-        Path(__file__)
-        .resolve()
-        .parent.parent
-        / "schemes"
-        / scheme_id
-        / "metadata.json"
-    )
+from typing import Any, Dict, Mapping, Optional, Tuple
+import sys
+import threading
+
+from app.utils.metadata_cache import metadata_cache
 
 
-def load_scheme_metadata(scheme_id: str) -> Dict[str, Any]:
+def load_scheme_metadata(scheme_id: str) -> Mapping[str, Any]:
     """
     Load static metadata for a scheme.
 
     This keeps transparency information (description, benefit, fairness
     policy, ethical disclaimer) next to the deployed pipeline rather than
     hard-coding it into the service layer.
+
+    The result is served from a shared, read-only cache that re-parses
+    metadata.json only when the file's mtime changes; do not mutate it.
     """
-    meta_path = _metadata_path_for_scheme(scheme_id)
-    if not meta_path.exists():
-        # Fail gracefully – services can still respond without rich metadata.
-        return {}
+    return metadata_cache.get(scheme_id)
+
+
+# (upper bound, level, closing sentence) per probability bucket.
+_PROBABILITY_BUCKETS: Tuple[Tuple[float, str, str], ...] = (
+    (
+        0.3,
+        "LOW",
+        "This suggests that, among similar applicants in the training data, "
+        "relatively few were approved.",
+    ),
+    (0.7, "MODERATE", "The outcome is uncertain, and human review would be appropriate."),
+    (float("inf"), "HIGH", "Many similar applicants in the training data were approved."),
+)
+
+# Static text around the spliced-in probability, interned once.
+_PROBABILITY_TEMPLATES: Tuple[Tuple[float, str, str], ...] = tuple(
+    (
+        upper,
+        sys.intern(f"The model estimates a {level} likelihood of approval (~"),
+        sys.intern(f"). {closing}"),
+    )
+    for upper, level, closing in _PROBABILITY_BUCKETS
+)
+
+DEFAULT_DISCLAIMER = (
+    "This tool is a demonstration and must not be used for official "
+    "government decisions. Outputs are approximate and based on "
+    "simplified assumptions."
+)
+
 
-    with meta_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+def probability_bucket(probability: float) -> int:
+    """Index of the verbal bucket (LOW / MODERATE / HIGH) for a probability."""
+    p = float(probability)
+    for i, (upper, _, _) in enumerate(_PROBABILITY_TEMPLATES):
+        if p < upper:
+            return i
+    return len(_PROBABILITY_TEMPLATES) - 1  # NaN
 
 
 def probability_to_text(probability: float) -> str:
@@ -49,21 +74,72 @@ def probability_to_text(probability: float) -> str:
     understand the output at a glance.
     """
     p = float(probability)
-    if p < 0.3:
-        return (
-            f"The model estimates a LOW likelihood of approval (~{p:.2f}). "
-            "This suggests that, among similar applicants in the training data, "
-            "relatively few were approved."
-        )
-    if p < 0.7:
-        return (
-            f"The model estimates a MODERATE likelihood of approval (~{p:.2f}). "
-            "The outcome is uncertain, and human review would be appropriate."
-        )
-    return (
-        f"The model estimates a HIGH likelihood of approval (~{p:.2f}). "
-        "Many similar applicants in the training data were approved."
-    )
+    _, prefix, suffix = _PROBABILITY_TEMPLATES[probability_bucket(p)]
+    return f"{prefix}{p:.2f}{suffix}"
+
+
+class ExplanationTemplate:
+    """
+    Precompiled explanation text for one scheme.
+
+    Everything except the probability depends only on the scheme's
+    metadata and display name, so the disclaimer and both summaries are
+    built (and interned) once; render() only formats the probability.
+    """
+
+    def __init__(self, scheme_display_name: str, metadata: Mapping[str, Any]) -> None:
+        self.metadata = metadata
+        self.scheme_display_name = scheme_display_name
+        self.ethical_disclaimer = sys.intern(metadata.get("ethical_disclaimer", DEFAULT_DISCLAIMER))
+        self.summaries = {
+            eligible: sys.intern(
+                f"According to the rule-based eligibility check for {scheme_display_name}, "
+                f"the applicant is {'ELIGIBLE' if eligible else 'NOT ELIGIBLE'}. "
+                "The ML model then provides an estimated approval probability which should "
+                "be treated as advisory, not authoritative."
+            )
+            for eligible in (True, False)
+        }
+
+    @staticmethod
+    def key(rule_eligible: bool, rule_reason: str, approval_probability: float) -> Tuple[Any, ...]:
+        """Inputs that fully determine render()'s output."""
+        p = float(approval_probability)
+        return rule_eligible, rule_reason, probability_bucket(p), f"{p:.2f}"
+
+    def render(self, rule_eligible: bool, rule_reason: str, approval_probability: float) -> Dict[str, Any]:
+        return {
+            "rule_based_reason": rule_reason,
+            "probability_explanation": probability_to_text(approval_probability),
+            "overall_summary": self.summaries[bool(rule_eligible)],
+            "ethical_disclaimer": self.ethical_disclaimer,
+        }
+
+
+_templates: Dict[Tuple[str, str], ExplanationTemplate] = {}
+_templates_lock = threading.Lock()
+
+
+def get_explanation_template(
+    scheme_id: str,
+    scheme_display_name: str,
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> ExplanationTemplate:
+    """
+    Compiled template for a scheme, rebuilt only when its metadata changes.
+
+    The metadata cache hands out the same object until metadata.json is
+    edited, so an identity check is enough to detect a reload.
+    """
+    if metadata is None:
+        metadata = load_scheme_metadata(scheme_id)
+    key = (scheme_id, scheme_display_name)
+    template = _templates.get(key)
+    if template is None or template.metadata is not metadata:
+        template = ExplanationTemplate(scheme_display_name, metadata)
+        with _templates_lock:
+            _templates[key] = template
+    return template
 
 
 def build_explanation_payload(
@@ -73,44 +149,26 @@ def build_explanation_payload(
     rule_eligible: bool,
     rule_reason: str,
     approval_probability: float,
+    metadata: Optional[Mapping[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Combine rule-based reasoning, model probability and metadata into
     a single explanation object suitable for API responses.
 
     This function does not perform any model inference itself; it simply
-    assembles human-readable text around existing results.
+    assembles human-readable text around existing results. Callers that
+    already hold the scheme metadata can pass it to skip the lookup.
     """
-    metadata = load_scheme_metadata(scheme_id) or {}
-    ethical_disclaimer = metadata.get(
-        "ethical_disclaimer",
-        (
-            "This tool is a demonstration and must not be used for official "
-            "government decisions. Outputs are approximate and based on "
-            "simplified assumptions."
-        ),
-    )
-
-    probability_explanation = probability_to_text(approval_probability)
-
-    overall_summary = (
-        f"According to the rule-based eligibility check for {scheme_display_name}, "
-        f"the applicant is {'ELIGIBLE' if rule_eligible else 'NOT ELIGIBLE'}. "
-        "The ML model then provides an estimated approval probability which should "
-        "be treated as advisory, not authoritative."
-    )
-
-    return {
-        "rule_based_reason": rule_reason,
-        "probability_explanation": probability_explanation,
-        "overall_summary": overall_summary,
-        "ethical_disclaimer": ethical_disclaimer,
-    }
+    template = get_explanation_template(scheme_id, scheme_display_name, metadata)
+    return template.render(rule_eligible, rule_reason, approval_probability)
 
 
 __all__ = [
+    "ExplanationTemplate",
     "load_scheme_metadata",
+    "probability_bucket",
     "probability_to_text",
+    "get_explanation_template",
     "build_explanation_payload",
 ]
 
@@ -0,0 +1,214 @@
+"""
+Streaming fairness auditing over live traffic.
+
+run_bias_audit needs the full list of predictions and group labels, and
+inside a single /predict call it only ever sees one applicant, so its
+report is trivially PASS. This module keeps running counters instead:
+
+- For every (scheme, sensitive attribute) pair it stores, per group, how
+  many applicants were evaluated and how many were approved. Updates are
+  O(1) and memory is O(groups x time buckets).
+- Counts are kept in fixed, epoch-aligned time buckets so a report can
+  cover a sliding window (e.g. the last hour) without replaying history.
+- Snapshots are plain JSON and bucket boundaries are identical in every
+  process, so counters from several workers can simply be added together
+  with ``merge``.
+- Once a (scheme, attribute) pair has ``max_groups`` groups, any new
+  group is counted under OVERFLOW_GROUP instead, so unexpected free-text
+  labels cannot grow memory without bound. Callers should still map
+  labels onto a fixed set before recording.
+
+Reports reuse bias_report_from_rates, so thresholds and wording match
+the batch audit exactly.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+import os
+import threading
+import time
+
+from app.utils.bias_checker import BiasReport, bias_report_from_rates
+
+
+# group -> [evaluated, approved]
+GroupCounts = Dict[str, List[int]]
+
+OVERFLOW_GROUP = "other"
+
+
+def _new_counts() -> GroupCounts:
+    return defaultdict(lambda: [0, 0])
+
+
+class StreamingFairnessAuditor:
+    """Thread-safe, mergeable approval-rate counters per scheme and attribute."""
+
+    def __init__(
+        self,
+        retention_seconds: float = 24 * 3600,
+        bucket_seconds: float = 60,
+        clock: Callable[[], float] = time.time,
+        max_groups: int = 16,
+    ) -> None:
+        self.retention_seconds = retention_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_groups = max_groups
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (scheme, attribute) -> lifetime totals
+        self._totals: Dict[Tuple[str, str], GroupCounts] = defaultdict(_new_counts)
+        # (scheme, attribute) -> bucket start -> counts
+        self._buckets: Dict[Tuple[str, str], Dict[int, GroupCounts]] = defaultdict(dict)
+        self._last_prune = 0
+
+    # ---------- UPDATES ----------
+    def record(self, scheme: str, attribute: str, group: Hashable, approved: bool) -> None:
+        """Count one decision for ``group``."""
+        self.record_many(scheme, attribute, ((group, approved),))
+
+    def record_many(self, scheme: str, attribute: str, decisions: Iterable[Tuple[Hashable, bool]]) -> None:
+        """Count a batch of (group, approved) decisions under one lock."""
+        local: Dict[str, List[int]] = {}
+        for group, approved in decisions:
+            counts = local.setdefault(str(group), [0, 0])
+            counts[0] += 1
+            counts[1] += 1 if approved else 0
+        if not local:
+            return
+
+        bucket = self._bucket_for(self._clock())
+        key = (scheme, attribute)
+        with self._lock:
+            totals = self._totals[key]
+            window = self._buckets[key].setdefault(bucket, _new_counts())
+            for group, (n, positives) in local.items():
+                if group not in totals and len(totals) >= self.max_groups:
+                    group = OVERFLOW_GROUP
+                for target in (totals[group], window[group]):
+                    target[0] += n
+                    target[1] += positives
+            if bucket != self._last_prune:
+                self._prune(bucket)
+                self._last_prune = bucket
+
+    # ---------- QUERIES ----------
+    def counts(
+        self, scheme: str, attribute: str, window_seconds: Optional[float] = None
+    ) -> Dict[str, Tuple[int, int]]:
+        """
+        Per-group (evaluated, approved) counts.
+
+        ``window_seconds`` limits the result to recent buckets; None means
+        everything since the process started (or was merged into).
+        """
+        key = (scheme, attribute)
+        with self._lock:
+            if window_seconds is None:
+                return {g: (c[0], c[1]) for g, c in self._totals.get(key, {}).items()}
+            oldest = self._bucket_for(self._clock() - window_seconds)
+            merged: Dict[str, List[int]] = {}
+            for start, groups in self._buckets.get(key, {}).items():
+                if start < oldest:
+                    continue
+                for g, (n, positives) in groups.items():
+                    acc = merged.setdefault(g, [0, 0])
+                    acc[0] += n
+                    acc[1] += positives
+        return {g: (c[0], c[1]) for g, c in merged.items()}
+
+    def report(
+        self,
+        scheme: str,
+        attribute: str,
+        allowed_diff: float = 0.10,
+        window_seconds: Optional[float] = None,
+    ) -> BiasReport:
+        """approval_rate_difference over the counted traffic."""
+        counts = self.counts(scheme, attribute, window_seconds)
+        if not counts:
+            return BiasReport(
+                status="WARN",
+                metric="approval_rate_difference",
+                details={"reason": "insufficient_or_misaligned_data"},
+                explanation=(
+                    "Fairness audit was not fully performed because no decisions "
+                    "have been recorded for this scheme in the selected window."
+                ),
+            )
+        rates = {g: positives / n for g, (n, positives) in counts.items() if n}
+        report = bias_report_from_rates(rates, allowed_diff)
+        report.details["group_counts"] = {g: {"evaluated": n, "approved": p} for g, (n, p) in counts.items()}
+        report.details["window_seconds"] = window_seconds
+        return report
+
+    def keys(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return sorted(self._totals)
+
+    # ---------- MERGING ----------
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable copy of every counter."""
+        with self._lock:
+            return {
+                "bucket_seconds": self.bucket_seconds,
+                "series": [
+                    {
+                        "scheme": scheme,
+                        "attribute": attribute,
+                        "totals": {g: list(c) for g, c in self._totals[(scheme, attribute)].items()},
+                        "buckets": {
+                            str(start): {g: list(c) for g, c in groups.items()}
+                            for start, groups in self._buckets[(scheme, attribute)].items()
+                        },
+                    }
+                    for scheme, attribute in self._totals
+                ],
+            }
+
+    def merge(self, other: "StreamingFairnessAuditor | Mapping[str, Any]") -> None:
+        """Add another auditor's (or snapshot's) counters into this one."""
+        snap = other.snapshot() if isinstance(other, StreamingFairnessAuditor) else other
+        if snap.get("bucket_seconds") != self.bucket_seconds:
+            raise ValueError("Cannot merge auditors with different bucket sizes.")
+        with self._lock:
+            for series in snap.get("series", []):
+                key = (series["scheme"], series["attribute"])
+                _add_into(self._totals[key], series["totals"])
+                for start, groups in series["buckets"].items():
+                    _add_into(self._buckets[key].setdefault(int(start), _new_counts()), groups)
+            self._prune(self._bucket_for(self._clock()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._buckets.clear()
+
+    # ---------- INTERNALS ----------
+    def _bucket_for(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds * self.bucket_seconds)
+
+    def _prune(self, current_bucket: int) -> None:
+        """Drop buckets older than the retention period (lock held)."""
+        cutoff = current_bucket - self.retention_seconds
+        for buckets in self._buckets.values():
+            for start in [s for s in buckets if s < cutoff]:
+                del buckets[start]
+
+
+def _add_into(target: GroupCounts, source: Mapping[str, Any]) -> None:
+    for group, (n, positives) in source.items():
+        counts = target[group]
+        counts[0] += int(n)
+        counts[1] += int(positives)
+
+
+# Shared by every router in the process.
+fairness_auditor = StreamingFairnessAuditor(
+    retention_seconds=float(os.getenv("FAIRNESS_RETENTION_SECONDS", str(24 * 3600))),
+    bucket_seconds=float(os.getenv("FAIRNESS_BUCKET_SECONDS", "60")),
+    max_groups=int(os.getenv("FAIRNESS_MAX_GROUPS", "16")),
+)
+
+
+__all__ = ["OVERFLOW_GROUP", "StreamingFairnessAuditor", "fairness_auditor"]
@@ -0,0 +1,79 @@
+"""
+Pre-encoded JSON for hot API responses.
+
+For a sync endpoint with a ``response_model``, FastAPI validates the
+returned object again in a worker thread and then serialises it.
+Responses that the service built itself from validated requests do not
+need that second pass. Endpoints can instead encode them here and return
+the bytes as a plain Response, with ``response_model`` kept for the
+OpenAPI schema only.
+
+Key design choices:
+- Bytes are written by pydantic-core's encoder, the same one FastAPI's
+  own response_model path uses, so output is byte-identical to what
+  clients got before. orjson is not used: it writes exponents differently
+  (``1e16`` vs ``1e+16``) and rejects NumPy scalars.
+- Values that recur across responses (scheme names, disclaimers,
+  explanation blocks) are encoded once and served from a bounded
+  FragmentCache. The cache is cleared when full rather than tracking LRU
+  order, because its working set is small and fixed.
+- The cache does not lock. Two threads racing on a miss both encode the
+  same value and store identical bytes.
+"""
+
+from typing import Dict, Hashable, Iterable, Mapping, Optional
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(value: object) -> bytes:
+    """Compact JSON bytes, exactly as a FastAPI response_model would write them."""
+    return to_json(value)
+
+
+class FragmentCache:
+    """Bounded memo of JSON-encoded values, keyed by the value (or a stand-in key)."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, bytes] = {}
+
+    def encode(self, value: Hashable) -> bytes:
+        """Encoded ``value``, which must be hashable and immutable (e.g. a str)."""
+        return self.get(value, value)
+
+    def get(self, key: Hashable, value: object) -> bytes:
+        """Encoded ``value``, cached under ``key``; ``key`` must determine ``value``."""
+        encoded = self._entries.get(key)
+        if encoded is None:
+            encoded = dumps(value)
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = encoded
+        return encoded
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def json_array(items: Iterable[bytes]) -> bytes:
+    """Join already-encoded JSON values into a JSON array."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def json_response(body: bytes, headers: Optional[Mapping[str, str]] = None, status_code: int = 200) -> Response:
+    """Response for pre-encoded JSON; FastAPI sends it without validating it again."""
+    return Response(content=body, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+__all__ = [
+    "FragmentCache",
+    "JSON_MEDIA_TYPE",
+    "dumps",
+    "json_array",
+    "json_response",
+]
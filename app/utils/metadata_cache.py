@@ -0,0 +1,141 @@
+"""
+Cached, read-only access to each scheme's metadata.json.
+
+Metadata (benefit amounts, fairness policy, ethical disclaimer) is read
+on every prediction but changes rarely. This cache parses each file once
+and hands out the same frozen object to every caller.
+
+Key design choices:
+- Returned objects are immutable (MappingProxyType / tuple), so sharing
+  them between requests and threads cannot leak mutations.
+- Edits on disk are picked up without a restart: the file's mtime is
+  re-checked at most once per ``check_interval`` seconds, which keeps
+  stat() calls off the hot path.
+- A ``generation`` counter increases on every (re)load so dependent
+  caches can tell when their inputs changed.
+"""
+
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+
+SCHEMES_DIR = Path(__file__).resolve().parent.parent / "schemes"
+
+EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into read-only containers."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("data", "mtime_ns", "checked_at")
+
+    def __init__(self, data: Mapping[str, Any], mtime_ns: Optional[int], checked_at: float):
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self.checked_at = checked_at
+
+
+class SchemeMetadataCache:
+    """mtime-aware, load-once cache of parsed scheme metadata."""
+
+    def __init__(self, base_dir: Path = SCHEMES_DIR, check_interval: float = 1.0) -> None:
+        self._base_dir = Path(base_dir)
+        self._check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def path_for(self, scheme_id: str) -> Path:
+        return self._base_dir / scheme_id / "metadata.json"
+
+    def get(self, scheme_id: str) -> Mapping[str, Any]:
+        """
+        Return the frozen metadata for a scheme.
+
+        A missing file yields an empty mapping so services can still
+        respond without rich metadata.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(scheme_id)
+        if entry is not None and now - entry.checked_at < self._check_interval:
+            return entry.data
+
+        with self._lock:
+            entry = self._entries.get(scheme_id)
+            if entry is not None and now - entry.checked_at < self._check_interval:
+                return entry.data
+
+            mtime_ns = self._mtime_ns(scheme_id)
+            if entry is not None and entry.mtime_ns == mtime_ns:
+                entry.checked_at = now
+                return entry.data
+
+            try:
+                data, mtime_ns = self._parse(scheme_id)
+            except ValueError:
+                # A half-written edit: keep serving the last good copy and
+                # retry on the next check.
+                if entry is None:
+                    raise
+                entry.checked_at = now
+                return entry.data
+            self._entries[scheme_id] = _Entry(data, mtime_ns, now)
+            self.generation += 1
+            return data
+
+    def check_for_changes(self) -> int:
+        """
+        Re-validate every cached scheme (subject to ``check_interval``)
+        and return the current ``generation``.
+        """
+        for scheme_id in list(self._entries):
+            self.get(scheme_id)
+        return self.generation
+
+    def invalidate(self, scheme_id: Optional[str] = None) -> None:
+        """Force a re-read on next access (all schemes if none given)."""
+        with self._lock:
+            if scheme_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(scheme_id, None)
+            self.generation += 1
+
+    def _mtime_ns(self, scheme_id: str) -> Optional[int]:
+        try:
+            return self.path_for(scheme_id).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _parse(self, scheme_id: str) -> Tuple[Mapping[str, Any], Optional[int]]:
+        path = self.path_for(scheme_id)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                # Stat the open file so the mtime matches what we parsed.
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                return _freeze(json.load(f)), mtime_ns
+        except FileNotFoundError:
+            return EMPTY_METADATA, None
+
+
+# Shared by every router in the process.
+metadata_cache = SchemeMetadataCache()
+
+
+__all__ = [
+    "EMPTY_METADATA",
+    "SchemeMetadataCache",
+    "metadata_cache",
+]
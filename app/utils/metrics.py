@@ -0,0 +1,258 @@
+"""
+Lightweight latency histograms and counters with Prometheus text output.
+
+/predict spends its time in several stages (rule checks, feature
+extraction, inference, explanations, the bias audit, response models).
+This module times those stages without pulling in a metrics client:
+
+Key design choices:
+- Fixed latency buckets shared by every histogram unless describe()
+  gives a metric its own (e.g. batch sizes); an observation is a bisect
+  plus two additions under a lock, cheap enough to leave on.
+- Metrics are identified by name plus a tuple of label values and are
+  created on first use, so call sites need no registration step.
+- METRICS_ENABLED=0 turns every timer and counter into a no-op.
+- render() emits the Prometheus text exposition format (version 0.0.4).
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import os
+import threading
+import time
+
+
+# Seconds. Covers sub-millisecond NumPy calls up to slow, cold requests.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+# Requests per coalesced batch.
+BATCH_SIZE_BUCKETS: Tuple[float, ...] = (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0, 256.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self, n_buckets: int) -> None:
+        # Last slot is the +Inf bucket.
+        self.bucket_counts = [0] * (n_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms and counters keyed by name and labels."""
+
+    def __init__(self, enabled: bool = True, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._label_names: Dict[str, Tuple[str, ...]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._histograms: Dict[str, Dict[LabelValues, _Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelValues, float]] = {}
+
+    # ---------- DECLARATION ----------
+    def describe(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        label_names: Sequence[str],
+        buckets: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Register HELP / TYPE text, label order and (histograms) bucket bounds for a metric."""
+        self._help[name] = (kind, help_text)
+        self._label_names[name] = tuple(label_names)
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+        if kind == "histogram":
+            self._histograms.setdefault(name, {})
+        else:
+            self._counters.setdefault(name, {})
+
+    # ---------- RECORDING ----------
+    def observe(self, name: str, seconds: float, *labels: str) -> None:
+        """Add one observation to histogram ``name``."""
+        if not self.enabled:
+            return
+        buckets = self._buckets.get(name, self.buckets)
+        index = bisect_left(buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(labels)
+            if hist is None:
+                hist = series[labels] = _Histogram(len(buckets))
+            hist.bucket_counts[index] += 1
+            hist.count += 1
+            hist.sum += seconds
+
+    def inc(self, name: str, *labels: str, amount: float = 1.0) -> None:
+        """Increase counter ``name``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + amount
+
+    @contextmanager
+    def timer(self, name: str, *labels: str) -> Iterator[None]:
+        """Time the enclosed block into histogram ``name``."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, *labels)
+
+    def stage(self, endpoint: str, scheme: str, stage: str) -> Any:
+        """Timer for one stage of a prediction endpoint."""
+        return self.timer("predict_stage_duration_seconds", endpoint, scheme, stage)
+
+    def reset(self) -> None:
+        with self._lock:
+            for series in self._histograms.values():
+                series.clear()
+            for counters in self._counters.values():
+                counters.clear()
+
+    # ---------- EXPOSITION ----------
+    def render(self) -> str:
+        """All metrics in Prometheus text format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, "histogram")
+                buckets = self._buckets.get(name, self.buckets) + (float("inf"),)
+                for labels, hist in sorted(series.items()):
+                    base = self._labels(name, labels)
+                    cumulative = 0
+                    for bound, n in zip(buckets, hist.bucket_counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        labels_le = self._join(base, f'le="{le}"')
+                        lines.append(f"{name}_bucket{labels_le} {cumulative}")
+                    lines.append(f"{name}_sum{self._join(base)} {hist.sum!r}")
+                    lines.append(f"{name}_count{self._join(base)} {hist.count}")
+            for name, counters in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for labels, value in sorted(counters.items()):
+                    lines.append(f"{name}{self._join(self._labels(name, labels))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, default_kind: str) -> None:
+        kind, help_text = self._help.get(name, (default_kind, name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def _labels(self, name: str, values: LabelValues) -> List[str]:
+        names = self._label_names.get(name) or tuple(f"label{i}" for i in range(len(values)))
+        return [f'{k}="{_escape(v)}"' for k, v in zip(names, values)]
+
+    @staticmethod
+    def _join(base: List[str], *extra: str) -> str:
+        parts = list(base) + list(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() not in {"0", "false", "no", "off"}
+
+
+metrics = MetricsRegistry(enabled=_env_flag("METRICS_ENABLED", "1"))
+
+# Stage timings for /predict and the per-scheme /api/*/predict handlers.
+metrics.describe(
+    "predict_stage_duration_seconds",
+    "histogram",
+    "Time spent per prediction stage.",
+    ("endpoint", "scheme", "stage"),
+)
+metrics.describe(
+    "predict_records_total",
+    "counter",
+    "Applicant records scored, by endpoint and scheme.",
+    ("endpoint", "scheme"),
+)
+metrics.describe(
+    "http_request_duration_seconds",
+    "histogram",
+    "End-to-end request latency, including response serialisation.",
+    ("method", "route", "status"),
+)
+# Micro-batching of concurrent /predict calls (PREDICT_BATCH_WINDOW_MS).
+metrics.describe(
+    "predict_batch_size",
+    "histogram",
+    "Requests per coalesced /predict batch.",
+    ("endpoint",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+metrics.describe(
+    "predict_batch_queue_seconds",
+    "histogram",
+    "Time a request waited for its batch to start.",
+    ("endpoint",),
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware recording http_request_duration_seconds.
+
+    Requests are labelled by route template (e.g. "/api/pmay/predict")
+    rather than raw path to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: Any, registry: MetricsRegistry = metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.registry.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                scope.get("method", ""),
+                route,
+                str(status[0]),
+            )
+
+
+__all__ = [
+    "BATCH_SIZE_BUCKETS",
+    "LATENCY_BUCKETS",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "PROMETHEUS_CONTENT_TYPE",
+    "metrics",
+]
@@ -0,0 +1,205 @@
+"""
+Adaptive micro-batching of concurrent calls.
+
+Under peak load /predict receives many concurrent single-applicant
+requests, and each one pays for its own rule pass and a tiny model call.
+A MicroBatcher lets those worker threads meet. The first caller opens a
+batch and waits up to a short window for others to join. It then runs
+one batched call for everyone and hands each caller its own result.
+
+Key design choices:
+- Leader / follower: the thread that opens a batch also processes it,
+  so no background thread is needed and a solitary request runs on its
+  own thread as before.
+- A batch closes when the window expires or when it reaches
+  max_batch_size, whichever comes first.
+- The window adapts to load. An exponentially weighted mean of the gaps
+  between arrivals estimates how soon the next request will come. The
+  batcher only waits when at least one more request is expected within
+  max_wait_seconds, so idle traffic gets no extra latency. An arrival
+  with no other call in flight counts as a maximal gap: a single client
+  sending back-to-back requests never has company, so it should never
+  wait. Gaps are capped so that one idle spell does not hide the next
+  burst.
+  adaptive=False always waits the full window.
+- If a batched call raises, each item is retried on its own, so one bad
+  request fails only its own caller.
+- Batch sizes and queueing delay (arrival to batch start) go to an
+  ``on_batch`` callback, keeping this module free of metrics wiring.
+- Callers block a thread while they wait. With sync FastAPI endpoints,
+  the server's threadpool size is therefore also an upper bound on the
+  batch size.
+"""
+
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, TypeVar
+import threading
+import time
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Batch:
+    __slots__ = ("items", "arrivals", "results", "errors", "full", "done")
+
+    def __init__(self) -> None:
+        self.items: List[object] = []
+        self.arrivals: List[float] = []
+        self.results: List[object] = []
+        self.errors: List[Optional[BaseException]] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesces concurrent submit() calls into batched ``process`` calls."""
+
+    def __init__(
+        self,
+        process: Callable[[List[T]], Sequence[R]],
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.002,
+        smoothing: float = 0.2,
+        adaptive: bool = True,
+        on_batch: Optional[Callable[[int, List[float]], None]] = None,
+    ) -> None:
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.smoothing = smoothing
+        self.adaptive = adaptive
+        self.on_batch = on_batch
+        self._lock = threading.Lock()
+        self._open: Optional[_Batch] = None
+        self._active = 0
+        self._last_arrival: Optional[float] = None
+        self._mean_gap: Optional[float] = None
+        self._window = 0.0 if adaptive else max_wait_seconds
+        self.batches = 0
+        self.requests = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait_seconds > 0 and self.max_batch_size > 1
+
+    @property
+    def window(self) -> float:
+        """Seconds the next batch leader will wait for company."""
+        return self._window
+
+    def submit(self, item: T) -> R:
+        """Process ``item``, possibly together with concurrent submissions."""
+        if not self.enabled:
+            return self.process([item])[0]
+
+        now = time.perf_counter()
+        with self._lock:
+            self._adapt(now)
+            self._active += 1
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            index = len(batch.items)
+            batch.items.append(item)
+            batch.arrivals.append(now)
+            if len(batch.items) >= self.max_batch_size:
+                self._open = None
+                batch.full.set()
+            window = self._window
+
+        try:
+            if leader:
+                if window > 0:
+                    batch.full.wait(window)
+                with self._lock:
+                    if self._open is batch:
+                        self._open = None
+                self._run(batch)
+            else:
+                batch.done.wait()
+        finally:
+            with self._lock:
+                self._active -= 1
+
+        error = batch.errors[index]
+        if error is not None:
+            raise error
+        return batch.results[index]  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_seconds": self.max_wait_seconds,
+            "window_seconds": self._window,
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "fallbacks": self.fallbacks,
+        }
+
+    # ---------- INTERNALS ----------
+    def _adapt(self, now: float) -> None:
+        """Update the arrival-gap estimate and the window (caller holds the lock)."""
+        if not self.adaptive:
+            return
+        if self._last_arrival is not None:
+            gap = 2 * self.max_wait_seconds
+            if self._active:
+                gap = min(now - self._last_arrival, gap)
+            if self._mean_gap is None:
+                self._mean_gap = gap
+            else:
+                self._mean_gap += self.smoothing * (gap - self._mean_gap)
+        self._last_arrival = now
+
+        if self._mean_gap is None or self._mean_gap >= self.max_wait_seconds:
+            self._window = 0.0
+        else:
+            # Long enough to collect a full batch at the current rate, capped.
+            self._window = min(self.max_wait_seconds, self._mean_gap * (self.max_batch_size - 1))
+
+    def _run(self, batch: _Batch) -> None:
+        started = time.perf_counter()
+        items = batch.items
+        try:
+            try:
+                results = list(self.process(items))  # type: ignore[arg-type]
+                if len(results) != len(items):
+                    raise RuntimeError(f"batch of {len(items)} returned {len(results)} results")
+                batch.results = results
+                batch.errors = [None] * len(items)
+            except Exception as e:
+                if len(items) == 1:
+                    batch.results, batch.errors = [None], [e]
+                else:
+                    with self._lock:
+                        self.fallbacks += 1
+                    self._run_individually(batch)
+        finally:
+            if len(batch.errors) != len(items):
+                # Interrupted (e.g. KeyboardInterrupt): never strand followers.
+                batch.results = [None] * len(items)
+                batch.errors = [RuntimeError("batch was aborted")] * len(items)
+            batch.done.set()
+
+        with self._lock:
+            self.batches += 1
+            self.requests += len(items)
+        if self.on_batch is not None:
+            self.on_batch(len(items), [started - arrival for arrival in batch.arrivals])
+
+    def _run_individually(self, batch: _Batch) -> None:
+        batch.results = [None] * len(batch.items)
+        batch.errors = [None] * len(batch.items)
+        for i, item in enumerate(batch.items):
+            try:
+                batch.results[i] = self.process([item])[0]  # type: ignore[list-item]
+            except Exception as e:
+                batch.errors[i] = e
+
+
+__all__ = ["MicroBatcher"]
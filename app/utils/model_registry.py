@@ -0,0 +1,246 @@
+"""
+Process-wide registry for trained scheme artifacts.
+
+Every scheme ships its fitted pipeline as a joblib pickle next to its
+rules and metadata. Unpickling is by far the most expensive step of a
+prediction, so artifacts are loaded once per process and then shared by
+the unified router and the per-scheme services.
+
+Key design choices:
+- Loading is lazy and guarded by a lock, so concurrent first requests
+  never unpickle the same file twice.
+- Reads after the first load take no lock at all; a dict lookup is
+  atomic under the GIL and the loaded objects are never mutated.
+- Load time and in-memory size are recorded per artifact so operators
+  can see what each scheme costs.
+- Fitted pipelines can also be served as compiled scorers (see
+  app/utils/scoring.py), built once next to the artifact they wrap.
+- ``check_for_changes`` reloads artifacts whose file was replaced and
+  bumps ``generation`` so dependent caches can invalidate themselves.
+- Compact ``model.bin`` artifacts (see app/utils/artifacts.py) are
+  memory-mapped instead of unpickled and are already scorers;
+  ``preferred_artifact`` picks them over the pickle when exported.
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import threading
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from app.utils.artifacts import COMPACT_ARTIFACT, load_artifact
+from app.utils.scoring import LinearScorer, compile_pipeline
+
+
+SCHEMES_DIR = Path(__file__).resolve().parent.parent / "schemes"
+
+DEFAULT_ARTIFACT = "pipeline.pkl"
+
+
+@dataclass(frozen=True)
+class ArtifactStats:
+    """
+    Bookkeeping for a single loaded artifact.
+
+    load_seconds:
+        Wall-clock time spent unpickling (the first load also pays for
+        importing sklearn).
+    memory_bytes:
+        Deep size of the loaded object graph, counting NumPy buffers by
+        ``nbytes``. Shared module state (classes, functions) is excluded.
+    """
+
+    scheme_id: str
+    artifact: str
+    path: str
+    size_bytes: int
+    load_seconds: float
+    memory_bytes: int
+
+
+def _deep_sizeof(obj: Any) -> int:
+    """Approximate memory held by an object graph such as a fitted pipeline."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        if isinstance(current, np.ndarray):
+            total += sys.getsizeof(current)
+            if current.base is None:
+                total += current.nbytes
+            continue
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+    return total
+
+
+class ModelRegistry:
+    """Thread-safe, load-once cache of scheme artifacts."""
+
+    def __init__(self, base_dir: Path = SCHEMES_DIR, check_interval: float = 1.0) -> None:
+        self._base_dir = Path(base_dir)
+        self._artifacts: Dict[Tuple[str, str], Any] = {}
+        self._stats: Dict[Tuple[str, str], ArtifactStats] = {}
+        self._scorers: Dict[Tuple[str, str], Any] = {}
+        self._mtimes: Dict[Tuple[str, str], int] = {}
+        self._preferred: Dict[Tuple[str, str], str] = {}
+        # A single lock is enough: loads happen once per artifact.
+        self._load_lock = threading.Lock()
+        self._check_interval = check_interval
+        self._checked_at = time.monotonic()
+        self.generation = 0
+
+    def artifact_path(self, scheme_id: str, artifact: str = DEFAULT_ARTIFACT) -> Path:
+        """Resolve the on-disk location of a scheme artifact."""
+        return self._base_dir / scheme_id / artifact
+
+    def get(self, scheme_id: str, artifact: str = DEFAULT_ARTIFACT) -> Any:
+        """
+        Return the loaded artifact, unpickling it on first use.
+
+        Raises:
+            FileNotFoundError: if the artifact does not exist on disk.
+        """
+        key = (scheme_id, artifact)
+        obj = self._artifacts.get(key)
+        if obj is not None:
+            return obj
+
+        with self._load_lock:
+            obj = self._artifacts.get(key)
+            if obj is None:
+                obj, stats = self._load(scheme_id, artifact)
+                self._stats[key] = stats
+                self._artifacts[key] = obj
+        return obj
+
+    def get_scorer(self, scheme_id: str, artifact: str = DEFAULT_ARTIFACT) -> Any:
+        """Return the compiled scorer for an artifact, building it on first use."""
+        key = (scheme_id, artifact)
+        scorer = self._scorers.get(key)
+        if scorer is not None:
+            return scorer
+
+        estimator = self.get(scheme_id, artifact)
+        with self._load_lock:
+            scorer = self._scorers.get(key)
+            if scorer is None:
+                # Compact artifacts load as scorers; don't touch sklearn.
+                scorer = estimator if isinstance(estimator, LinearScorer) else compile_pipeline(estimator)
+                self._scorers[key] = scorer
+        return scorer
+
+    def check_for_changes(self) -> int:
+        """
+        Reload any loaded artifact whose file mtime changed.
+
+        Stats the files at most once per ``check_interval`` seconds and
+        returns the current ``generation``.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self._check_interval:
+            return self.generation
+
+        with self._load_lock:
+            if now - self._checked_at < self._check_interval:
+                return self.generation
+            self._checked_at = now
+            for key, mtime_ns in list(self._mtimes.items()):
+                try:
+                    current = self.artifact_path(*key).stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue  # keep serving the last good copy
+                if current == mtime_ns:
+                    continue
+                obj, stats = self._load(*key)
+                self._artifacts[key] = obj
+                self._stats[key] = stats
+                self._scorers.pop(key, None)
+                self.generation += 1
+        return self.generation
+
+    def preferred_artifact(self, scheme_id: str, fallback: str = "model.pkl") -> str:
+        """
+        The compact artifact if one was exported for the scheme, else
+        ``fallback``. The choice is remembered until ``clear``.
+        """
+        key = (scheme_id, fallback)
+        choice = self._preferred.get(key)
+        if choice is None:
+            exported = self.artifact_path(scheme_id, COMPACT_ARTIFACT).exists()
+            choice = self._preferred[key] = COMPACT_ARTIFACT if exported else fallback
+        return choice
+
+    def is_loaded(self, scheme_id: str, artifact: str = DEFAULT_ARTIFACT) -> bool:
+        return (scheme_id, artifact) in self._artifacts
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-artifact load time and memory, in load order."""
+        return [asdict(s) for s in list(self._stats.values())]
+
+    def clear(self) -> None:
+        """Drop every loaded artifact (mainly useful in tests)."""
+        with self._load_lock:
+            self._artifacts.clear()
+            self._stats.clear()
+            self._scorers.clear()
+            self._mtimes.clear()
+            self._preferred.clear()
+            self.generation += 1
+
+    def _load(self, scheme_id: str, artifact: str) -> Tuple[Any, ArtifactStats]:
+        path = self.artifact_path(scheme_id, artifact)
+        if not path.exists():
+            raise FileNotFoundError(f"Model file not found for scheme {scheme_id}")
+
+        start = time.perf_counter()
+        obj = load_artifact(path) if artifact == COMPACT_ARTIFACT else joblib.load(path)
+        elapsed = time.perf_counter() - start
+
+        self._mtimes[(scheme_id, artifact)] = path.stat().st_mtime_ns
+        stats = ArtifactStats(
+            scheme_id=scheme_id,
+            artifact=artifact,
+            path=str(path),
+            size_bytes=path.stat().st_size,
+            load_seconds=elapsed,
+            memory_bytes=_deep_sizeof(obj),
+        )
+        return obj, stats
+
+
+# Shared by every router in the process.
+registry = ModelRegistry()
+
+
+def get_pipeline(scheme_id: str, artifact: str = DEFAULT_ARTIFACT) -> Any:
+    """Convenience accessor for the shared registry."""
+    return registry.get(scheme_id, artifact)
+
+
+def get_scorer(scheme_id: str, artifact: str = DEFAULT_ARTIFACT) -> Any:
+    """Convenience accessor for the shared registry's compiled scorers."""
+    return registry.get_scorer(scheme_id, artifact)
+
+
+__all__ = [
+    "ArtifactStats",
+    "ModelRegistry",
+    "registry",
+    "get_pipeline",
+    "get_scorer",
+]
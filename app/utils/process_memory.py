@@ -0,0 +1,96 @@
+"""
+Per-process memory accounting for pre-fork serving.
+
+RSS alone double-counts pages that forked workers still share with the
+master, so it cannot show whether pre-loading models actually saved
+memory. On Linux, /proc/<pid>/smaps_rollup also gives:
+
+- USS (unique set size): Private_Clean + Private_Dirty, the memory that
+  would be freed if this process exited;
+- PSS (proportional set size): each shared page split evenly between the
+  processes mapping it, so PSS summed over workers is the real total.
+
+Key design choices:
+- Reads /proc directly; no psutil dependency.
+- Falls back to /proc/<pid>/status (RSS only), and then to
+  resource.getrusage for the current process, on systems without
+  smaps_rollup. Missing figures are reported as None.
+"""
+
+from typing import Dict, Optional
+import os
+
+
+_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+}
+
+
+def _read_kb_fields(path: str, wanted: Dict[str, str]) -> Dict[str, int]:
+    values: Dict[str, int] = {}
+    with open(path, "r", encoding="ascii") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in wanted:
+                values[wanted[name]] = int(rest.split()[0]) * 1024
+    return values
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, Optional[int]]:
+    """
+    RSS, PSS and USS of ``pid`` (default: this process) in bytes.
+
+    Keys: pid, rss_bytes, pss_bytes, uss_bytes, shared_bytes.
+    """
+    pid = os.getpid() if pid is None else pid
+    report: Dict[str, Optional[int]] = {
+        "pid": pid,
+        "rss_bytes": None,
+        "pss_bytes": None,
+        "uss_bytes": None,
+        "shared_bytes": None,
+    }
+    try:
+        fields = _read_kb_fields(f"/proc/{pid}/smaps_rollup", _FIELDS)
+    except OSError:
+        fields = {}
+
+    if fields:
+        report["rss_bytes"] = fields.get("rss_bytes")
+        report["pss_bytes"] = fields.get("pss_bytes")
+        report["uss_bytes"] = fields.get("private_clean_bytes", 0) + fields.get("private_dirty_bytes", 0)
+        report["shared_bytes"] = fields.get("shared_clean_bytes", 0) + fields.get("shared_dirty_bytes", 0)
+        return report
+
+    try:
+        report["rss_bytes"] = _read_kb_fields(f"/proc/{pid}/status", {"VmRSS": "rss_bytes"}).get("rss_bytes")
+    except OSError:
+        if pid == os.getpid():
+            import resource
+            import sys
+
+            # ru_maxrss is peak RSS: kilobytes on Linux, bytes on macOS.
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            report["rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    return report
+
+
+def format_memory(report: Dict[str, Optional[int]]) -> str:
+    """One-line, MiB-rounded summary for logs."""
+
+    def mib(key: str) -> str:
+        value = report.get(key)
+        return "n/a" if value is None else f"{value / 2**20:.1f} MiB"
+
+    return (
+        f"pid {report['pid']}: rss {mib('rss_bytes')}, uss {mib('uss_bytes')}, "
+        f"pss {mib('pss_bytes')}, shared {mib('shared_bytes')}"
+    )
+
+
+__all__ = ["format_memory", "memory_usage"]
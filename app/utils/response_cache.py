@@ -0,0 +1,113 @@
+"""
+In-process LRU + TTL cache for repeated prediction responses.
+
+Citizens resubmit the same form and kiosks retry after timeouts, so a
+large share of /predict traffic is exact repeats. Responses depend only
+on the (normalised) request, the loaded models and scheme metadata, so
+they can be reused until one of those changes.
+
+Key design choices:
+- Bounded size with least-recently-used eviction, plus a per-entry TTL.
+- Every lookup compares a cheap "version" token (model registry and
+  metadata generations); any change clears the whole cache, so a new
+  model or an edited metadata.json is never masked by stale entries.
+- Hit / miss / eviction counters are kept for the stats endpoint.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with TTL expiry and version-based invalidation."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 300.0,
+        version: Optional[Callable[[], Hashable]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._version_fn = version
+        self._version: Hashable = version() if version is not None else None
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None on a miss."""
+        if not self.enabled:
+            return None
+        self._check_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _check_version(self) -> None:
+        if self._version_fn is None:
+            return
+        current = self._version_fn()
+        if current != self._version:
+            with self._lock:
+                if current != self._version:
+                    if self._entries:
+                        self._entries.clear()
+                        self.invalidations += 1
+                    self._version = current
+
+
+__all__ = ["ResponseCache"]
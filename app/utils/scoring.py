@@ -0,0 +1,171 @@
+"""
+Compiled scoring kernels for the scheme pipelines.
+
+Every scheme is trained as ``Pipeline([StandardScaler, LogisticRegression])``.
+Both steps are affine, so the whole pipeline collapses into a single
+weight vector and bias:
+
+    z = ((x - mean) / scale) @ coef + intercept
+      = x @ (coef / scale) + (intercept - mean @ (coef / scale))
+
+A scaler fitted with ``with_mean=False`` or ``with_std=False`` skips that
+term (its ``mean_`` is still set, but never subtracted). Scoring is then
+one NumPy dot product and a sigmoid, with none of sklearn's per-call
+validation and dispatch. Pipelines that do not have
+this exact shape are wrapped unchanged so callers never need to care
+which path they got.
+"""
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+
+class LinearScorer:
+    """
+    Binary logistic model folded into raw-feature space.
+
+    Exposes the small part of the sklearn estimator API the services use
+    (``predict_proba``, ``predict``, ``decision_function``) so it can be
+    swapped in wherever a fitted pipeline was used before.
+    """
+
+    compiled = True
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float,
+        classes: Sequence[Any] = (0, 1),
+        feature_names: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64).ravel()
+        self.bias = float(bias)
+        self.classes_ = np.asarray(classes)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.n_features_in_ = self.weights.shape[0]
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the scorer is expecting "
+                f"{self.n_features_in_} features as input."
+            )
+        return X @ self.weights + self.bias
+
+    def positive_proba(self, X: Any) -> np.ndarray:
+        """Probability of the positive class as a 1-D array."""
+        z = self.decision_function(X)
+        # Numerically stable sigmoid: 1 / (1 + exp(-z)).
+        return np.exp(-np.logaddexp(0.0, -z))
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        p = self.positive_proba(X)
+        return np.column_stack((1.0 - p, p))
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(np.intp)]
+
+
+class SklearnScorer:
+    """Fallback that defers to the original fitted estimator."""
+
+    compiled = False
+
+    def __init__(self, estimator: Any) -> None:
+        self.estimator = estimator
+        self.classes_ = getattr(estimator, "classes_", None)
+        self.n_features_in_ = getattr(estimator, "n_features_in_", None)
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        return self.estimator.decision_function(X)
+
+    def positive_proba(self, X: Any) -> np.ndarray:
+        return self.estimator.predict_proba(X)[:, 1]
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.estimator.predict_proba(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.estimator.predict(X)
+
+
+# LogisticRegression.predict picks the positive class when the decision
+# function is > 0, i.e. when its probability is strictly above one half.
+DECISION_THRESHOLD = 0.5
+
+
+def predict_with_proba(scorer: Any, X: Any, threshold: float = DECISION_THRESHOLD):
+    """
+    Labels and positive-class probabilities from a single scoring pass.
+
+    Equivalent to calling ``predict`` and ``predict_proba`` separately,
+    without running the scaler and model twice.
+    """
+    probs = scorer.positive_proba(X)
+    labels = np.asarray(scorer.classes_)[(probs > threshold).astype(np.intp)]
+    return labels, probs
+
+
+def _fold_linear(scaler: Any, model: Any) -> Optional[LinearScorer]:
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    if coef.shape[0] != 1 or len(model.classes_) != 2:
+        return None  # multiclass: softmax does not reduce to one sigmoid
+
+    weights = coef[0].copy()
+    bias = float(np.asarray(model.intercept_, dtype=np.float64)[0])
+
+    if scaler is not None:
+        # StandardScaler keeps mean_ even when with_mean=False; only the
+        # flags say which terms transform() actually applies.
+        scale = getattr(scaler, "scale_", None) if getattr(scaler, "with_std", True) else None
+        mean = getattr(scaler, "mean_", None) if getattr(scaler, "with_mean", True) else None
+        if scale is not None:
+            weights = weights / np.asarray(scale, dtype=np.float64)
+        if mean is not None:
+            bias -= float(np.asarray(mean, dtype=np.float64) @ weights)
+
+    feature_names = getattr(scaler if scaler is not None else model, "feature_names_in_", None)
+    return LinearScorer(weights, bias, model.classes_, feature_names)
+
+
+def compile_pipeline(estimator: Any):
+    """
+    Compile a fitted estimator into the fastest equivalent scorer.
+
+    Supported shapes are a bare binary ``LogisticRegression`` and a
+    ``Pipeline`` of ``StandardScaler`` followed by one. Anything else
+    (other transformers, multiclass models, unfitted objects) comes back
+    wrapped in a SklearnScorer with identical behaviour.
+    """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = None
+    model = estimator
+    if isinstance(estimator, Pipeline):
+        steps = [step for _, step in estimator.steps if step not in (None, "passthrough")]
+        if len(steps) == 2 and isinstance(steps[0], StandardScaler):
+            scaler, model = steps
+        elif len(steps) == 1:
+            model = steps[0]
+        else:
+            return SklearnScorer(estimator)
+
+    if type(model) is not LogisticRegression or not hasattr(model, "coef_"):
+        return SklearnScorer(estimator)
+
+    scorer = _fold_linear(scaler, model)
+    return scorer if scorer is not None else SklearnScorer(estimator)
+
+
+__all__ = [
+    "LinearScorer",
+    "SklearnScorer",
+    "compile_pipeline",
+    "predict_with_proba",
+]
@@ -0,0 +1,119 @@
+import json
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.utils import artifacts
+from app.utils.artifacts import ArtifactFormatError, export_artifact, load_artifact, read_header
+from app.utils.model_registry import SCHEMES_DIR
+
+EXPORTED = ["pm_kisan", "pmay", "nsp", "ayushman"]
+
+
+def test_shipped_artifacts_match_pipelines():
+    rng = np.random.default_rng(0)
+    for scheme in EXPORTED:
+        pipeline = joblib.load(SCHEMES_DIR / scheme / "pipeline.pkl")
+        scorer = load_artifact(SCHEMES_DIR / scheme / "model.bin")
+        # Weights are a read-only view onto the mapped file, not a copy.
+        assert scorer.weights.base is not None and not scorer.weights.flags.writeable
+
+        X = rng.uniform(0, 5, size=(500, pipeline.n_features_in_))
+        X[:, 1] = rng.uniform(10_000, 200_000, 500)
+        np.testing.assert_allclose(scorer.predict_proba(X), pipeline.predict_proba(X), rtol=0, atol=1e-12)
+        assert read_header(SCHEMES_DIR / scheme / "model.bin")[0]["feature_names"] == list(pipeline.feature_names_in_)
+
+
+def test_corrupt_or_mismatched_artifacts_are_rejected(tmp_path):
+    pipeline = joblib.load(SCHEMES_DIR / "nsp" / "pipeline.pkl")
+    path = tmp_path / "model.bin"
+    export_artifact(pipeline, path, scheme_id="nsp", feature_names=["age", "annual_income", "student_class"])
+
+    raw = bytearray(path.read_bytes())
+    raw[-1] ^= 0xFF
+    path.write_bytes(bytes(raw))
+    with pytest.raises(ArtifactFormatError, match="checksum"):
+        load_artifact(path)
+
+    with pytest.raises(ArtifactFormatError, match="fitted on"):
+        export_artifact(pipeline, path, scheme_id="nsp", feature_names=["annual_income", "age", "student_class"])
+
+
+def _rewrite_header(path, **changes):
+    header, offset = read_header(path)
+    data = path.read_bytes()[offset:]
+    encoded = json.dumps(dict(header, **changes), sort_keys=True).encode("utf-8")
+    prefix = artifacts._PREFIX.pack(artifacts.MAGIC, artifacts.FORMAT_VERSION, len(encoded))
+    path.write_bytes(prefix + encoded + data)
+
+
+def test_headers_that_disagree_with_themselves_are_rejected(tmp_path):
+    pipeline = joblib.load(SCHEMES_DIR / "nsp" / "pipeline.pkl")
+    path = tmp_path / "model.bin"
+    names = ["age", "annual_income", "student_class"]
+    export_artifact(pipeline, path, scheme_id="nsp", feature_names=names)
+    _rewrite_header(path, feature_names=names[:2])
+    with pytest.raises(ArtifactFormatError, match="3 features but 2 feature names"):
+        load_artifact(path)
+
+    export_artifact(pipeline, path, scheme_id="nsp", feature_names=names)
+    _rewrite_header(path, dtype="<f4")
+    with pytest.raises(ArtifactFormatError, match="unsupported dtype"):
+        load_artifact(path)
+
+
+def test_export_rejects_a_feature_count_mismatch(tmp_path):
+    # Fitted on a bare array, so only the feature count can be checked.
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 5, size=(200, 4))
+    pipeline = Pipeline([("scaler", StandardScaler()), ("model", LogisticRegression())]).fit(X, X[:, 0] > 2.5)
+    with pytest.raises(ArtifactFormatError, match="fitted on 4 features but FEATURES has 3"):
+        export_artifact(pipeline, tmp_path / "model.bin", scheme_id="nsp", feature_names=["a", "b", "c"])
+
+
+def test_scaler_without_centering_round_trips(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 5, size=(500, 3))
+    X[:, 1] = rng.uniform(10_000, 200_000, 500)
+    y = (X[:, 1] < 100_000).astype(int)
+    pipeline = Pipeline([("scaler", StandardScaler(with_mean=False)), ("model", LogisticRegression())]).fit(X, y)
+
+    path = tmp_path / "model.bin"
+    export_artifact(pipeline, path, scheme_id="nsp", feature_names=["x0", "x1", "x2"])
+    np.testing.assert_allclose(load_artifact(path).predict_proba(X), pipeline.predict_proba(X), rtol=0, atol=1e-12)
+    mean = np.memmap(path, dtype="<f8", mode="r", offset=read_header(path)[1])[:3]
+    np.testing.assert_array_equal(mean, 0.0)
+
+
+def test_loading_does_not_import_sklearn():
+    code = (
+        "import sys; from app.utils.artifacts import load_artifact; "
+        "load_artifact('app/schemes/nsp/model.bin').predict_proba([[18, 50000, 10]]); "
+        "print('sklearn' in sys.modules)"
+    )
+    repo_root = SCHEMES_DIR.parent.parent
+    out = subprocess.run([sys.executable, "-c", code], cwd=repo_root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_export_fails_loudly_for_a_scheme_fitted_on_other_features(tmp_path, monkeypatch, capsys):
+    from app import export_models
+
+    # An NSP pipeline fitted with its first two features swapped.
+    pipeline = joblib.load(SCHEMES_DIR / "nsp" / "pipeline.pkl")
+    pipeline[0].feature_names_in_ = pipeline[0].feature_names_in_[[1, 0, 2]]
+    (tmp_path / "nsp").mkdir()
+    joblib.dump(pipeline, tmp_path / "nsp" / "pipeline.pkl")
+    monkeypatch.setattr(export_models, "SCHEMES_DIR", tmp_path)
+
+    assert export_models.main(["nsp"]) == 1
+    err = capsys.readouterr().err
+    assert "ERROR: nsp: model was fitted on" in err
+    assert "export failed for nsp" in err
+    assert not (tmp_path / "nsp" / "model.bin").exists()
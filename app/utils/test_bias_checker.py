@@ -0,0 +1,55 @@
+import numpy as np
+
+from app.utils.bias_checker import run_bias_audit, run_intersectional_bias_audit
+
+
+def _reference_rates(predictions, groups):
+    counts, positives = {}, {}
+    for y, g in zip(predictions, groups):
+        counts[g] = counts.get(g, 0) + 1
+        positives[g] = positives.get(g, 0) + (int(y) == 1)
+    return {g: positives[g] / n for g, n in counts.items()}
+
+
+def _reference_gap(rates):
+    values = list(rates.values())
+    return max(abs(a - b) for a in values for b in values)
+
+
+def test_vectorized_audit_matches_reference():
+    rng = np.random.default_rng(0)
+    groups = rng.choice(["female", "male", "other", "unknown"], size=50_000, p=[0.45, 0.45, 0.05, 0.05])
+    predictions = (rng.random(50_000) < np.where(groups == "female", 0.55, 0.6)).astype(int)
+
+    report = run_bias_audit(predictions, groups, allowed_diff=0.1)
+    expected = _reference_rates(predictions.tolist(), groups.tolist())
+    assert list(report.details["group_rates"]) == list(expected)
+    for g, rate in expected.items():
+        assert abs(report.details["group_rates"][g] - rate) < 1e-12
+    assert abs(report.details["max_gap"] - _reference_gap(expected)) < 1e-12
+
+
+def test_list_inputs_and_mixed_labels():
+    report = run_bias_audit([1, 0, 1, 1], ["male", None, "male", 3])
+    assert report.details["group_rates"] == {"male": 1.0, None: 0.0, 3: 1.0}
+    assert report.details["worst_pair"] == ["male", "None"]
+    assert report.status == "FAIL"
+
+    assert run_bias_audit([1, 1], ["f", "m"]).details["worst_pair"] == ["f", "f"]
+    assert run_bias_audit([], []).status == "WARN"
+
+
+def test_intersectional_audit():
+    predictions = [1, 1, 0, 1, 0, 0, 1, 1]
+    gender = ["f", "f", "f", "m", "m", "m", "m", "f"]
+    state = ["UP", "UP", "MH", "UP", "MH", "MH", "UP", "MH"]
+
+    report = run_intersectional_bias_audit(predictions, {"gender": gender, "state": state})
+    expected = _reference_rates(predictions, [f"{g} | {s}" for g, s in zip(gender, state)])
+    assert report.details["group_rates"] == expected
+    assert report.details["attributes"] == ["gender", "state"]
+    assert report.details["group_counts"]["m | MH"] == {"records": 2, "approved": 0}
+    assert report.details["max_gap"] == 1.0
+    assert report.status == "FAIL"
+
+    assert run_intersectional_bias_audit([1], {"gender": ["f", "m"]}).status == "WARN"
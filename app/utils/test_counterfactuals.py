@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.predictor import SCHEME_TABLE, PredictRequest, canonical_inputs, normalize_request
+from app.utils.counterfactuals import CounterfactualSpec, counterfactuals, logit
+from app.utils.scoring import LinearScorer
+
+NAMES = ["income", "land", "gender"]
+WEIGHTS = np.array([-1e-4, 0.5, 3.0])
+
+
+def _rules(inputs):
+    return inputs["income"] <= 100_000 and inputs["land"] > 0, ""
+
+
+def _sigmoid(z):
+    return 1 / (1 + math.exp(-z))
+
+
+def test_closed_form_change_is_minimal_and_reaches_target():
+    spec = CounterfactualSpec({"income": 1.0, "land": 0.01, "gender": 1.0}, {"income": (None, 100_000)}, ("gender",))
+    inputs = {"income": 90_000.0, "land": 1.0, "gender": 0.0}
+    results = {cf.feature: cf for cf in counterfactuals(WEIGHTS, 8.0, NAMES, inputs, spec, _rules, 0.8)}
+
+    assert "gender" not in results
+    income, land = results["income"], results["land"]
+    # z = -9 + 0.5 + 8 = -0.5; income needs to fall by (logit(0.8) + 0.5) / 1e-4.
+    assert income.feasible and income.required == math.floor(90_000 - (logit(0.8) + 0.5) / 1e-4)
+    assert income.probability >= 0.8 > _sigmoid(-1e-4 * (income.required + 1) + 0.5 + 8.0)
+    assert land.feasible and land.required == math.ceil((logit(0.8) + 0.5) / 0.5 * 100 + 100) / 100
+
+
+def test_rule_limits_and_other_rules_are_respected():
+    spec = CounterfactualSpec({"income": 1.0, "land": 0.01}, {"income": (None, 100_000), "land": (0.0, 2.0)})
+    # Already well above the target, but over the income limit.
+    inputs = {"income": 150_000.0, "land": 1.0, "gender": 0.0}
+    results = {cf.feature: cf for cf in counterfactuals(WEIGHTS, 30.0, NAMES, inputs, spec, _rules, 0.5)}
+    assert results["income"].required == 100_000 and results["income"].feasible
+    assert not results["land"].feasible and results["land"].note == "other eligibility rules would still fail"
+
+    # The land the model would need is above the rule range.
+    results = counterfactuals(WEIGHTS, 8.0, NAMES, {"income": 90_000.0, "land": 1.0}, spec, _rules, 0.99)
+    assert not {cf.feature: cf for cf in results}["land"].feasible
+
+    # Exclusive limit (land > 0): the suggestion steps into the interval.
+    results = counterfactuals(np.array([0.0, -1.0, 0.0]), 0.0, NAMES, {"income": 0.0, "land": -1.0}, spec, _rules, 0.1)
+    assert {cf.feature: cf for cf in results}["land"].required == 0.01
+
+    with pytest.raises(ValueError):
+        counterfactuals(WEIGHTS, 0.0, NAMES, inputs, spec, _rules, 1.0)
+
+
+def test_scheme_suggestions_pass_rules_and_reach_target():
+    rng = np.random.default_rng(0)
+    for scheme in SCHEME_TABLE:
+        spec = scheme.counterfactual_spec
+        assert not set(spec.actionable) & set(spec.sensitive)
+        assert set(spec.actionable) <= set(scheme.feature_names)
+
+        model = scheme.model
+        assert isinstance(model, LinearScorer) and list(model.feature_names) == list(scheme.feature_names)
+        for _ in range(50):
+            payload = PredictRequest(
+                age=int(rng.integers(5, 70)),
+                annual_income=float(rng.uniform(20_000, 200_000)),
+                gender="female",
+                state="UP",
+                occupation=str(rng.choice(["farmer", "student", "other"])),
+                land_holding_acres=float(rng.uniform(0.1, 5)),
+                has_family_id=int(rng.integers(2)),
+            )
+            inputs = canonical_inputs(normalize_request(payload))
+            for cf in counterfactuals(model.weights, model.bias, model.feature_names, inputs, spec, scheme.rules, 0.7):
+                if not cf.feasible:
+                    continue
+                changed = {**inputs, cf.feature: cf.required}
+                assert scheme.rules(changed)[0]
+                assert model.positive_proba([scheme.features(changed)])[0] >= 0.7
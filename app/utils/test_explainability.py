@@ -0,0 +1,96 @@
+import json
+import math
+import os
+
+import pytest
+
+from app.predictor import SCHEME_TABLE
+from app.utils import explainability
+from app.utils.explainability import (
+    DEFAULT_DISCLAIMER,
+    ExplanationTemplate,
+    build_explanation_payload,
+    get_explanation_template,
+    load_scheme_metadata,
+)
+from app.utils.metadata_cache import SchemeMetadataCache
+
+# Both sides of each bucket boundary, plus NaN (which reads as HIGH).
+PROBABILITIES = [0.0, 0.299, 0.3, 0.5, 0.699, 0.7, 0.95, 1.0, math.nan]
+
+
+def _expected(display_name, eligible, reason, p, disclaimer):
+    """The explanation as spelled out before templates were compiled."""
+    if p < 0.3:
+        text = (
+            f"The model estimates a LOW likelihood of approval (~{p:.2f}). "
+            "This suggests that, among similar applicants in the training data, relatively few were approved."
+        )
+    elif p < 0.7:
+        text = (
+            f"The model estimates a MODERATE likelihood of approval (~{p:.2f}). "
+            "The outcome is uncertain, and human review would be appropriate."
+        )
+    else:
+        text = (
+            f"The model estimates a HIGH likelihood of approval (~{p:.2f}). "
+            "Many similar applicants in the training data were approved."
+        )
+    return {
+        "rule_based_reason": reason,
+        "probability_explanation": text,
+        "overall_summary": (
+            f"According to the rule-based eligibility check for {display_name}, "
+            f"the applicant is {'ELIGIBLE' if eligible else 'NOT ELIGIBLE'}. "
+            "The ML model then provides an estimated approval probability which should "
+            "be treated as advisory, not authoritative."
+        ),
+        "ethical_disclaimer": disclaimer,
+    }
+
+
+@pytest.mark.parametrize("scheme", SCHEME_TABLE, ids=lambda scheme: scheme.scheme_id)
+@pytest.mark.parametrize("probability", PROBABILITIES)
+def test_template_matches_explanation_payload(scheme, probability):
+    template = get_explanation_template(scheme.scheme_id, scheme.label)
+    disclaimer = load_scheme_metadata(scheme.scheme_id).get("ethical_disclaimer", DEFAULT_DISCLAIMER)
+    for eligible in (True, False):
+        reason = scheme.reasons[0]
+        payload = build_explanation_payload(
+            scheme_id=scheme.scheme_id,
+            scheme_display_name=scheme.label,
+            rule_eligible=eligible,
+            rule_reason=reason,
+            approval_probability=probability,
+        )
+        assert template.render(eligible, reason, probability) == payload
+        assert payload == _expected(scheme.label, eligible, reason, probability, disclaimer)
+
+
+def test_equal_keys_render_equal_explanations():
+    template = ExplanationTemplate("Demo", {})
+    rendered = {}
+    for p in [i / 1000 for i in range(1001)]:
+        key = ExplanationTemplate.key(True, "ok", p)
+        assert rendered.setdefault(key, template.render(True, "ok", p)) == template.render(True, "ok", p)
+
+
+def test_editing_metadata_rebuilds_the_template(tmp_path, monkeypatch):
+    monkeypatch.setattr(explainability, "metadata_cache", SchemeMetadataCache(tmp_path, check_interval=0))
+    path = tmp_path / "demo" / "metadata.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"ethical_disclaimer": "First."}), encoding="utf-8")
+
+    first = get_explanation_template("demo", "Demo")
+    assert get_explanation_template("demo", "Demo") is first
+    assert first.render(True, "ok", 0.5)["ethical_disclaimer"] == "First."
+
+    path.write_text(json.dumps({"ethical_disclaimer": "Second."}), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = get_explanation_template("demo", "Demo")
+    assert second is not first
+    assert second.render(True, "ok", 0.5)["ethical_disclaimer"] == "Second."
+
+    path.unlink()
+    assert get_explanation_template("demo", "Demo").render(True, "ok", 0.5)["ethical_disclaimer"] == DEFAULT_DISCLAIMER
@@ -0,0 +1,75 @@
+from app.utils.bias_checker import run_bias_audit
+from app.utils.fairness_monitor import OVERFLOW_GROUP, StreamingFairnessAuditor
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+DECISIONS = [("female", True), ("female", False), ("male", True), ("male", True), ("other", False), ("other", True)]
+
+
+def test_streaming_report_matches_batch_audit():
+    auditor = StreamingFairnessAuditor()
+    for group, approved in DECISIONS:
+        auditor.record("pm_kisan", "gender", group, approved)
+
+    streaming = auditor.report("pm_kisan", "gender", allowed_diff=0.1)
+    batch = run_bias_audit([int(a) for _, a in DECISIONS], [g for g, _ in DECISIONS], allowed_diff=0.1)
+    assert streaming.status == batch.status
+    assert streaming.details["group_rates"] == batch.details["group_rates"]
+    assert streaming.details["max_gap"] == batch.details["max_gap"]
+    assert streaming.details["group_counts"]["male"] == {"evaluated": 2, "approved": 2}
+
+
+def test_sliding_window_and_retention():
+    clock = _Clock()
+    auditor = StreamingFairnessAuditor(retention_seconds=600, bucket_seconds=60, clock=clock)
+    auditor.record_many("nsp", "gender", [("female", False)] * 3)
+    clock.now += 300
+    auditor.record_many("nsp", "gender", [("female", True), ("male", True)])
+
+    assert auditor.counts("nsp", "gender") == {"female": (4, 1), "male": (1, 1)}
+    assert auditor.counts("nsp", "gender", window_seconds=120) == {"female": (1, 1), "male": (1, 1)}
+    assert auditor.report("nsp", "gender", window_seconds=120).status == "PASS"
+
+    # Old buckets fall out of every window once past retention; totals stay.
+    clock.now += 900
+    auditor.record("nsp", "gender", "male", False)
+    assert auditor.counts("nsp", "gender", window_seconds=10_000) == {"male": (1, 0)}
+    assert auditor.counts("nsp", "gender")["female"] == (4, 1)
+
+
+def test_empty_window_warns():
+    assert StreamingFairnessAuditor().report("pmay", "gender").status == "WARN"
+
+
+def test_merge_adds_counters_from_other_workers():
+    clock = _Clock()
+    workers = [StreamingFairnessAuditor(clock=clock) for _ in range(3)]
+    for worker, (group, approved) in zip(workers * 2, DECISIONS):
+        worker.record("ayushman", "gender", group, approved)
+
+    combined = StreamingFairnessAuditor(clock=clock)
+    combined.merge(workers[0])
+    for worker in workers[1:]:
+        combined.merge(worker.snapshot())
+
+    single = StreamingFairnessAuditor(clock=clock)
+    single.record_many("ayushman", "gender", DECISIONS)
+    assert combined.snapshot() == single.snapshot()
+    assert combined.counts("ayushman", "gender", window_seconds=60) == single.counts("ayushman", "gender")
+
+
+def test_groups_beyond_the_cap_are_counted_as_overflow():
+    auditor = StreamingFairnessAuditor(max_groups=3)
+    auditor.record_many("nsp", "gender", [("female", True), ("male", False)])
+    auditor.record_many("nsp", "gender", [(f"label {i}", True) for i in range(50)])
+    auditor.record("nsp", "gender", "female", False)
+
+    counts = auditor.counts("nsp", "gender")
+    assert counts == {"female": (2, 1), "male": (1, 0), "label 0": (1, 1), OVERFLOW_GROUP: (49, 49)}
@@ -0,0 +1,20 @@
+import json
+
+from app.utils.fast_json import FragmentCache, dumps, json_array
+
+
+def test_dumps_matches_fastapi_encoding():
+    value = {"name": "महिला \"x\"\n", "rates": {"female": 1e16, "male": 1e-7}, "ok": True, "none": None}
+    assert dumps(value) == b'{"name":"\xe0\xa4\xae\xe0\xa4\xb9\xe0\xa4\xbf\xe0\xa4\xb2\xe0\xa4\xbe \\"x\\"\\n","rates":{"female":1e+16,"male":1e-7},"ok":true,"none":null}'
+    assert json_array([dumps(1), dumps("a")]) == b'[1,"a"]'
+    assert json_array([]) == b"[]"
+    assert json.loads(dumps(value)) == value
+
+
+def test_fragment_cache_is_bounded():
+    cache = FragmentCache(max_entries=2)
+    first = cache.encode("PM-KISAN")
+    assert cache.encode("PM-KISAN") is first
+    assert cache.get(("a", "b"), {"a": "b"}) == b'{"a":"b"}'
+    cache.encode("NSP")
+    assert len(cache) == 1
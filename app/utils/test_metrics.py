@@ -0,0 +1,26 @@
+from app.utils.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(buckets=(0.01, 0.1, 1.0))
+    registry.describe("stage_seconds", "histogram", "Stage time.", ("scheme", "stage"))
+    for seconds in (0.005, 0.01, 0.05, 2.0):
+        registry.observe("stage_seconds", seconds, "nsp", "rules")
+    registry.inc("records_total", "nsp", amount=4)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE stage_seconds histogram" in lines
+    assert 'stage_seconds_bucket{scheme="nsp",stage="rules",le="0.01"} 2' in lines
+    assert 'stage_seconds_bucket{scheme="nsp",stage="rules",le="0.1"} 3' in lines
+    assert 'stage_seconds_bucket{scheme="nsp",stage="rules",le="1.0"} 3' in lines
+    assert 'stage_seconds_bucket{scheme="nsp",stage="rules",le="+Inf"} 4' in lines
+    assert 'stage_seconds_count{scheme="nsp",stage="rules"} 4' in lines
+    assert 'records_total{label0="nsp"} 4' in lines
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    with registry.stage("api", "pmay", "predict_proba"):
+        pass
+    registry.inc("records_total", "pmay")
+    assert registry.render() == "\n"
@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from app.utils.micro_batcher import MicroBatcher
+
+
+def _submit_concurrently(batcher, items):
+    results = [None] * len(items)
+    start = threading.Barrier(len(items))
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = batcher.submit(items[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(items))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    return results
+
+
+def test_concurrent_calls_share_a_batch():
+    sizes, delays = [], []
+    batcher = MicroBatcher(
+        lambda items: [x * 10 for x in items],
+        max_batch_size=4,
+        max_wait_seconds=5.0,
+        adaptive=False,
+        on_batch=lambda size, waited: (sizes.append(size), delays.extend(waited)),
+    )
+    # The batch closes as soon as it is full, long before the 5 s window.
+    assert _submit_concurrently(batcher, [1, 2, 3, 4]) == [10, 20, 30, 40]
+    assert sizes == [4]
+    assert len(delays) == 4 and max(delays) < 5.0
+    assert batcher.stats()["mean_batch_size"] == 4
+
+
+def test_failing_item_only_fails_its_caller():
+    def process(items):
+        if any(x < 0 for x in items):
+            raise ValueError("negative")
+        return [x + 1 for x in items]
+
+    batcher = MicroBatcher(process, max_batch_size=3, max_wait_seconds=5.0, adaptive=False)
+    results = _submit_concurrently(batcher, [1, -1, 2])
+    assert results[0] == 2 and results[2] == 3
+    assert isinstance(results[1], ValueError)
+    assert batcher.fallbacks == 1
+
+
+def test_window_adapts_to_arrival_rate():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=8, max_wait_seconds=0.002)
+    batcher._active = 1  # gaps only count while other calls are in flight
+    for t in range(10):
+        batcher._adapt(t * 1.0)
+    assert batcher.window == 0.0  # one request per second: never wait
+
+    now = 10.0
+    for _ in range(60):
+        now += 0.0001
+        batcher._adapt(now)
+    assert batcher.window == pytest.approx(0.0007, rel=0.05)  # ~7 more expected
+
+    for _ in range(60):
+        now += 0.0005
+        batcher._adapt(now)
+    assert batcher.window == 0.002  # a full batch would take 3.5 ms: capped
+
+
+def test_back_to_back_calls_from_one_client_never_wait():
+    sizes = []
+    batcher = MicroBatcher(lambda items: items, max_wait_seconds=0.5, on_batch=lambda size, _: sizes.append(size))
+    for i in range(50):
+        assert batcher.submit(i) == i
+        assert batcher.window == 0.0
+    assert sizes == [1] * 50
+
+
+def test_disabled_batcher_calls_through():
+    calls = []
+    batcher = MicroBatcher(lambda items: calls.append(items) or items, max_wait_seconds=0)
+    assert not batcher.enabled
+    assert batcher.submit("x") == "x"
+    assert calls == [["x"]]
@@ -0,0 +1,60 @@
+from app.utils import response_cache as response_cache_module
+from app.utils.response_cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache_module.time, "monotonic", clock)
+    cache = ResponseCache(ttl_seconds=10)
+    cache.put("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["size"], stats["expirations"], stats["hits"], stats["misses"]) == (0, 1, 1, 1)
+
+
+def test_version_change_invalidates_everything():
+    version = [1]
+    cache = ResponseCache(version=lambda: version[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    version[0] = 2
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+    cache.put("a", 3)
+    assert cache.get("a") == 3  # entries stored under the new version are kept
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
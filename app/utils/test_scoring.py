@@ -0,0 +1,65 @@
+import joblib
+import numpy as np
+import pytest
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from app.utils.scoring import LinearScorer, SklearnScorer, compile_pipeline, predict_with_proba
+
+SCHEMES_DIR = Path(__file__).resolve().parent.parent / "schemes"
+SCHEMES = ["pm_kisan", "pmay", "nsp", "ayushman"]
+
+
+def _random_rows(n_features, n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 5, size=(n_rows, n_features))
+    # Give the income column a realistic scale.
+    X[:, 1] = rng.uniform(10_000, 200_000, n_rows)
+    return X
+
+
+def test_compiled_scorer_matches_predict_proba():
+    for scheme in SCHEMES:
+        pipeline = joblib.load(SCHEMES_DIR / scheme / "pipeline.pkl")
+        scorer = compile_pipeline(pipeline)
+        assert isinstance(scorer, LinearScorer), scheme
+
+        X = _random_rows(pipeline.n_features_in_)
+        expected = pipeline.predict_proba(X)
+        np.testing.assert_allclose(scorer.predict_proba(X), expected, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(scorer.predict_proba(X[:1]), expected[:1], rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(scorer.predict(X), pipeline.predict(X))
+
+
+@pytest.mark.parametrize("with_mean, with_std", [(False, True), (True, False), (False, False)])
+def test_partial_scalers_are_folded_exactly(with_mean, with_std):
+    X = _random_rows(3, n_rows=500)
+    y = (X[:, 1] < 100_000).astype(int)
+    scaler = StandardScaler(with_mean=with_mean, with_std=with_std)
+    pipeline = Pipeline([("scaler", scaler), ("model", LogisticRegression(max_iter=1000))]).fit(X, y)
+
+    scorer = compile_pipeline(pipeline)
+    assert isinstance(scorer, LinearScorer)
+    np.testing.assert_allclose(scorer.predict_proba(X), pipeline.predict_proba(X), rtol=0, atol=1e-12)
+
+
+def test_unsupported_pipeline_falls_back_to_sklearn():
+    X = _random_rows(3, n_rows=200)
+    y = (X[:, 1] < 100_000).astype(int)
+    pipeline = Pipeline([("scaler", MinMaxScaler()), ("model", LogisticRegression())]).fit(X, y)
+
+    scorer = compile_pipeline(pipeline)
+    assert isinstance(scorer, SklearnScorer)
+    np.testing.assert_array_equal(scorer.predict_proba(X), pipeline.predict_proba(X))
+
+
+def test_single_pass_labels_match_predict():
+    for scheme in SCHEMES:
+        pipeline = joblib.load(SCHEMES_DIR / scheme / "pipeline.pkl")
+        X = _random_rows(pipeline.n_features_in_, seed=1)
+        for scorer in (compile_pipeline(pipeline), SklearnScorer(pipeline)):
+            labels, probs = predict_with_proba(scorer, X)
+            np.testing.assert_array_equal(labels, pipeline.predict(X))
+            np.testing.assert_allclose(probs, pipeline.predict_proba(X)[:, 1], rtol=0, atol=1e-12)
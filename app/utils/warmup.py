@@ -0,0 +1,164 @@
+"""
+Startup warm-up and readiness tracking.
+
+Loading artifacts lazily means the first real request after a deploy
+pays for unpickling, and a missing artifact is only discovered when a
+citizen hits it. Instead, the app warms every scheme up front:
+
+1. load the /predict model through the scheme descriptor (the same
+   registry entry requests will use) and the artifact behind the /api/*
+   services. Both prefer the compact model.bin, so a fully exported
+   deployment never unpickles anything or imports sklearn; schemes still
+   served from a pickle are flagged in the report,
+2. score a dummy row shaped like the scheme's FEATURES through the
+   descriptor's model, exactly as /predict does, so a model trained on a
+   different feature set fails here rather than on the first request,
+3. parse the scheme's metadata.json into the metadata cache and compile
+   its explanation templates.
+
+Timings are recorded per scheme. A failing scheme does not stop the
+others from warming: the process is "degraded" (still ready, since
+/predict reports per-scheme failures) while at least one scheme works,
+and only "failed" when none does.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+import threading
+import time
+
+import numpy as np
+
+from app.utils.explainability import get_explanation_template
+from app.utils.artifacts import COMPACT_ARTIFACT
+from app.utils.metadata_cache import metadata_cache
+from app.utils.model_registry import DEFAULT_ARTIFACT, registry
+
+
+# Artifacts loaded besides the scheme's /predict model: the one behind
+# the /api/* services (the same model.bin once exported).
+def warmup_artifacts(scheme_id: str) -> Tuple[str, ...]:
+    return (registry.preferred_artifact(scheme_id, DEFAULT_ARTIFACT),)
+
+
+@dataclass
+class WarmupReport:
+    """
+    Outcome of a warm-up run.
+
+    status:
+        "pending" before warm-up starts, then "running", and finally
+        "ready", "degraded" (some schemes failed) or "failed" (all did).
+    schemes:
+        Per-scheme timings in seconds (load, dummy inference, metadata),
+        the artifacts loaded and whether any is a pickle, or
+        ``{"error": ...}`` for a scheme that failed.
+    error:
+        First failure message when status is "degraded" or "failed".
+    """
+
+    status: str = "pending"
+    started_at: Optional[float] = None
+    duration_seconds: Optional[float] = None
+    schemes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("ready", "degraded")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_report = WarmupReport()
+_report_lock = threading.Lock()
+
+
+def _dummy_row(scorer: Any) -> np.ndarray:
+    n_features = getattr(scorer, "n_features_in_", None) or 1
+    return np.zeros((1, int(n_features)), dtype=np.float64)
+
+
+def _check_shape(scheme: Any, model: Any) -> None:
+    expected = getattr(model, "n_features_in_", None)
+    if expected is not None and int(expected) != len(scheme.feature_names):
+        raise ValueError(
+            f"model expects {expected} features but the scheme provides "
+            f"{len(scheme.feature_names)} ({', '.join(scheme.feature_names)})"
+        )
+
+
+def _warm_scheme(scheme: Any, artifacts: Iterable[str]) -> Dict[str, Any]:
+    scheme_id = scheme.scheme_id
+    timings: Dict[str, Any] = {}
+
+    model_artifact = scheme.model_artifact
+    others = [artifact for artifact in dict.fromkeys(artifacts) if artifact != model_artifact]
+    timings["artifacts"] = [model_artifact, *others]
+    timings["pickle_fallback"] = any(artifact != COMPACT_ARTIFACT for artifact in timings["artifacts"])
+
+    start = time.perf_counter()
+    model = scheme.model
+    scorers = [registry.get_scorer(scheme_id, artifact) for artifact in others]
+    timings["load_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _check_shape(scheme, model)
+    model.positive_proba(np.zeros((1, len(scheme.feature_names)), dtype=np.float64))
+    timings["compiled"] = {model_artifact: bool(model.compiled)}
+    for artifact, scorer in zip(others, scorers):
+        scorer.predict_proba(_dummy_row(scorer))
+        timings["compiled"][artifact] = bool(scorer.compiled)
+    timings["predict_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metadata = metadata_cache.get(scheme_id)
+    get_explanation_template(scheme_id, metadata.get("scheme_name", scheme_id), metadata)
+    timings["metadata_seconds"] = time.perf_counter() - start
+    return timings
+
+
+def run_warmup(schemes: Sequence[Any], artifacts: Optional[Sequence[str]] = None) -> WarmupReport:
+    """
+    Warm every scheme and record the outcome as the process readiness.
+
+    ``schemes`` are /predict scheme descriptors (``SCHEME_TABLE``
+    entries): anything with ``scheme_id``, ``feature_names``,
+    ``model_artifact`` and a ``model`` exposing ``positive_proba``.
+    ``artifacts`` overrides the extra artifacts loaded per scheme
+    (default: ``warmup_artifacts``).
+
+    Never raises: failures are captured in the returned report so the
+    service can stay up (and report its status) while operators look.
+    """
+    global _report
+    report = WarmupReport(status="running", started_at=time.time())
+    with _report_lock:
+        _report = report
+
+    start = time.perf_counter()
+    for scheme in schemes:
+        scheme_id = scheme.scheme_id
+        try:
+            extra = warmup_artifacts(scheme_id) if artifacts is None else artifacts
+            report.schemes[scheme_id] = _warm_scheme(scheme, extra)
+        except Exception as e:
+            report.schemes[scheme_id] = {"error": f"{type(e).__name__}: {e}"}
+            if report.error is None:
+                report.error = f"{scheme_id}: {e}"
+    failed = sum("error" in timings for timings in report.schemes.values())
+    if not failed:
+        report.status = "ready"
+    else:
+        report.status = "failed" if failed == len(report.schemes) else "degraded"
+    report.duration_seconds = time.perf_counter() - start
+    return report
+
+
+def readiness() -> WarmupReport:
+    """The most recent warm-up report for this process."""
+    return _report
+
+
+__all__ = ["WarmupReport", "run_warmup", "readiness", "warmup_artifacts"]
@@ -0,0 +1,98 @@
+"""
+Synthetic request payloads for the API benchmarks.
+
+Numeric fields use the same distributions as the scheme training scripts
+(app/schemes/*/train_*.py), so rule pass rates and model inputs look like
+the data the models were fitted on. Generation is seeded and reproducible.
+"""
+
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+
+STATES = ["Uttar Pradesh", "Maharashtra", "Bihar", "West Bengal", "Tamil Nadu", "Rajasthan", "Karnataka"]
+OCCUPATIONS = ["farmer", "student", "labourer", "salaried", "self-employed"]
+GENDERS = ["female", "male", "other"]
+
+Payload = Dict[str, Any]
+
+
+def pm_kisan_payloads(n: int, rng: np.random.Generator) -> List[Payload]:
+    return [
+        {
+            "land_size_acres": float(rng.uniform(0.1, 5)),
+            "annual_income": float(rng.uniform(20000, 200000)),
+            "owns_land": int(rng.choice([0, 1], p=[0.2, 0.8])),
+            "is_farmer": int(rng.choice([0, 1], p=[0.1, 0.9])),
+        }
+        for _ in range(n)
+    ]
+
+
+def pmay_payloads(n: int, rng: np.random.Generator) -> List[Payload]:
+    return [
+        {
+            "age": int(rng.integers(18, 60)),
+            "annual_income": float(rng.uniform(20000, 200000)),
+            "is_female": int(rng.choice([0, 1])),
+            "is_laborer": int(rng.choice([0, 1])),
+        }
+        for _ in range(n)
+    ]
+
+
+def nsp_payloads(n: int, rng: np.random.Generator) -> List[Payload]:
+    return [
+        {
+            "age": int(rng.integers(17, 25)),
+            "annual_income": float(rng.uniform(10000, 200000)),
+            "student_class": int(rng.choice([10, 12, 1], p=[0.4, 0.5, 0.1])),
+        }
+        for _ in range(n)
+    ]
+
+
+def ayushman_payloads(n: int, rng: np.random.Generator) -> List[Payload]:
+    return [
+        {
+            "age": int(rng.integers(18, 65)),
+            "annual_income": float(rng.uniform(20000, 200000)),
+            "has_family_id": int(rng.choice([0, 1], p=[0.2, 0.8])),
+        }
+        for _ in range(n)
+    ]
+
+
+def predict_payloads(n: int, rng: np.random.Generator) -> List[Payload]:
+    """PredictRequest bodies for the unified /predict endpoint."""
+    payloads = []
+    for _ in range(n):
+        occupation = str(rng.choice(OCCUPATIONS, p=[0.35, 0.2, 0.2, 0.15, 0.1]))
+        payloads.append(
+            {
+                "age": int(rng.integers(17, 65)),
+                "annual_income": float(rng.uniform(10000, 200000)),
+                "gender": str(rng.choice(GENDERS, p=[0.48, 0.48, 0.04])),
+                "state": str(rng.choice(STATES)),
+                "occupation": occupation,
+                "land_holding_acres": float(rng.uniform(0.1, 5)) if occupation == "farmer" else None,
+                "has_family_id": int(rng.choice([0, 1], p=[0.2, 0.8])),
+            }
+        )
+    return payloads
+
+
+# scenario name -> (path, payload generator)
+SCENARIOS: Dict[str, tuple] = {
+    "predict": ("/predict", predict_payloads),
+    "api_pm_kisan": ("/api/pm-kisan/predict", pm_kisan_payloads),
+    "api_pmay": ("/api/pmay/predict", pmay_payloads),
+    "api_nsp": ("/api/nsp/predict", nsp_payloads),
+    "api_ayushman": ("/api/ayushman/predict", ayushman_payloads),
+}
+
+
+def generate(scenario: str, n: int, seed: int = 42) -> List[Payload]:
+    generator: Callable[[int, np.random.Generator], List[Payload]] = SCENARIOS[scenario][1]
+    return generator(n, np.random.default_rng(seed))
@@ -0,0 +1,235 @@
+"""
+End-to-end throughput and latency benchmarks for the API.
+
+Drives the FastAPI app in-process through httpx's ASGI transport, so
+results reflect routing, validation, scoring and serialisation without
+network noise.
+
+Usage:
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run --scenarios predict,api_nsp --concurrency 1,8,32
+    python -m benchmarks.run -o new.json --compare baseline.json --tolerance 0.15
+    python -m benchmarks.run --current new.json --compare baseline.json
+
+Each (scenario, concurrency) pair reports requests/s, p50/p95/p99 latency
+in milliseconds, the count of non-2xx responses by status code and the
+number of /predict response-cache hits. Every level gets its own freshly
+generated payloads and starts with an empty response cache, so higher
+concurrency levels do not just replay cached responses; the cache
+settings are recorded in the report (set PREDICT_CACHE_SIZE=0 to
+benchmark with the cache off).
+Throughput and latency cover successful responses only, so a fast error
+path cannot inflate them. A run with any failed request exits non-zero
+unless --allow-errors is given. With --compare the run also exits
+non-zero if throughput dropped, or p95/p99 latency grew, by more than
+the tolerance relative to the baseline file.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import warnings
+
+import httpx
+import numpy as np
+
+from benchmarks.payloads import SCENARIOS, generate
+
+
+DEFAULT_CONCURRENCY = (1, 4, 16)
+DEFAULT_REQUESTS = 1000
+WARMUP_REQUESTS = 50
+
+
+async def _drive(
+    client: httpx.AsyncClient, path: str, payloads: Sequence[Dict[str, Any]], concurrency: int
+) -> Dict[str, Any]:
+    """Send every payload with ``concurrency`` requests in flight."""
+    latencies = np.empty(len(payloads), dtype=np.float64)
+    ok = np.zeros(len(payloads), dtype=bool)
+    error_statuses: Dict[str, int] = {}
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < len(payloads):
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.post(path, json=payloads[i])
+            latencies[i] = time.perf_counter() - started
+            if response.status_code == 200:
+                ok[i] = True
+            else:
+                status = str(response.status_code)
+                error_statuses[status] = error_statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    succeeded = int(ok.sum())
+    # Failed requests are excluded from throughput and latency.
+    p50, p95, p99 = np.percentile(latencies[ok], [50, 95, 99]) * 1000 if succeeded else (np.nan,) * 3
+    return {
+        "requests": len(payloads),
+        "errors": len(payloads) - succeeded,
+        "error_statuses": dict(sorted(error_statuses.items())),
+        "seconds": elapsed,
+        "requests_per_second": succeeded / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+async def run_benchmarks(
+    scenarios: Sequence[str],
+    concurrency_levels: Sequence[int],
+    n_requests: int,
+    seed: int = 42,
+) -> List[Dict[str, Any]]:
+    # Imported here so `--help` and comparing stored results stay fast.
+    from main import app
+    from app.predictor import SCHEME_TABLE, response_cache
+    from app.utils.warmup import run_warmup
+
+    # ASGITransport does not run the lifespan, so warm up explicitly.
+    report = run_warmup(SCHEME_TABLE)
+    if report.status != "ready":
+        print(f"WARNING warm-up {report.status}, expect errors: {report.error}", file=sys.stderr)
+
+    results = []
+    # Count server errors as failed requests instead of aborting the run.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in scenarios:
+            path = SCENARIOS[scenario][0]
+            await _drive(client, path, generate(scenario, WARMUP_REQUESTS, seed - 1), 1)
+            for concurrency in concurrency_levels:
+                # Fresh payloads and an empty cache per level, so no level
+                # is served from responses cached by the one before it.
+                payloads = generate(scenario, n_requests, seed + concurrency)
+                response_cache.clear()
+                hits = response_cache.hits
+                stats = await _drive(client, path, payloads, concurrency)
+                stats["cache_hits"] = response_cache.hits - hits
+                results.append({"scenario": scenario, "path": path, "concurrency": concurrency, **stats})
+                print(_format_row(results[-1]), file=sys.stderr)
+    return results
+
+
+def _format_row(r: Dict[str, Any]) -> str:
+    return (
+        f"{r['scenario']:<14} c={r['concurrency']:<3} {r['requests_per_second']:>9,.1f} req/s  "
+        f"p50 {r['p50_ms']:7.2f} ms  p95 {r['p95_ms']:7.2f} ms  p99 {r['p99_ms']:7.2f} ms  "
+        f"errors {r['errors']}" + (f" {r['error_statuses']}" if r.get("error_statuses") else "")
+        + (f"  cache hits {r['cache_hits']}" if r.get("cache_hits") else "")
+    )
+
+
+def _cache_settings() -> Dict[str, Any]:
+    from app.predictor import response_cache
+
+    stats = response_cache.stats()
+    return {key: stats[key] for key in ("enabled", "max_entries", "ttl_seconds")}
+
+
+# ---------- COMPARISON ----------
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions of ``current`` against ``baseline``."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        base = previous.get((r["scenario"], r["concurrency"]))
+        if base is None:
+            continue
+        label = f"{r['scenario']} c={r['concurrency']}"
+        if r["requests_per_second"] < base["requests_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: throughput {base['requests_per_second']:.1f} -> {r['requests_per_second']:.1f} req/s"
+            )
+        for key in ("p95_ms", "p99_ms"):
+            if r[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{label}: {key} {base[key]:.2f} -> {r[key]:.2f}")
+        error_rate, base_error_rate = r["errors"] / r["requests"], base["errors"] / base["requests"]
+        if error_rate > base_error_rate:
+            regressions.append(f"{label}: error rate {base_error_rate:.1%} -> {error_rate:.1%}")
+    return regressions
+
+
+# ---------- CLI ----------
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenario names")
+    parser.add_argument("--concurrency", type=_int_list, default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="requests per concurrency level")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to check for regressions")
+    parser.add_argument("--current", metavar="RESULTS", help="compare this stored run instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown (default 0.10)")
+    parser.add_argument(
+        "--allow-errors", action="store_true", help="exit zero even if some requests failed (they stay excluded)"
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    if args.current:
+        if not args.compare:
+            parser.error("--current requires --compare")
+        with open(args.current, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        with warnings.catch_warnings():
+            # The /api/* handlers pass bare lists to DataFrame-fitted pipelines.
+            warnings.simplefilter("ignore", UserWarning)
+            results = asyncio.run(run_benchmarks(scenarios, args.concurrency, args.requests, args.seed))
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests_per_level": args.requests,
+            "seed": args.seed,
+            "response_cache": _cache_settings(),
+            "results": results,
+        }
+    if args.output and not args.current:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    failed = [r for r in report["results"] if r["errors"]]
+    for r in failed:
+        print(
+            f"ERRORS {r['scenario']} c={r['concurrency']}: {r['errors']} of {r['requests']} requests failed "
+            f"{r.get('error_statuses', {})}",
+            file=sys.stderr,
+        )
+    if failed and not args.allow_errors:
+        status = 1
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,7 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import routers from app.services
@@ -6,12 +9,26 @@ from app.services.pm_kisan_service import router as pmkisan_router
 from app.services.pmay_service import router as pmay_router
 from app.services.nsp_service import router as nsp_router
 from app.services.ayushman_service import router as ayushman_router
-from app.predictor import router as unified_router
+from app.predictor import SCHEME_TABLE, router as unified_router
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, metrics
+from app.utils.model_registry import registry
+from app.utils.process_memory import memory_usage
+from app.utils.warmup import readiness, run_warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load, compile and exercise every scheme model before serving so the
+    # first real request is fast and missing artifacts surface at deploy.
+    run_warmup(SCHEME_TABLE)
+    yield
+
 
 app = FastAPI(
     title="AI Scheme Eligibility & Impact Predictor",
     description="Predict eligibility, approval probability, and benefits for multiple government schemes.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Allow local frontend to call API
@@ -22,6 +39,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# End-to-end latency per route, including response serialisation.
+app.add_middleware(MetricsMiddleware)
 
 # Include all scheme routers plus unified /predict
 app.include_router(pmkisan_router)
@@ -38,3 +57,28 @@ def root():
         "available_schemes": ["PM-KISAN", "PMAY", "NSP", "Ayushman Bharat"],
         "unified_endpoint": "/predict",
     }
+
+
+@app.get("/models")
+def model_stats():
+    """Load time and memory for every artifact loaded so far."""
+    return {"artifacts": registry.stats()}
+
+
+@app.get("/healthz/memory")
+def process_memory():
+    """RSS / USS / PSS of the worker process that served this request."""
+    return memory_usage()
+
+
+@app.get("/healthz/ready")
+def ready():
+    """Readiness probe: 200 once start-up warm-up has at least one working scheme."""
+    report = readiness()
+    return JSONResponse(report.to_dict(), status_code=200 if report.ready else 503)
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Stage latency histograms and counters in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)